@@ -0,0 +1,7 @@
+"""
+Shared infrastructure for the Selenium suites (test1, test2,
+verify_product_test, selenium_log_in_test).
+
+Each suite's conftest puts ``tests/selenium`` on ``sys.path`` and imports
+what it needs from here; page objects and tests stay in their own suite.
+"""
@@ -0,0 +1,123 @@
+"""
+Pool of reusable WebDriver sessions for the suites' ``driver`` fixtures.
+
+Starting Chrome is the most expensive part of a test, so instead of quitting
+the browser after each test the session is handed back to the pool, wiped
+(cookies, localStorage, sessionStorage, extra windows) and parked on
+``about:blank``. The reset is verified; a session that does not come back
+clean is quit and the next ``acquire()`` starts a fresh one.
+
+Each new session gets the CDP network layer (``common.network``): blocked
+URLs and the shared static-asset cache, and the screencast recorder when it
+is enabled (``common.screencast``).
+"""
+import threading
+
+from common import network, screencast, settings
+
+
+BLANK_URL = "about:blank"
+
+# Clears the storage of the document the test finished on and reports what
+# is left, so the reset can be checked in the same round trip.
+CLEAR_STORAGE_SCRIPT = """
+var left = 0;
+try { localStorage.clear(); left += localStorage.length; } catch (e) {}
+try { sessionStorage.clear(); left += sessionStorage.length; } catch (e) {}
+return left;
+"""
+
+
+class BrowserPool:
+    """Thread-safe pool of idle WebDriver sessions"""
+
+    def __init__(self, factory, max_idle=None):
+        self.factory = factory
+        self.max_idle = settings.POOL_MAX_IDLE if max_idle is None else max_idle
+        if not settings.REUSE_BROWSER:
+            self.max_idle = 0
+        self._idle = []
+        self._timeouts = {}
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def acquire(self):
+        """Returns a clean session, reusing an idle one when possible"""
+        with self._lock:
+            if self._idle:
+                self.stats["reused"] += 1
+                return self._idle.pop()
+        driver = screencast.attach(network.attach(self.factory()))
+        with self._lock:
+            self.stats["created"] += 1
+            self._timeouts[id(driver)] = driver.timeouts
+        return driver
+
+    def release(self, driver):
+        """Gives a session back; it is kept only if the reset succeeds"""
+        with self._lock:
+            keep = len(self._idle) < self.max_idle
+        if keep and self.reset(driver):
+            with self._lock:
+                self._idle.append(driver)
+            return
+        self.discard(driver)
+
+    def discard(self, driver):
+        """Quits a session for good"""
+        with self._lock:
+            self._timeouts.pop(id(driver), None)
+            self.stats["discarded"] += 1
+        screencast.detach(driver)
+        network.detach(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def reset(self, driver):
+        """Wipes the session state and returns True if it came back clean"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            storage_left = driver.execute_script(CLEAR_STORAGE_SCRIPT)
+            self._clear_cookies(driver)
+            driver.get(BLANK_URL)
+
+            timeouts = self._timeouts.get(id(driver))
+            if timeouts is not None:
+                driver.timeouts = timeouts
+
+            return (
+                storage_left == 0
+                and driver.current_url == BLANK_URL
+                and len(driver.window_handles) == 1
+                and not self._remaining_cookies(driver)
+            )
+        except Exception:
+            return False
+
+    def close(self):
+        """Quits every idle session"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self.discard(driver)
+
+    @staticmethod
+    def _clear_cookies(driver):
+        # CDP clears cookies for every domain, WebDriver only for the current one
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+
+    @staticmethod
+    def _remaining_cookies(driver):
+        if hasattr(driver, "execute_cdp_cmd"):
+            return driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        return driver.get_cookies()
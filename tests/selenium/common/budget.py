@@ -0,0 +1,104 @@
+"""
+Latency budgets and baseline comparison for the performance suite.
+
+The suite measures each (user, transition) ``settings.PERF_REPEAT`` times.
+A result passes when:
+
+* its p50/p95/p99 are within the budget declared in ``Config``,
+* it is not significantly slower than the stored baseline: a regression is
+  a one-sided Mann-Whitney U test below ``settings.PERF_ALPHA`` *and* a
+  median slowdown above ``settings.PERF_TOLERANCE``, so neither one noisy
+  sample nor a statistically detectable but negligible shift fails the run.
+
+The baseline is a JSON file of samples per user and transition
+(``settings.PERF_BASELINE``, or ``perf-baseline-<host>.json`` under
+``settings.CACHE_DIR``). Missing entries are filled from the current run;
+existing ones are only replaced with ``SELENIUM_PERF_UPDATE_BASELINE=1``.
+"""
+import json
+import os
+from dataclasses import dataclass
+
+from common import settings
+from common.stats import mann_whitney_greater, percentile, summarize
+
+
+BASELINE_FILE = "perf-baseline-{target}.json"
+
+# Baseline samples needed before a comparison is made
+MIN_BASELINE_SAMPLES = 5
+
+
+@dataclass
+class Comparison:
+    """Current samples of a (user, transition) against its baseline"""
+    p_value: float
+    median: float
+    baseline_median: float
+
+    @property
+    def slowdown(self):
+        return self.median / self.baseline_median - 1 if self.baseline_median else 0.0
+
+    @property
+    def regressed(self):
+        return self.p_value < settings.PERF_ALPHA and self.slowdown > settings.PERF_TOLERANCE
+
+    def describe(self):
+        return (
+            f"median {self.median:.3f}s vs baseline {self.baseline_median:.3f}s "
+            f"({self.slowdown:+.0%}), Mann-Whitney p={self.p_value:.4f}"
+        )
+
+
+class Baseline:
+    """Reference latency samples per user and transition"""
+
+    def __init__(self, path=None):
+        self.path = path or settings.PERF_BASELINE or os.path.join(
+            settings.CACHE_DIR, BASELINE_FILE.format(target=settings.TARGET)
+        )
+        self.samples = {}
+        self._changed = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.samples = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, user, transition):
+        return self.samples.get(user, {}).get(transition, [])
+
+    def compare(self, user, transition, values):
+        """Comparison with the baseline, or None while it is too small"""
+        reference = self.get(user, transition)
+        if len(reference) < MIN_BASELINE_SAMPLES:
+            return None
+        _, p_value = mann_whitney_greater(values, reference)
+        return Comparison(p_value, percentile(values, 50), percentile(reference, 50))
+
+    def offer(self, user, transition, values):
+        """Keeps values as the baseline when there is none (or on request)"""
+        if settings.PERF_UPDATE_BASELINE or len(self.get(user, transition)) < MIN_BASELINE_SAMPLES:
+            self.samples.setdefault(user, {})[transition] = [round(value, 4) for value in values]
+            self._changed = True
+
+    def save(self):
+        if not self._changed:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.samples, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._changed = False
+
+
+def over_budget(values, budget):
+    """Readable lines for each percentile above its budget (seconds)"""
+    summary = summarize(values)
+    return [
+        f"{name} {summary[name]:.3f}s > budget {limit:.3f}s"
+        for name, limit in sorted(budget.items())
+        if summary[name] > limit
+    ]
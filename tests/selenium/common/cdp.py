@@ -0,0 +1,107 @@
+"""
+Chrome DevTools Protocol channel for a WebDriver session.
+
+``driver.execute_cdp_cmd`` can send commands but cannot receive events, and
+Selenium's ``bidi_connection()`` is an async context manager driven by trio.
+``CdpChannel`` keeps that connection open on a daemon thread running its own
+trio loop, so the synchronous test code can:
+
+* ``execute(command)`` a CDP command built with the bundled bindings
+  (``channel.devtools.fetch.enable(...)``) and get its result,
+* ``listen(event_type, handler)``: run ``async handler(event)`` on the
+  channel's thread for every event of that type; handlers send their own
+  commands with ``await channel.send(command)``.
+
+The connection attaches to the first target of the browser, which is the
+page of a session that has a single window (the browser pool closes the
+others between tests).
+"""
+import math
+import threading
+
+import trio
+from selenium.common.exceptions import WebDriverException
+
+
+CONNECT_TIMEOUT = 10
+CLOSE_TIMEOUT = 5
+
+
+class CdpChannel:
+    """CDP connection of one browser, served by a trio loop on a daemon thread"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.devtools = None
+        self._session = None
+        self._token = None
+        self._nursery = None
+        self._closed = None
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = None
+
+    def start(self, timeout=CONNECT_TIMEOUT):
+        """Opens the connection; raises WebDriverException if it cannot"""
+        self._thread = threading.Thread(target=trio.run, args=(self._main,), name="cdp-channel", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise WebDriverException(f"CDP connection not open after {timeout}s")
+        if self._error is not None:
+            raise WebDriverException(f"CDP connection failed: {self._error}") from self._error
+        return self
+
+    async def _main(self):
+        try:
+            async with self.driver.bidi_connection() as connection:
+                self._session = connection.session
+                self.devtools = connection.devtools
+                self._token = trio.lowlevel.current_trio_token()
+                self._closed = trio.Event()
+                async with trio.open_nursery() as nursery:
+                    self._nursery = nursery
+                    self._ready.set()
+                    await self._closed.wait()
+                    nursery.cancel_scope.cancel()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._nursery = None
+            self._ready.set()
+
+    @property
+    def is_open(self):
+        return self._nursery is not None
+
+    # ----- from the test thread -------------------------------------------
+
+    def execute(self, command):
+        """Runs a CDP command and returns its result"""
+        return trio.from_thread.run(self._session.execute, command, trio_token=self._token)
+
+    def listen(self, event_type, handler):
+        """Calls async handler(event) on the channel's thread for each event"""
+        trio.from_thread.run_sync(
+            self._nursery.start_soon, self._dispatch, event_type, handler, trio_token=self._token
+        )
+
+    def close(self):
+        if not self.is_open:
+            return
+        try:
+            trio.from_thread.run_sync(self._closed.set, trio_token=self._token)
+        except (trio.RunFinishedError, RuntimeError):
+            pass
+        self._thread.join(CLOSE_TIMEOUT)
+
+    # ----- on the channel's thread ----------------------------------------
+
+    async def send(self, command):
+        """Runs a CDP command from a handler"""
+        return await self._session.execute(command)
+
+    async def _dispatch(self, event_type, handler):
+        # Unbounded buffer: a dropped Fetch.requestPaused would stall its request
+        async with self._session.listen(event_type, buffer_size=math.inf) as events:
+            async for event in events:
+                self._nursery.start_soon(handler, event)
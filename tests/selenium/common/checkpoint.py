@@ -0,0 +1,176 @@
+"""
+Named browser-state checkpoints.
+
+A checkpoint is what a flow leaves behind in the browser: cookies,
+localStorage (SauceDemo keeps the cart there), sessionStorage and the
+current URL. Capturing it once lets later tests start from "user X with
+cart Y on page Z" by restoring the state instead of replaying the UI steps.
+
+Restoring costs one navigation. Over CDP, ``Network.setCookies`` writes
+every cookie with its domain, flags and sameSite (httpOnly included), and a
+``Page.addScriptToEvaluateOnNewDocument`` script fills localStorage and
+sessionStorage before the page's own scripts run; the saved URL is then
+loaded once and the script removed. Without CDP, a session that is not on
+the application origin yet (a freshly reset pooled session sits on
+about:blank) first loads a tiny same-origin resource, because cookies and
+storage can only be written from that origin.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from common import settings
+
+
+# Same-origin resource used to get storage access without loading the app
+ORIGIN_PROBE_PATH = "/favicon.ico"
+
+CAPTURE_SCRIPT = """
+function dump(storage) {
+    var data = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        data[key] = storage.getItem(key);
+    }
+    return data;
+}
+return {url: location.href, local: dump(localStorage), session: dump(sessionStorage)};
+"""
+
+# Writes state.local and state.session into the storage of state.origin
+STORAGE_FUNCTION = """function (state) {
+    if (location.origin !== state.origin) { return; }
+    [[localStorage, state.local], [sessionStorage, state.session]].forEach(function (pair) {
+        pair[0].clear();
+        Object.keys(pair[1]).forEach(function (key) { pair[0].setItem(key, pair[1][key]); });
+    });
+}"""
+
+# Selenium cookie keys and their CDP Network.CookieParam names
+CDP_COOKIE_KEYS = {
+    "name": "name", "value": "value", "domain": "domain", "path": "path",
+    "secure": "secure", "httpOnly": "httpOnly", "sameSite": "sameSite", "expiry": "expires",
+}
+
+
+@dataclass
+class BrowserState:
+    """Everything needed to put a session back where a flow left it"""
+    url: str
+    cookies: list = field(default_factory=list)
+    local_storage: dict = field(default_factory=dict)
+    session_storage: dict = field(default_factory=dict)
+    captured_at: float = field(default_factory=time.time)
+
+    @property
+    def origin(self):
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+
+def capture_state(driver):
+    """Captures the current session state"""
+    data = driver.execute_script(CAPTURE_SCRIPT)
+    return BrowserState(
+        url=data["url"],
+        cookies=driver.get_cookies(),
+        local_storage=data["local"],
+        session_storage=data["session"],
+    )
+
+
+def cdp_cookie(cookie, url):
+    """Network.CookieParam of a Selenium cookie; host-only cookies are bound to url"""
+    param = {CDP_COOKIE_KEYS[key]: value for key, value in cookie.items() if key in CDP_COOKIE_KEYS}
+    if not param.get("domain"):
+        param.pop("domain", None)
+        param["url"] = url
+    return param
+
+
+def _storage(state):
+    return {"origin": state.origin, "local": state.local_storage, "session": state.session_storage}
+
+
+def restore_state(driver, state):
+    """Writes a captured state into the session and opens its URL"""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        _restore_in_page(driver, state)
+        return
+    if state.cookies:
+        driver.execute_cdp_cmd("Network.setCookies", {
+            "cookies": [cdp_cookie(cookie, state.url) for cookie in state.cookies],
+        })
+    script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": f"({STORAGE_FUNCTION})({json.dumps(_storage(state))});",
+    })
+    try:
+        driver.get(state.url)
+    finally:
+        # Later documents (next tests of a pooled session) keep their own storage
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {
+            "identifier": script["identifier"],
+        })
+
+
+def _restore_in_page(driver, state):
+    """WebDriver-only restore: cookies and storage are written from the origin"""
+    if not driver.current_url.startswith(state.origin + "/"):
+        driver.get(state.origin + ORIGIN_PROBE_PATH)
+    for cookie in state.cookies:
+        driver.add_cookie(cookie)
+    driver.execute_script(f"({STORAGE_FUNCTION})(arguments[0]);", _storage(state))
+    driver.get(state.url)
+
+
+class CheckpointCache:
+    """LRU cache of named states, with a maximum age per entry"""
+
+    def __init__(self, max_entries=None, max_age=None):
+        self.max_entries = max_entries or settings.CHECKPOINT_MAX_ENTRIES
+        self.max_age = max_age or settings.CHECKPOINT_MAX_AGE
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the state saved under key, or None if missing or too old"""
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                return None
+            if time.time() - state.captured_at > self.max_age:
+                del self._states[key]
+                return None
+            self._states.move_to_end(key)
+            return state
+
+    def put(self, key, state):
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._states.pop(key, None)
+
+    def restore_or_build(self, driver, key, build):
+        """
+        Restores the state saved under key, or runs build() (the UI flow)
+        in this session and saves the state it leaves behind.
+        """
+        state = self.get(key)
+        if state is not None:
+            restore_state(driver, state)
+            return state
+        build()
+        state = capture_state(driver)
+        self.put(key, state)
+        return state
+
+    def __len__(self):
+        return len(self._states)
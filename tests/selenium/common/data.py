@@ -0,0 +1,190 @@
+"""
+Test-data loading shared by the suites.
+
+``load_test_data(path, schema=None)`` replaces the per-suite ``json_reader``
+copies:
+
+* ``.json`` files are parsed once per process and cached by path, mtime and
+  size, so several modules (or re-imports) reading the same file share one
+  parse, and an edited file is read again. Each caller gets its own copy of
+  the records;
+* records are checked against a ``Schema`` (required fields and their types,
+  unique key) once, when the file is parsed, with the file and record in
+  the error message;
+* ``.jsonl`` files are not read at import: ``load_test_data`` returns a
+  ``JsonlCases`` that ``@pytest.mark.parametrize`` iterates when pytest
+  generates the tests. That pass records the byte offset of each line and
+  streams one ``pytest.param`` per case, holding a ``LazyRecord`` that reads,
+  parses and validates its own line when the test first reads it.
+  ``settings.DATA_LIMIT`` and ``settings.DATA_SHARD`` select the part of a
+  large dataset that is collected at all.
+"""
+import copy
+import json
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from common import settings
+
+
+class DataError(ValueError):
+    """A test-data file or record that does not match its schema"""
+
+
+class Schema:
+    """Required fields and their types; key names the field that identifies a record"""
+
+    def __init__(self, key=None, **fields):
+        self.key = key
+        self.fields = fields
+
+    def validate(self, record, where):
+        if not isinstance(record, dict):
+            raise DataError(f"{where}: expected an object, got {type(record).__name__}")
+        for name, kind in self.fields.items():
+            if name not in record:
+                raise DataError(f"{where}: missing field {name!r}")
+            if not isinstance(record[name], kind):
+                raise DataError(
+                    f"{where}: field {name!r} should be {kind.__name__}, got {type(record[name]).__name__}"
+                )
+        return record
+
+    def validate_all(self, records, source):
+        if not isinstance(records, list):
+            raise DataError(f"{source}: expected a list of records, got {type(records).__name__}")
+        seen = set()
+        for index, record in enumerate(records):
+            where = f"{source}[{index}]"
+            self.validate(record, where)
+            if self.key is not None:
+                if record[self.key] in seen:
+                    raise DataError(f"{where}: duplicate {self.key} {record[self.key]!r}")
+                seen.add(record[self.key])
+        return records
+
+
+# Negative login cases of test1 and selenium_log_in_test
+LOGIN_ERROR_SCHEMA = Schema(
+    key="case", case=str, username=str, password=str, expected_error=str,
+)
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_json(path, schema=None):
+    """
+    Records of a JSON file, parsed and validated once per file version;
+    returns a copy, so a caller that edits its records does not affect others
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size, id(schema))
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == version:
+            return copy.deepcopy(cached[1])
+    with open(path, encoding="utf-8") as f:
+        try:
+            records = json.load(f)
+        except ValueError as e:
+            raise DataError(f"{path}: {e}") from None
+    if schema is not None:
+        schema.validate_all(records, path.name)
+    with _cache_lock:
+        _cache[path] = (version, records)
+    return copy.deepcopy(records)
+
+
+class LazyRecord(Mapping):
+    """One line of a JSONL file, read and validated on first access"""
+
+    def __init__(self, path, offset, line, schema=None):
+        self.path = path
+        self.offset = offset
+        self.line = line
+        self.schema = schema
+        self._record = None
+
+    @property
+    def record(self):
+        if self._record is None:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                raw = f.readline()
+            where = f"{self.path.name}:{self.line}"
+            try:
+                record = json.loads(raw)
+            except ValueError as e:
+                raise DataError(f"{where}: {e}") from None
+            self._record = self.schema.validate(record, where) if self.schema else record
+        return self._record
+
+    def __getitem__(self, key):
+        return self.record[key]
+
+    def __iter__(self):
+        return iter(self.record)
+
+    def __len__(self):
+        return len(self.record)
+
+    def __repr__(self):
+        return f"LazyRecord({self.path.name}:{self.line})"
+
+
+def iter_jsonl(path, schema=None, limit=None, shard=None):
+    """
+    pytest.param(LazyRecord) for each non-empty line of a JSONL file, read
+    without parsing. shard=(index, count) keeps every count-th line from index.
+    """
+    path = Path(path).resolve()
+    index, count = shard or (0, 1)
+    selected = 0
+    with open(path, "rb") as f:
+        offset = 0
+        for line_number, raw in enumerate(f, start=1):
+            start, offset = offset, offset + len(raw)
+            if not raw.strip():
+                continue
+            if (line_number - 1) % count != index:
+                continue
+            if limit is not None and selected >= limit:
+                return
+            selected += 1
+            yield pytest.param(LazyRecord(path, start, line_number, schema), id=f"{path.stem}-{line_number}")
+
+
+class JsonlCases:
+    """
+    Cases of a JSONL file for ``@pytest.mark.parametrize``: nothing is read
+    until pytest iterates it to generate the tests, and each iteration
+    streams the file again (iter_jsonl)
+    """
+
+    def __init__(self, path, schema=None, limit=None, shard=None):
+        self.path = Path(path)
+        self.schema = schema
+        self.limit = limit
+        self.shard = shard
+
+    def __iter__(self):
+        return iter_jsonl(self.path, self.schema, limit=self.limit, shard=self.shard)
+
+    def __repr__(self):
+        return f"JsonlCases({self.path.name})"
+
+
+def load_test_data(path, schema=None, base_dir=None):
+    """
+    Test cases of a .json (list of records) or .jsonl (JsonlCases) file;
+    a relative path is resolved against base_dir
+    """
+    path = Path(base_dir or ".") / path
+    if path.suffix == ".jsonl":
+        return JsonlCases(path, schema, limit=settings.DATA_LIMIT, shard=settings.DATA_SHARD)
+    return load_json(path, schema)
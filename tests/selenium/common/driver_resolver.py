@@ -0,0 +1,204 @@
+"""
+Resolves the Chrome binary and a matching chromedriver once, then caches it.
+
+The browser version is read from the binary (keyed on its path, size and
+mtime, so an upgrade is noticed) and the chromedriver found for that version
+is stored in ``drivers.json`` under ``settings.CACHE_DIR``. Every later
+process and run reads the cache instead of asking webdriver-manager or
+Selenium Manager again, so starting a driver costs no network call.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from common import settings
+
+
+CACHE_FILE = "drivers.json"
+VERSION_PATTERN = re.compile(r"(\d+\.\d+\.\d+\.\d+)")
+
+_lock = threading.Lock()
+_resolved = {}
+
+
+class DriverResolutionError(RuntimeError):
+    """No chromedriver matching the installed browser could be found"""
+
+
+@dataclass(frozen=True)
+class ChromeInstall:
+    """A Chrome binary, its version and the chromedriver that drives it"""
+    binary: str
+    version: str
+    driver_path: str
+
+    @property
+    def major(self):
+        return self.version.split(".")[0]
+
+
+def default_chrome_binary():
+    """Chrome binary for the current OS, overridable with CHROME_BINARY"""
+    if sys.platform.startswith("win32"):
+        default = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
+    elif sys.platform.startswith("darwin"):
+        default = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+    else:
+        default = "/usr/bin/chromium-browser"
+    return os.environ.get("CHROME_BINARY", default)
+
+
+def resolve_chrome(binary=None):
+    """Returns the cached ChromeInstall for a binary, resolving it on a miss"""
+    binary = binary or default_chrome_binary()
+    with _lock:
+        if binary not in _resolved:
+            _resolved[binary] = _resolve(binary)
+        return _resolved[binary]
+
+
+def clear_cache():
+    """Forgets every resolution, in memory and on disk"""
+    with _lock:
+        _resolved.clear()
+        try:
+            os.remove(_cache_path())
+        except FileNotFoundError:
+            pass
+
+
+def _resolve(binary):
+    cache = _load_cache()
+    changed = False
+
+    fingerprint = _fingerprint(binary)
+    if fingerprint is None:
+        raise DriverResolutionError(f"Chrome binary not found: {binary} (set CHROME_BINARY)")
+    entry = cache["binaries"].get(binary)
+    if entry and entry.get("fingerprint") == fingerprint:
+        version = entry["version"]
+    else:
+        version = _read_browser_version(binary)
+        cache["binaries"][binary] = {"fingerprint": fingerprint, "version": version}
+        changed = True
+
+    driver_path = os.environ.get("CHROMEDRIVER")
+    if not driver_path:
+        driver_path = cache["drivers"].get(version)
+        if not driver_path or not os.path.isfile(driver_path):
+            driver_path = _find_driver(binary, version)
+            cache["drivers"][version] = driver_path
+            changed = True
+
+    if changed:
+        _save_cache(cache)
+    return ChromeInstall(binary=binary, version=version, driver_path=driver_path)
+
+
+def _fingerprint(binary):
+    try:
+        stat = os.stat(binary)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_browser_version(binary):
+    """Asks the binary for its version, or reads it from the install folder"""
+    if not sys.platform.startswith("win32"):
+        try:
+            output = subprocess.run(
+                [binary, "--version"], capture_output=True, text=True, timeout=30
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            raise DriverResolutionError(f"Cannot run Chrome binary {binary}: {e}") from e
+        match = VERSION_PATTERN.search(output)
+        if match:
+            return match.group(1)
+    # Windows installs keep the version as a folder next to chrome.exe
+    for sibling in Path(binary).parent.glob("*"):
+        if sibling.is_dir() and VERSION_PATTERN.fullmatch(sibling.name):
+            return sibling.name
+    raise DriverResolutionError(f"Cannot determine the version of {binary}")
+
+
+def _find_driver(binary, version):
+    """Tries a local chromedriver first, then the download managers"""
+    major = version.split(".")[0]
+    errors = []
+
+    local = shutil.which("chromedriver")
+    if local:
+        if _driver_major(local) == major:
+            return local
+        errors.append(f"{local} does not match Chrome {major}")
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        try:
+            from webdriver_manager.core.os_manager import ChromeType
+            options = {"driver_version": version}
+        except ImportError:
+            # webdriver-manager 3.x: no Chrome for Testing versions, it matches the
+            # browser it detects itself
+            from webdriver_manager.core.utils import ChromeType
+            options = {}
+
+        chrome_type = ChromeType.CHROMIUM if "chromium" in binary.lower() else ChromeType.GOOGLE
+        return ChromeDriverManager(chrome_type=chrome_type, **options).install()
+    except Exception as e:
+        errors.append(f"webdriver-manager: {e}")
+
+    try:
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+        paths = SeleniumManager().binary_paths(["--browser", "chrome", "--browser-path", binary])
+        return paths["driver_path"]
+    except Exception as e:
+        errors.append(f"Selenium Manager: {e}")
+
+    raise DriverResolutionError(
+        f"No chromedriver found for Chrome {version} ({binary}): " + "; ".join(errors)
+    )
+
+
+def _driver_major(driver_path):
+    try:
+        output = subprocess.run(
+            [driver_path, "--version"], capture_output=True, text=True, timeout=30
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"ChromeDriver (\d+)\.", output)
+    return match.group(1) if match else None
+
+
+def _cache_path():
+    return os.path.join(settings.CACHE_DIR, CACHE_FILE)
+
+
+def _load_cache():
+    try:
+        with open(_cache_path(), encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache.setdefault("binaries", {})
+    cache.setdefault("drivers", {})
+    return cache
+
+
+def _save_cache(cache):
+    """Writes atomically so concurrent workers never read a partial file"""
+    os.makedirs(settings.CACHE_DIR, exist_ok=True)
+    tmp_path = f"{_cache_path()}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, _cache_path())
@@ -0,0 +1,137 @@
+"""
+Form filling for the page objects.
+
+``clear()`` followed by ``send_keys()`` costs an element lookup, a clear
+request and one key event per character. React inputs only need their value
+set and an ``input`` event, so ``fill_form`` offers three modes:
+
+* ``script`` (default): one async script waits for the fields, sets each
+  value through the native ``value`` setter (bypassing React's own setter so
+  it notices the change), dispatches ``input`` and ``change``, and clicks the
+  submit element, all in one call;
+* ``cdp``: each field is focused with its content selected and the text is
+  inserted with CDP ``Input.insertText`` (a real text input event, without
+  one key event per character), then the submit element is clicked;
+* ``keys``: the WebDriver ``clear()`` + ``send_keys()`` path, one key event
+  per character, for tests that check keystroke behavior.
+
+``settings.INPUT_MODE`` selects the default; page objects accept a ``mode``
+argument per call.
+"""
+from selenium.common.exceptions import TimeoutException
+
+from common import settings
+from common.waits import DEFAULT_SCRIPT_TIMEOUT, INSTRUMENT_SCRIPT
+
+
+MODES = ("script", "cdp", "keys")
+
+# setValue(el, value): sets a value the way a user edit would be seen by React
+SET_VALUE_SCRIPT = """
+function setValue(el, value) {
+    var proto = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+"""
+
+# Waits for every locator to be present, then runs the action on the elements
+WITH_ELEMENTS_SCRIPT = """
+var engine = (function () { %s })();
+%s
+var locators = arguments[0], options = arguments[1];
+var done = arguments[arguments.length - 1];
+var start = performance.now();
+(function tick() {
+    var elements = locators.map(engine.find);
+    var missing = locators.filter(function (locator, i) { return !elements[i]; });
+    if (!missing.length) {
+        return done({ok: true, result: run(elements, options)});
+    }
+    if (performance.now() - start >= options.timeout_ms) {
+        return done({ok: false, missing: missing});
+    }
+    document.hidden ? setTimeout(tick, 50) : requestAnimationFrame(tick);
+})();
+""" % (INSTRUMENT_SCRIPT, SET_VALUE_SCRIPT)
+
+# Fields first, submit element last when options.submit is set
+FILL_SCRIPT = WITH_ELEMENTS_SCRIPT + """
+function run(elements, options) {
+    options.values.forEach(function (value, i) { setValue(elements[i], value); });
+    if (options.submit) { elements[elements.length - 1].click(); }
+}
+"""
+
+# Focuses a field with its content selected, so inserted text replaces it
+FOCUS_SCRIPT = WITH_ELEMENTS_SCRIPT + """
+function run(elements, options) {
+    elements[0].focus();
+    if (options.text) {
+        elements[0].select();
+    } else {
+        setValue(elements[0], '');
+    }
+}
+"""
+
+PRESENT_SCRIPT = WITH_ELEMENTS_SCRIPT + """
+function run(elements) {}
+"""
+
+CLICK_SCRIPT = WITH_ELEMENTS_SCRIPT + """
+function run(elements) {
+    elements[0].click();
+}
+"""
+
+
+def _payload(locator):
+    by, value = locator
+    return {"by": by, "value": value}
+
+
+def _run(driver, script, locators, timeout, **options):
+    options["timeout_ms"] = int(timeout * 1000)
+    if timeout + 1 > DEFAULT_SCRIPT_TIMEOUT:
+        driver.set_script_timeout(timeout + 5)
+    result = driver.execute_async_script(script, [_payload(locator) for locator in locators], options)
+    if not result["ok"]:
+        raise TimeoutException(f"form elements not found after {timeout}s: {result['missing']}")
+    return result["result"]
+
+
+def fill_form(driver, fields, submit=None, mode=None, timeout=10):
+    """
+    Fills fields, a list of ((By, value), text), then clicks the submit
+    locator if given. Raises TimeoutException when an element is missing.
+    """
+    mode = mode or settings.INPUT_MODE
+    if mode not in MODES:
+        raise ValueError(f"unknown input mode {mode!r}, expected one of {MODES}")
+    if mode == "cdp" and not hasattr(driver, "execute_cdp_cmd"):
+        mode = "script"
+
+    if mode == "script":
+        locators = [locator for locator, _ in fields] + ([submit] if submit else [])
+        _run(driver, FILL_SCRIPT, locators, timeout, values=[text for _, text in fields], submit=bool(submit))
+        return
+
+    for locator, text in fields:
+        if mode == "cdp":
+            _run(driver, FOCUS_SCRIPT, [locator], timeout, text=text)
+            if text:
+                driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        else:
+            _run(driver, PRESENT_SCRIPT, [locator], timeout)
+            element = driver.find_element(*locator)
+            element.clear()
+            element.send_keys(text)
+    if not submit:
+        return
+    if mode == "cdp":
+        _run(driver, CLICK_SCRIPT, [submit], timeout)
+    else:
+        _run(driver, PRESENT_SCRIPT, [submit], timeout)
+        driver.find_element(*submit).click()
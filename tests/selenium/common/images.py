@@ -0,0 +1,218 @@
+"""
+Image integrity checks for the inventory and product detail pages.
+
+``is_displayed`` cannot tell that ``problem_user`` is shown the wrong
+picture, so images are checked by content instead:
+
+* one script call lists every ``img`` of the page with the product it
+  illustrates, its resolved src and its natural size,
+* the files are downloaded concurrently over a pooled ``requests`` session
+  that sends the browser's cookies and user agent,
+* each file's SHA-256 is compared with a reference manifest built from
+  ``standard_user`` and saved under ``settings.CACHE_DIR``, per target site.
+  The manifest records when it was built and is ignored (so recorded again)
+  once older than ``settings.IMAGE_MANIFEST_MAX_AGE``.
+
+The download threads and connections of the shared checker are released
+when the session ends (``ImageCheckPlugin``).
+
+An image is *broken* when it does not download, is empty or was not decoded
+by the browser, and *mismatched* when its content differs from the
+reference image of the same product.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common import settings
+
+
+MANIFEST_FILE = "images-manifest-{target}.json"
+REFERENCE_USER = "standard_user"
+
+MAX_WORKERS = 8
+FETCH_TIMEOUT = 10
+
+COLLECT_SCRIPT = """
+function productOf(img) {
+    var card = img.closest('.inventory_item, .inventory_details_container');
+    var name = card && card.querySelector('.inventory_item_name, .inventory_details_name');
+    return name ? (name.innerText || name.textContent).trim() : null;
+}
+return {
+    user_agent: navigator.userAgent,
+    images: Array.prototype.map.call(document.images, function (img) {
+        return {
+            product: productOf(img),
+            src: img.currentSrc || img.src,
+            natural_width: img.naturalWidth,
+            natural_height: img.naturalHeight,
+            complete: img.complete
+        };
+    })
+};
+"""
+
+
+@dataclass
+class ImageResult:
+    """Check result for one image of the page"""
+    product: str
+    src: str
+    natural_width: int = 0
+    status: int = None
+    size: int = 0
+    sha256: str = None
+    expected: str = None
+    error: str = None
+
+    @property
+    def broken(self):
+        return bool(self.error) or self.status != 200 or self.size == 0 or self.natural_width == 0
+
+    @property
+    def mismatched(self):
+        return self.expected is not None and self.sha256 is not None and self.sha256 != self.expected
+
+    @property
+    def ok(self):
+        return not self.broken and not self.mismatched
+
+
+class ImageManifest:
+    """Reference SHA-256 of each product image, recorded with standard_user"""
+
+    def __init__(self, path=None, max_age=None):
+        self.path = path or os.path.join(settings.CACHE_DIR, MANIFEST_FILE.format(target=settings.TARGET))
+        self.max_age = settings.IMAGE_MANIFEST_MAX_AGE if max_age is None else max_age
+        self.images = {}
+        self.recorded_at = None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Older files hold only the images, without a date: treated as expired
+        recorded_at = data.get("recorded_at") if isinstance(data, dict) else None
+        if isinstance(recorded_at, (int, float)) and time.time() - recorded_at <= self.max_age:
+            self.images = data.get("images", {})
+            self.recorded_at = recorded_at
+
+    def __bool__(self):
+        return bool(self.images)
+
+    def expected(self, product):
+        entry = self.images.get(product)
+        return entry["sha256"] if entry else None
+
+    def record(self, results):
+        """Stores the intact product images of a reference run"""
+        for result in results:
+            if result.product and not result.broken:
+                self.images[result.product] = {"sha256": result.sha256, "src": result.src}
+
+    def save(self):
+        self.recorded_at = time.time()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"recorded_at": self.recorded_at, "images": self.images}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class ImageChecker:
+    """Downloads and hashes page images concurrently over pooled connections"""
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-check")
+
+    def check(self, driver, manifest=None):
+        """Checks every image of the current page; returns one ImageResult per img"""
+        page = driver.execute_script(COLLECT_SCRIPT)
+        cookies = {cookie["name"]: cookie["value"] for cookie in driver.get_cookies()}
+        headers = {"User-Agent": page["user_agent"]}
+
+        images = [image for image in page["images"] if image["src"]]
+        srcs = {image["src"] for image in images}
+        fetched = dict(zip(srcs, self.executor.map(
+            lambda src: self._fetch(src, cookies, headers), srcs
+        )))
+
+        results = []
+        for image in images:
+            result = ImageResult(
+                product=image["product"],
+                src=image["src"],
+                natural_width=image["natural_width"],
+                expected=manifest.expected(image["product"]) if manifest else None,
+            )
+            result.status, result.size, result.sha256, result.error = fetched[image["src"]]
+            results.append(result)
+        return results
+
+    def _fetch(self, src, cookies, headers):
+        try:
+            response = self.session.get(src, cookies=cookies, headers=headers, timeout=FETCH_TIMEOUT)
+        except requests.RequestException as e:
+            return None, 0, None, str(e)
+        content = response.content
+        return response.status_code, len(content), hashlib.sha256(content).hexdigest(), None
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def shared_checker():
+    """Process-wide checker, so connections are reused across tests"""
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            _checker = ImageChecker()
+        return _checker
+
+
+def close_shared_checker():
+    """Stops the threads and closes the connections of the shared checker"""
+    global _checker
+    with _checker_lock:
+        checker, _checker = _checker, None
+    if checker is not None:
+        checker.close()
+
+
+class ImageCheckPlugin:
+    """Releases the shared image checker when the session ends"""
+
+    def __init__(self, config):
+        pass
+
+    def pytest_sessionfinish(self, session):
+        close_shared_checker()
+
+
+def problems(results):
+    """Broken or mismatched images, as readable lines for an assertion message"""
+    lines = []
+    for result in results:
+        if result.broken:
+            reason = result.error or f"HTTP {result.status}, {result.size} bytes, width {result.natural_width}"
+            lines.append(f"{result.product or '?'}: broken image {result.src} ({reason})")
+        elif result.mismatched:
+            lines.append(f"{result.product}: wrong image {result.src}")
+    return lines
@@ -0,0 +1,166 @@
+"""
+Bulk extraction of the SauceDemo inventory.
+
+The whole product list is read with one ``execute_script`` call that returns
+plain data for every ``.inventory_item``. Each product is a ``Product`` dict;
+its WebElements (``element``, ``image``, ``add_button``, ``name_link``) are
+only looked up when a test reads those keys, so a test that only checks
+names and prices makes no further WebDriver call.
+
+An ``InventorySnapshot`` keeps one extraction indexed by name and item id,
+together with the state of the page it was read from: document, URL, sort
+order and the DOM mutation counter of the wait engine (``common.waits``).
+The snapshot is current as long as that state has not changed, which costs
+one small script call to check. ``InventorySnapshot.health()`` checks the
+elements of every product card (visibility, clickability, enabled state,
+image src and natural size) in one more call and keeps the result table.
+"""
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from common.waits import INSTRUMENT_SCRIPT
+
+
+ITEM_SELECTOR = ".inventory_item"
+
+# Identifies the rendering a snapshot was read from
+STATE_SCRIPT = """
+var engine = (function () { %s })();
+var sort = document.querySelector('.product_sort_container');
+var state = {
+    document: engine.id,
+    url: location.href,
+    sort: sort ? sort.value : null,
+    mutations: engine.mutations
+};
+""" % INSTRUMENT_SCRIPT
+
+CHECK_STATE_SCRIPT = STATE_SCRIPT + "return state;"
+
+EXTRACT_SCRIPT = STATE_SCRIPT + """
+var items = document.querySelectorAll(arguments[0]);
+var products = Array.prototype.map.call(items, function (item, index) {
+    function text(selector) {
+        var el = item.querySelector(selector);
+        return el ? (el.innerText || el.textContent).trim() : null;
+    }
+    var img = item.querySelector('.inventory_item_img img');
+    var button = item.querySelector('button');
+    var link = item.querySelector("a[id$='_title_link'], a[id$='_img_link']");
+    var match = link && /item_(\\d+)_/.exec(link.id);
+    return {
+        index: index,
+        item_id: match ? parseInt(match[1], 10) : null,
+        name: text('.inventory_item_name'),
+        price: text('.inventory_item_price'),
+        description: text('.inventory_item_desc'),
+        image_src: img ? img.src : null,
+        image_alt: img ? img.alt : null,
+        image_natural_width: img ? img.naturalWidth : 0,
+        image_natural_height: img ? img.naturalHeight : 0,
+        image_complete: img ? img.complete : false,
+        button_id: button ? button.id : null,
+        button_text: button ? (button.innerText || button.textContent).trim() : null,
+        button_enabled: button ? !button.disabled : false
+    };
+});
+return {state: state, products: products};
+"""
+
+# Element health of every product card, keyed by product name
+HEALTH_SCRIPT = """
+var engine = (function () { %s })();
+var table = {};
+Array.prototype.forEach.call(document.querySelectorAll(arguments[0]), function (item) {
+    var img = item.querySelector('.inventory_item_img img');
+    var button = item.querySelector("button[id^='add-to-cart']");
+    var name = item.querySelector('.inventory_item_name');
+    function clickable(el) {
+        return engine.visible(el) && !el.disabled && getComputedStyle(el).pointerEvents !== 'none';
+    }
+    table[name ? (name.innerText || name.textContent).trim() : ''] = {
+        has_visible_image: engine.visible(img),
+        image_has_src: !!(img && img.getAttribute('src')),
+        image_natural_width: img ? img.naturalWidth : 0,
+        image_natural_height: img ? img.naturalHeight : 0,
+        image_loaded: !!(img && img.complete && img.naturalWidth > 0),
+        has_add_button: engine.visible(button),
+        button_is_enabled: !!button && !button.disabled,
+        button_is_clickable: !!button && clickable(button),
+        has_clickable_name: !!name && clickable(name)
+    };
+});
+return table;
+""" % INSTRUMENT_SCRIPT
+
+ITEM_SCRIPT = "return document.querySelectorAll(arguments[0])[arguments[1]] || null;"
+
+
+class Product(dict):
+    """Plain product data; WebElement keys are resolved on first access"""
+
+    # Same locators the per-element extraction used, relative to the item
+    ELEMENT_LOCATORS = {
+        "image": (By.CSS_SELECTOR, ".inventory_item_img img"),
+        "add_button": (By.CSS_SELECTOR, "button[id^='add-to-cart']"),
+        "name_link": (By.CLASS_NAME, "inventory_item_name"),
+    }
+
+    def __init__(self, driver, data):
+        super().__init__(data)
+        self.driver = driver
+
+    def __missing__(self, key):
+        if key == "element":
+            element = self.driver.execute_script(ITEM_SCRIPT, ITEM_SELECTOR, self["index"])
+            if element is None:
+                raise NoSuchElementException(f"inventory item {self['index']} is gone")
+        elif key in self.ELEMENT_LOCATORS:
+            element = self["element"].find_element(*self.ELEMENT_LOCATORS[key])
+        else:
+            raise KeyError(key)
+        self[key] = element
+        return element
+
+
+class InventorySnapshot:
+    """One extraction of the inventory, indexed by name and item id"""
+
+    def __init__(self, driver, state, products):
+        self.driver = driver
+        self.state = state
+        self.products = products
+        self.by_name = {product["name"]: product for product in products}
+        self.by_id = {product["item_id"]: product for product in products if product["item_id"] is not None}
+        self._health = None
+
+    def health(self):
+        """Per-product element checks {name: {check: bool/int}}, one script call"""
+        if self._health is None:
+            self._health = self.driver.execute_script(HEALTH_SCRIPT, ITEM_SELECTOR)
+        return self._health
+
+    def is_current(self):
+        """True while the page is still the rendering the snapshot was read from"""
+        try:
+            return self.driver.execute_script(CHECK_STATE_SCRIPT) == self.state
+        except Exception:
+            return False
+
+    def __iter__(self):
+        return iter(self.products)
+
+    def __len__(self):
+        return len(self.products)
+
+
+def take_snapshot(driver):
+    """Reads every inventory item, and the page state, in one script call"""
+    result = driver.execute_script(EXTRACT_SCRIPT, ITEM_SELECTOR)
+    products = [Product(driver, data) for data in result["products"]]
+    return InventorySnapshot(driver, result["state"], products)
+
+
+def extract_products(driver):
+    """Reads every inventory item in one script call"""
+    return take_snapshot(driver).products
@@ -0,0 +1,185 @@
+"""
+In-page batch runner for negative login cases.
+
+Instead of one page load, typed input, click and explicit wait per case, the
+login page is loaded once and a single async script drives every case:
+
+* fills username and password through the native value setter and
+  ``input``/``change`` events (what React listens to),
+* clicks the login button and waits, on animation frames, for the error
+  message or a URL change,
+* records the error text, clicks the close button and checks the message
+  disappears,
+* clears the fields for the next case.
+
+A case that logs in, shows another error than its ``expected_error`` or
+whose error cannot be closed ends the script. While the page still shows
+that case, the browser is captured (screenshot and DOM with
+``settings.SCREENSHOTS``, the screencast frames with ``settings.SCREENCAST``);
+then the page is loaded again and the remaining cases continue. Cases are
+sent in chunks of ``BATCH_SIZE`` so the script timeout stays bounded.
+
+Each result is a dict ``{case, error, closed, logged_in, url, problem}``,
+plus ``artifacts`` ({user property: [entries]}) for a captured case; tests
+look their own case up, so every case is still its own pytest result.
+"""
+from selenium.common.exceptions import WebDriverException
+
+from common import settings
+from common.forms import SET_VALUE_SCRIPT
+from common.screencast import store_recording
+from common.screenshots import store_capture
+from common.waits import INSTRUMENT_SCRIPT
+
+
+BATCH_SIZE = 200
+
+BATCH_SCRIPT = """
+var engine = (function () { %s })();
+%s
+var cases = arguments[0], locators = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var startUrl = location.href;
+var results = [];
+
+function until(check) {
+    var deadline = performance.now() + timeoutMs;
+    return new Promise(function (resolve) {
+        (function poll() {
+            var value = check();
+            if (value) { resolve(value); }
+            else if (performance.now() > deadline) { resolve(null); }
+            else { requestAnimationFrame(poll); }
+        })();
+    });
+}
+function runCase(data) {
+    var result = {case: data.case, error: null, closed: false, logged_in: false, url: null, problem: null};
+    var username = engine.find(locators.username), password = engine.find(locators.password);
+    var button = engine.find(locators.button);
+    if (!username || !password || !button) {
+        result.problem = 'login form not found';
+        return Promise.resolve(result);
+    }
+    setValue(username, data.username);
+    setValue(password, data.password);
+    button.click();
+    return until(function () {
+        var error = engine.find(locators.error);
+        if (error) { return {error: error}; }
+        if (location.href !== startUrl) { return {navigated: true}; }
+    }).then(function (outcome) {
+        result.url = location.href;
+        if (!outcome) {
+            result.problem = 'no error message and no navigation';
+            return result;
+        }
+        if (outcome.navigated) {
+            result.logged_in = true;
+            return result;
+        }
+        result.error = (outcome.error.innerText || outcome.error.textContent).trim();
+        if (data.expected_error != null && result.error !== data.expected_error) {
+            // Leave the wrong message on screen for the capture
+            return result;
+        }
+        var close = engine.find(locators.close);
+        if (!close) {
+            result.problem = 'close button not found';
+            return result;
+        }
+        close.click();
+        return until(function () { return !engine.find(locators.error); }).then(function (gone) {
+            result.closed = !!gone;
+            if (!gone) { result.problem = 'message still displayed after close'; }
+            var fields = [engine.find(locators.username), engine.find(locators.password)];
+            fields.forEach(function (el) { if (el) { setValue(el, ''); } });
+            return result;
+        });
+    });
+}
+(function next(index) {
+    if (index >= cases.length) {
+        done({results: results, error: null});
+        return;
+    }
+    runCase(cases[index]).then(function (result) {
+        results.push(result);
+        if (result.logged_in || !result.closed) {
+            done({results: results, error: null});
+        } else {
+            next(index + 1);
+        }
+    }).catch(function (e) {
+        done({results: results, error: String(e)});
+    });
+})(0);
+""" % (INSTRUMENT_SCRIPT, SET_VALUE_SCRIPT)
+
+
+def _locator(locator):
+    by, value = locator
+    return {"by": by, "value": value}
+
+
+def capture_artifacts(driver):
+    """Failure artifacts of the batch browser, as {user property: [entries]}"""
+    artifacts = {}
+    if settings.SCREENSHOTS:
+        try:
+            artifacts["failure_artifacts"] = [store_capture(driver)]
+        except WebDriverException:
+            pass
+    player = store_recording(driver)
+    if player is not None:
+        artifacts["screencast"] = [player]
+    return artifacts
+
+
+def run_login_batch(driver, url, locators, cases, timeout=5, batch_size=BATCH_SIZE):
+    """
+    Runs cases ({case, username, password[, expected_error]}) in the login
+    page at url; locators maps username, password, button, error and close
+    to (By, value). Returns {case: result}.
+    """
+    page_locators = {name: _locator(locator) for name, locator in locators.items()}
+    pending = [
+        {
+            "case": data["case"], "username": data["username"], "password": data["password"],
+            "expected_error": data.get("expected_error"),
+        }
+        for data in cases
+    ]
+    results = {}
+    while pending:
+        batch = pending[:batch_size]
+        driver.get(url)
+        driver.set_script_timeout(len(batch) * timeout * 2 + 5)
+        outcome = driver.execute_async_script(BATCH_SCRIPT, batch, page_locators, int(timeout * 1000))
+        for result in outcome["results"]:
+            results[result["case"]] = result
+        ran = len(outcome["results"])
+        if ran == 0:
+            # The page could not run this case at all: report it and move on
+            first = batch[0]
+            results[first["case"]] = {
+                "case": first["case"], "error": None, "closed": False, "logged_in": False,
+                "url": None, "problem": outcome["error"] or "batch script stopped",
+            }
+            ran = 1
+        last = results[batch[ran - 1]["case"]]
+        if last["logged_in"] or not last["closed"]:
+            # The script stopped on this case and the page still shows it
+            last["artifacts"] = capture_artifacts(driver)
+        pending = pending[ran:]
+    return results
+
+
+def collected_cases(request, argname):
+    """Values of argname for the tests of the requesting module selected for this run"""
+    cases = []
+    for item in request.session.items:
+        callspec = getattr(item, "callspec", None)
+        if getattr(item, "module", None) is request.module and callspec and argname in callspec.params:
+            cases.append(callspec.params[argname])
+    return cases
@@ -0,0 +1,168 @@
+"""
+Per-navigation performance metrics.
+
+After each navigation (page load or in-app transition) the page objects call
+``NAVIGATIONS.record(driver, transition)``, which reads in one script call:
+
+* the Navigation Timing entry of the document, the first time this document
+  is measured (later in-app transitions reuse the same document),
+* the paint entries (first-paint, first-contentful-paint),
+* the resource timing entries added since the previous measure of the
+  document (a cursor is kept in the page).
+
+With ``settings.CDP_METRICS`` the browser's ``Performance.getMetrics``
+counters are added (one CDP command, outside the page).
+
+Each navigation is appended as one JSON line to ``navigations.jsonl`` under
+``settings.RESULTS_DIR`` and the test's navigations are attached to its
+report (``NavigationMetricsPlugin``). Collecting never fails a test.
+"""
+import json
+import os
+import threading
+import time
+import weakref
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from common import settings
+from common.timeouts import TIMEOUTS
+
+
+METRICS_FILE = "navigations.jsonl"
+
+# Resource entries kept by the browser before it stops recording (default 250)
+RESOURCE_BUFFER_SIZE = 1000
+
+COLLECT_SCRIPT = """
+function ms(value) { return Math.round(value * 10) / 10; }
+var state = window.__navigationMetrics;
+if (!state) {
+    state = window.__navigationMetrics = {cursor: 0, measured: false};
+    performance.setResourceTimingBufferSize(%d);
+}
+var result = {url: location.href, now: ms(performance.now()), navigation: null, paint: {}, resources: []};
+
+var nav = performance.getEntriesByType('navigation')[0];
+if (nav && !state.measured) {
+    state.measured = true;
+    result.navigation = {
+        type: nav.type,
+        response_start: ms(nav.responseStart),
+        response_end: ms(nav.responseEnd),
+        dom_interactive: ms(nav.domInteractive),
+        dom_content_loaded: ms(nav.domContentLoadedEventEnd),
+        load: ms(nav.loadEventEnd),
+        transfer_size: nav.transferSize,
+        encoded_body_size: nav.encodedBodySize
+    };
+}
+performance.getEntriesByType('paint').forEach(function (entry) {
+    result.paint[entry.name] = ms(entry.startTime);
+});
+var resources = performance.getEntriesByType('resource');
+result.resources = resources.slice(state.cursor).map(function (entry) {
+    return {
+        name: entry.name,
+        type: entry.initiatorType,
+        start: ms(entry.startTime),
+        duration: ms(entry.duration),
+        transfer_size: entry.transferSize,
+        encoded_body_size: entry.encodedBodySize
+    };
+});
+state.cursor = resources.length;
+return result;
+""" % RESOURCE_BUFFER_SIZE
+
+
+class NavigationLog:
+    """Navigations measured during the current test, also appended to a JSONL file"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(settings.RESULTS_DIR, METRICS_FILE)
+        self._lock = threading.Lock()
+        self._cdp_enabled = weakref.WeakSet()
+        self.reset()
+
+    def reset(self, test=None):
+        with self._lock:
+            self.test = test
+            self.entries = []
+
+    def record(self, driver, transition, elapsed=None):
+        """Measures the page after a navigation; returns the entry, or None"""
+        if not settings.NAVIGATION_METRICS:
+            return None
+        try:
+            entry = driver.execute_script(COLLECT_SCRIPT)
+            if settings.CDP_METRICS and hasattr(driver, "execute_cdp_cmd"):
+                entry["cdp"] = self._cdp_metrics(driver)
+        except WebDriverException:
+            return None
+        entry.update(
+            test=self.test,
+            user=TIMEOUTS.user_of(driver),
+            transition=transition,
+            elapsed=round(elapsed, 4) if elapsed is not None else None,
+            timestamp=round(time.time(), 3),
+        )
+        with self._lock:
+            self.entries.append(entry)
+        self._append(entry)
+        return entry
+
+    def summary(self):
+        """Compact view of the test's navigations for its report"""
+        with self._lock:
+            return [
+                {
+                    "transition": entry["transition"],
+                    "url": entry["url"],
+                    "elapsed": entry["elapsed"],
+                    "load": (entry["navigation"] or {}).get("load"),
+                    "first_contentful_paint": entry["paint"].get("first-contentful-paint"),
+                    "resources": len(entry["resources"]),
+                }
+                for entry in self.entries
+            ]
+
+    def _cdp_metrics(self, driver):
+        if driver not in self._cdp_enabled:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            self._cdp_enabled.add(driver)
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+        return {metric["name"]: metric["value"] for metric in metrics}
+
+    def _append(self, entry):
+        # One write() per line on an O_APPEND descriptor: workers can share the file
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+NAVIGATIONS = NavigationLog()
+
+
+class NavigationMetricsPlugin:
+    """Tags navigations with the running test and attaches them to its report"""
+
+    def __init__(self, config):
+        pass
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        NAVIGATIONS.reset(item.nodeid)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown":
+            item.user_properties.append(("navigations", NAVIGATIONS.summary()))
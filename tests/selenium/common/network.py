@@ -0,0 +1,315 @@
+"""
+Network layer of the test browsers, over CDP.
+
+Every browser started by the pool (``attach``) gets:
+
+* ``Network.setBlockedURLs`` with ``settings.BLOCKED_URLS`` (third-party
+  analytics and error reporting by default), so those requests never leave
+  the browser;
+* ``Fetch`` interception of scripts, stylesheets, images and fonts, served
+  from an on-disk cache under ``settings.CACHE_DIR`` shared by every pooled
+  browser and worker process. A cached asset is fulfilled without touching
+  the network; any other request continues and its response is stored when
+  it is cacheable (GET, 200, an explicit ``max-age`` or ``Expires``, no
+  ``no-store``/``no-cache``/``private``), for that lifetime capped by
+  ``settings.ASSET_CACHE_MAX_AGE``. If serving or storing fails, the request
+  continues to the network untouched.
+
+Hits, misses and bytes saved are counted per test, attached to the report
+and summarized at the end of the run (``NetworkStatsPlugin``). A browser
+without a usable CDP connection runs without the cache, with a warning.
+"""
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import warnings
+import weakref
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+import pytest
+
+from common import settings
+from common.cdp import CdpChannel
+
+
+CACHE_DIRNAME = "assets"
+
+# Resource types served from the cache
+CACHED_TYPES = ("Script", "Stylesheet", "Image", "Font")
+
+# Headers that describe the transfer, not the decoded body kept in the cache
+TRANSFER_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _header(headers, name):
+    return next((value for key, value in headers if key.lower() == name), None)
+
+
+def _http_date(value):
+    """Timestamp of an HTTP date header, None when missing or invalid"""
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return date.timestamp()
+
+
+class AssetCache:
+    """Static responses on disk, one file per URL, shared between processes"""
+
+    def __init__(self, path=None, max_age=None):
+        self.path = path or os.path.join(settings.CACHE_DIR, CACHE_DIRNAME)
+        self.max_age = settings.ASSET_CACHE_MAX_AGE if max_age is None else max_age
+        # Set while a test needs every asset from the server (stand-in profiles)
+        self.bypass = False
+
+    def _file(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, key[:2], f"{key}.asset")
+
+    def get(self, url):
+        """(status, headers, body) of a fresh entry, or None"""
+        try:
+            with open(self._file(url), "rb") as f:
+                meta = json.loads(f.readline())
+                if meta["url"] != url or meta["expires"] < time.time():
+                    return None
+                return meta["status"], meta["headers"], f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, url, status, headers, body):
+        """Stores a response if it is cacheable; returns True when stored"""
+        max_age = self.lifetime(headers)
+        if not max_age:
+            return False
+        path = self._file(url)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": [[name, value] for name, value in headers if name.lower() not in TRANSFER_HEADERS],
+            "expires": time.time() + max_age,
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(meta).encode("utf-8") + b"\n")
+            f.write(body)
+        os.replace(tmp_path, path)
+        return True
+
+    def lifetime(self, headers):
+        """
+        Seconds a response may be reused: its max-age, or Expires minus Date,
+        capped by max_age. 0 when it must not be cached or states no freshness.
+        """
+        cache_control = ",".join(value for name, value in headers if name.lower() == "cache-control").lower()
+        if "no-store" in cache_control or "no-cache" in cache_control or "private" in cache_control:
+            return 0
+        match = MAX_AGE_RE.search(cache_control)
+        if match:
+            seconds = int(match.group(1))
+        else:
+            expires = _http_date(_header(headers, "expires"))
+            if expires is None:
+                return 0
+            date = _http_date(_header(headers, "date"))
+            seconds = int(expires - (time.time() if date is None else date))
+        return max(0, min(seconds, self.max_age))
+
+
+class CacheStats:
+    """Accumulates the asset cache activity of the current test"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.stored = 0
+            self.bytes_saved = 0
+
+    def hit(self, size):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def store(self):
+        with self._lock:
+            self.stored += 1
+
+    def summary(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "requests": requests,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stored": self.stored,
+                "hit_rate": round(self.hits / requests, 3) if requests else None,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+ASSET_CACHE = AssetCache()
+STATS = CacheStats()
+
+
+class NetworkLayer:
+    """Blocked URLs and asset caching for one browser"""
+
+    def __init__(self, driver, cache=ASSET_CACHE, stats=STATS):
+        self.driver = driver
+        self.cache = cache
+        self.stats = stats
+        self.channel = None
+
+    def start(self):
+        if settings.BLOCKED_URLS:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": settings.BLOCKED_URLS})
+        if settings.ASSET_CACHE:
+            self.channel = CdpChannel(self.driver).start()
+            fetch, network = self.channel.devtools.fetch, self.channel.devtools.network
+            patterns = [
+                fetch.RequestPattern(
+                    url_pattern="*",
+                    resource_type=network.ResourceType(resource_type),
+                    request_stage=fetch.RequestStage(stage),
+                )
+                for resource_type in CACHED_TYPES
+                for stage in ("Request", "Response")
+            ]
+            self.channel.listen(fetch.RequestPaused, self._paused)
+            self.channel.execute(fetch.enable(patterns=patterns))
+        return self
+
+    def stop(self):
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+
+    async def _paused(self, event):
+        fetch = self.channel.devtools.fetch
+        try:
+            if event.response_status_code is None and event.response_error_reason is None:
+                await self._serve(event, fetch)
+            else:
+                await self._store(event, fetch)
+        except Exception:
+            # Cache or CDP error: never leave the request paused, let it reach the network
+            try:
+                await self.channel.send(self._resume(event, fetch))
+            except Exception:
+                # The page navigated away or the browser closed: the request is gone
+                pass
+
+    @staticmethod
+    def _resume(event, fetch):
+        """Command that lets a paused request go on unchanged"""
+        if event.response_status_code is None:
+            return fetch.continue_request(event.request_id)
+        return fetch.continue_response(event.request_id)
+
+    async def _serve(self, event, fetch):
+        entry = None
+        if event.request.method == "GET" and not self.cache.bypass:
+            entry = self.cache.get(event.request.url)
+        if entry is None:
+            self.stats.miss()
+            await self.channel.send(fetch.continue_request(event.request_id))
+            return
+        status, headers, body = entry
+        self.stats.hit(len(body))
+        await self.channel.send(fetch.fulfill_request(
+            event.request_id,
+            status,
+            response_headers=[fetch.HeaderEntry(name, value) for name, value in headers],
+            body=base64.b64encode(body).decode("ascii"),
+        ))
+
+    async def _store(self, event, fetch):
+        if event.request.method == "GET" and event.response_status_code == 200 and not self.cache.bypass:
+            headers = [(header.name, header.value) for header in event.response_headers or []]
+            if self.cache.lifetime(headers):
+                body, encoded = await self.channel.send(fetch.get_response_body(event.request_id))
+                body = base64.b64decode(body) if encoded else body.encode("utf-8")
+                if self.cache.put(event.request.url, 200, headers, body):
+                    self.stats.store()
+        await self.channel.send(self._resume(event, fetch))
+
+
+_layers = weakref.WeakKeyDictionary()
+
+
+def attach(driver):
+    """Starts the network layer of a new browser; returns the driver"""
+    if not (settings.BLOCKED_URLS or settings.ASSET_CACHE):
+        return driver
+    layer = NetworkLayer(driver)
+    try:
+        _layers[driver] = layer.start()
+    except Exception as e:
+        layer.stop()
+        warnings.warn(f"network layer disabled for this browser: {e}")
+    return driver
+
+
+def detach(driver):
+    """Closes the CDP channel of a browser that is about to quit"""
+    layer = _layers.pop(driver, None)
+    if layer is not None:
+        layer.stop()
+
+
+class NetworkStatsPlugin:
+    """Attaches each test's asset cache activity to its report and sums up the run"""
+
+    def __init__(self, config):
+        self.per_test = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        STATS.reset()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown":
+            item.user_properties.append(("asset_cache", STATS.summary()))
+
+    def pytest_runtest_logreport(self, report):
+        for name, value in report.user_properties:
+            if name == "asset_cache" and value["requests"]:
+                self.per_test[report.nodeid] = value
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.per_test:
+            return
+        hits = sum(value["hits"] for value in self.per_test.values())
+        requests = sum(value["requests"] for value in self.per_test.values())
+        saved = sum(value["bytes_saved"] for value in self.per_test.values())
+        terminalreporter.write_sep("=", "asset cache")
+        top = sorted(self.per_test.items(), key=lambda pair: pair[1]["bytes_saved"], reverse=True)[:10]
+        for nodeid, value in top:
+            terminalreporter.write_line(
+                f"{value['hits']:4d}/{value['requests']:<4d} hits {value['bytes_saved'] / 1024:9.1f} KiB saved  {nodeid}"
+            )
+        terminalreporter.write_line(
+            f"{hits:4d}/{requests:<4d} hits {saved / 1024:9.1f} KiB saved  total ({hits / requests:.0%} hit rate)"
+        )
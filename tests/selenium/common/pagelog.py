@@ -0,0 +1,135 @@
+"""
+Logging for the page objects and tests, kept with the test that produced it.
+
+``get(name)`` returns a standard ``logging`` logger under ``selenium.pages``:
+
+* its level is ``settings.LOG_LEVEL``; a call below that level returns
+  before the message is formatted, so pass %-style arguments
+  (``log.info("%s ouvert: %s", name, url)``), not f-strings;
+* records are not printed. They go to a ring buffer of the current test (the
+  last ``settings.LOG_BUFFER`` records) as ``LogRecord`` objects, formatted
+  only when the buffer is dumped;
+* ``on_failure(label, func)`` registers a diagnostic (current URL, an
+  attribute, a fragment of HTML) that is read from the browser only if the
+  test fails, instead of an extra round trip on every run.
+
+``PageLogPlugin`` dumps the records and the diagnostics into the report of a
+failed test (a "page log" section and a ``page_log`` user property), or of
+every test with ``settings.LOG_ALL``, and drops them otherwise.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from common import settings
+
+
+ROOT_LOGGER = "selenium.pages"
+
+# Value shown for a diagnostic that could not be read
+DIAGNOSTIC_ERROR = "<{name}: {error}>"
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last records and the deferred diagnostics of the current test"""
+
+    def __init__(self, capacity):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.diagnostics = []
+        self.start = time.time()
+        self._buffer_lock = threading.Lock()
+
+    def emit(self, record):
+        with self._buffer_lock:
+            self.records.append(record)
+
+    def reset(self):
+        with self._buffer_lock:
+            self.records.clear()
+            self.diagnostics = []
+            self.start = time.time()
+
+    def defer(self, label, func):
+        with self._buffer_lock:
+            self.diagnostics.append((label, func))
+
+    def dump(self):
+        """Records as dicts, followed by the diagnostics read now"""
+        with self._buffer_lock:
+            records, diagnostics = list(self.records), list(self.diagnostics)
+        entries = [
+            {
+                "time": round(record.created - self.start, 3),
+                "level": record.levelname,
+                "logger": record.name[len(ROOT_LOGGER) + 1:] or record.name,
+                "message": record.getMessage(),
+            }
+            for record in records
+        ]
+        for label, func in diagnostics:
+            try:
+                value = func()
+            except Exception as e:
+                value = DIAGNOSTIC_ERROR.format(name=type(e).__name__, error=e)
+            entries.append({
+                "time": round(time.time() - self.start, 3),
+                "level": "DIAG",
+                "logger": label,
+                "message": str(value),
+            })
+        return entries
+
+
+BUFFER = RingBufferHandler(settings.LOG_BUFFER)
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.setLevel(settings.LOG_LEVEL.upper())
+_root.addHandler(BUFFER)
+# The buffer is the only output: pytest's own log capture would repeat it
+_root.propagate = False
+
+
+def get(name):
+    """Logger of a page object or test module"""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def on_failure(label, func):
+    """func() is called, and its result reported, only if the current test fails"""
+    BUFFER.defer(label, func)
+
+
+def format_entries(entries):
+    return "\n".join(
+        f"{entry['time']:8.3f}s {entry['level']:<7} {entry['logger']}: {entry['message']}"
+        for entry in entries
+    )
+
+
+class PageLogPlugin:
+    """Attaches the page log to the report of failed tests"""
+
+    def __init__(self, config):
+        self._dumped = False
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        BUFFER.reset()
+        self._dumped = False
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if self._dumped:
+            return
+        if report.failed or (settings.LOG_ALL and report.when == "teardown"):
+            self._dumped = True
+            entries = BUFFER.dump()
+            if entries:
+                report.sections.append(("page log", format_entries(entries)))
+                report.user_properties.append(("page_log", entries))
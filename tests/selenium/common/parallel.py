@@ -0,0 +1,285 @@
+"""
+Multi-process execution for the Selenium suites.
+
+With ``SELENIUM_WORKERS=N`` (N > 1) the pytest process that collected the
+tests becomes a controller: it deals the collected items out to N worker
+pytest processes and replays the reports they stream back through its own
+hooks. The terminal summary, the exit status and the pytest-html report
+(``--html``) therefore cover the whole run exactly as a sequential run would.
+
+Workers are ordinary pytest sessions restricted to their share of node ids,
+so each one owns its session-scoped browser pool. Tests that share a
+module-, package- or class-scoped fixture go to the same worker, so such a
+fixture (a measurement, a baseline written at teardown) is built once per
+run rather than once per worker.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from _pytest.reports import TestReport
+
+from common import settings
+
+
+WORKER_NODES_ENV = "SELENIUM_WORKER_NODES"
+WORKER_REPORTS_ENV = "SELENIUM_WORKER_REPORTS"
+WORKER_ID_ENV = "SELENIUM_WORKER_ID"
+
+# Options that must not reach the workers: the controller owns the reports
+CONTROLLER_ONLY_OPTIONS = ("--html", "--junitxml", "--junit-xml")
+
+POLL_INTERVAL = 0.1
+
+# Fixture scopes shared by several tests, widest first; session fixtures are
+# per worker anyway
+SHARED_SCOPES = ("package", "module", "class")
+
+
+def is_worker():
+    """True inside a worker process started by the controller"""
+    return bool(os.environ.get(WORKER_REPORTS_ENV))
+
+
+def worker_args(args):
+    """Drops controller-only options from the original command line"""
+    result = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg in CONTROLLER_ONLY_OPTIONS:
+            skip_next = True
+            continue
+        if arg.startswith(tuple(option + "=" for option in CONTROLLER_ONLY_OPTIONS)):
+            continue
+        result.append(arg)
+    return result
+
+
+def fixture_group(item):
+    """
+    Key of the tests that must run in the same worker: the package, module or
+    class of the widest shared fixture scope item uses, else the item itself
+    """
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    if fixtureinfo is None:
+        return item
+    scopes = {
+        str(getattr(fixturedef, "scope", "function"))
+        for fixturedefs in fixtureinfo.name2fixturedefs.values()
+        for fixturedef in fixturedefs
+    }
+    path = item.nodeid.split("::")
+    for scope in SHARED_SCOPES:
+        if scope not in scopes:
+            continue
+        if scope == "package":
+            return os.path.dirname(path[0])
+        if scope == "module" or getattr(item, "cls", None) is None:
+            return path[0]
+        return "::".join(path[:2])
+    return item
+
+
+def split_items(items, workers, key=fixture_group):
+    """
+    Deals the groups of items (key) out, largest first to the worker with the
+    fewest items; each worker keeps the collection order
+    """
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append(index)
+    count = max(1, min(workers, len(groups)))
+    shares = [[] for _ in range(count)]
+    for indexes in sorted(groups.values(), key=len, reverse=True):
+        min(shares, key=len).extend(indexes)
+    return [[items[index] for index in sorted(share)] for share in shares]
+
+
+class _Worker:
+    """One worker process and the report stream it writes"""
+
+    def __init__(self, index, items, workdir, config):
+        self.index = index
+        self.items = {item.nodeid: item for item in items}
+        self.finished = set()
+        self.nodes_path = os.path.join(workdir, f"worker-{index}.nodes")
+        self.reports_path = os.path.join(workdir, f"worker-{index}.jsonl")
+        self.log_path = os.path.join(workdir, f"worker-{index}.log")
+
+        with open(self.nodes_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.items))
+        open(self.reports_path, "w").close()
+
+        env = dict(os.environ)
+        env.update({
+            "SELENIUM_WORKERS": "0",
+            WORKER_ID_ENV: str(index),
+            WORKER_NODES_ENV: self.nodes_path,
+            WORKER_REPORTS_ENV: self.reports_path,
+        })
+        command = [
+            sys.executable, "-m", "pytest",
+            *worker_args(config.invocation_params.args),
+            "--rootdir", str(config.rootpath),
+        ]
+        self._log = open(self.log_path, "wb")
+        self.process = subprocess.Popen(
+            command,
+            cwd=str(config.invocation_params.dir),
+            env=env,
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+        )
+        self._stream = open(self.reports_path, encoding="utf-8")
+
+    def read_events(self):
+        """Returns the complete event lines written since the last call"""
+        events = []
+        while True:
+            position = self._stream.tell()
+            line = self._stream.readline()
+            if not line.endswith("\n"):
+                self._stream.seek(position)
+                return events
+            events.append(json.loads(line))
+
+    def log_tail(self, lines=30):
+        with open(self.log_path, encoding="utf-8", errors="replace") as f:
+            return "".join(f.readlines()[-lines:])
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+        self._stream.close()
+        self._log.close()
+
+
+class ParallelPlugin:
+    """Controller side in the main process, report streaming in workers"""
+
+    def __init__(self, config):
+        self.config = config
+        self.workers = settings.WORKERS
+        self._reports = None
+        if is_worker():
+            self._reports = open(os.environ[WORKER_REPORTS_ENV], "a", encoding="utf-8")
+
+    # ----- worker side ---------------------------------------------------
+
+    def pytest_collection_modifyitems(self, config, items):
+        if not is_worker():
+            return
+        with open(os.environ[WORKER_NODES_ENV], encoding="utf-8") as f:
+            wanted = [line for line in f.read().splitlines() if line]
+        by_id = {item.nodeid: item for item in items}
+        selected = [by_id[nodeid] for nodeid in wanted if nodeid in by_id]
+        keep = set(wanted)
+        deselected = [item for item in items if item.nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._emit({"event": "logstart", "nodeid": nodeid, "location": location})
+
+    def pytest_runtest_logreport(self, report):
+        if self._reports is None:
+            return
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        self._emit({"event": "report", "data": data})
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self._emit({"event": "logfinish", "nodeid": nodeid, "location": location})
+
+    def pytest_sessionfinish(self):
+        if self._reports is not None:
+            self._reports.close()
+            self._reports = None
+
+    def _emit(self, event):
+        if self._reports is None:
+            return
+        self._reports.write(json.dumps(event) + "\n")
+        self._reports.flush()
+
+    # ----- controller side -----------------------------------------------
+
+    def pytest_runtestloop(self, session):
+        if is_worker() or self.workers < 2 or len(session.items) < 2:
+            return None
+        if session.config.option.collectonly:
+            return True
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            raise session.Interrupted(
+                f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''} during collection"
+            )
+
+        workdir = tempfile.mkdtemp(prefix="selenium-workers-")
+        workers = [
+            _Worker(index, items, workdir, session.config)
+            for index, items in enumerate(split_items(session.items, self.workers))
+        ]
+        try:
+            self._drive(session, workers)
+        finally:
+            for worker in workers:
+                worker.close()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+        return True
+
+    def _drive(self, session, workers):
+        hook = session.config.hook
+        running = list(workers)
+        while running:
+            for worker in list(running):
+                exited = worker.process.poll() is not None
+                for event in worker.read_events():
+                    self._replay(hook, worker, event)
+                if exited:
+                    running.remove(worker)
+                    self._report_lost_items(hook, worker)
+            if session.shouldfail or session.shouldstop:
+                for worker in running:
+                    worker.close()
+                return
+            if running:
+                time.sleep(POLL_INTERVAL)
+
+    def _replay(self, hook, worker, event):
+        kind = event["event"]
+        if kind == "logstart":
+            hook.pytest_runtest_logstart(nodeid=event["nodeid"], location=tuple(event["location"]))
+        elif kind == "report":
+            report = hook.pytest_report_from_serializable(config=self.config, data=event["data"])
+            hook.pytest_runtest_logreport(report=report)
+        elif kind == "logfinish":
+            worker.finished.add(event["nodeid"])
+            hook.pytest_runtest_logfinish(nodeid=event["nodeid"], location=tuple(event["location"]))
+
+    def _report_lost_items(self, hook, worker):
+        """Turns the items a crashed worker never ran into failures"""
+        lost = [item for nodeid, item in worker.items.items() if nodeid not in worker.finished]
+        if not lost:
+            return
+        reason = (
+            f"worker {worker.index} exited with code {worker.process.returncode} "
+            f"before running this test\n{worker.log_tail()}"
+        )
+        for item in lost:
+            hook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+            report = TestReport(item.nodeid, item.location, {}, "failed", reason, "call")
+            hook.pytest_runtest_logreport(report=report)
+            hook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
@@ -0,0 +1,49 @@
+"""
+Pytest plugins shared by every suite.
+
+Each suite's conftest calls ``register(config)`` from ``pytest_configure``;
+registration is idempotent so running several suites in one session only
+installs the plugins once.
+"""
+from common.images import ImageCheckPlugin
+from common.metrics import NavigationMetricsPlugin
+from common.network import NetworkStatsPlugin
+from common.pagelog import PageLogPlugin
+from common.parallel import ParallelPlugin
+from common.results import ResultsPlugin
+from common.screencast import ScreencastPlugin
+from common.screenshots import FailureCapturePlugin
+from common.standin import StandInPlugin
+from common.timeouts import AdaptiveTimeoutsPlugin
+from common.waits import WaitStatsPlugin
+
+
+PLUGINS = [
+    ("selenium-parallel", ParallelPlugin),
+    ("selenium-wait-stats", WaitStatsPlugin),
+    ("selenium-adaptive-timeouts", AdaptiveTimeoutsPlugin),
+    ("selenium-standin", StandInPlugin),
+    ("selenium-network-stats", NetworkStatsPlugin),
+    ("selenium-image-check", ImageCheckPlugin),
+    ("selenium-navigation-metrics", NavigationMetricsPlugin),
+    ("selenium-failure-capture", FailureCapturePlugin),
+    ("selenium-screencast", ScreencastPlugin),
+    ("selenium-page-log", PageLogPlugin),
+    ("selenium-results", ResultsPlugin),
+]
+
+MARKERS = [
+    "ui_login: log in through the login form instead of the session cookie",
+    "standin_profile(name): latency/fault profile of the offline stand-in for this test",
+    "performance: latency budget suite, only run with SELENIUM_PERFORMANCE=1",
+]
+
+
+def register(config):
+    """Registers the shared markers and plugins once per pytest process"""
+    if not config.pluginmanager.has_plugin(PLUGINS[0][0]):
+        for marker in MARKERS:
+            config.addinivalue_line("markers", marker)
+    for name, plugin_class in PLUGINS:
+        if not config.pluginmanager.has_plugin(name):
+            config.pluginmanager.register(plugin_class(config), name)
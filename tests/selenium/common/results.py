@@ -0,0 +1,256 @@
+"""
+Streaming test results and HTML report.
+
+pytest-html keeps every report in memory and renders the whole page at the
+end of the session. ``ResultsPlugin`` instead writes each test as it
+finishes:
+
+* one JSON line in ``results.jsonl`` under ``settings.RESULTS_DIR``: node
+  id, outcome, duration, phase outcomes, user properties (navigation
+  metrics, asset cache, waits, page log, ...), artifact paths (failure
+  screenshots, DOM, screencast) and, for failures, the error text and
+  captured sections;
+* with ``settings.RESULTS_HTML``, one table row appended to that HTML file,
+  the totals being written when the session ends. A browser shows the
+  partial file while the run is going.
+
+Only the process that reports the run writes: with ``SELENIUM_WORKERS`` the
+controller replays every worker's reports through its own hooks, so the file
+holds the merged run and workers write nothing.
+
+The HTML report can also be built on demand from a results file, streaming
+it line by line::
+
+    PYTHONPATH=tests/selenium python -m common.results results/results.jsonl report.html
+"""
+import html
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from common import settings
+from common.parallel import is_worker
+
+
+RESULTS_FILE = "results.jsonl"
+
+# User properties that hold artifact paths, and the keys of those paths
+ARTIFACT_PROPERTIES = {
+    "failure_artifacts": ("screenshot", "dom"),
+    "screencast": ("player",),
+}
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+body { font: 13px sans-serif; margin: 16px; }
+table { border-collapse: collapse; width: 100%%; }
+th, td { border-bottom: 1px solid #ddd; padding: 3px 6px; text-align: left; vertical-align: top; }
+pre { white-space: pre-wrap; margin: 4px 0; }
+.passed { color: #2a7d2a; } .failed, .error { color: #c0392b; }
+.skipped, .xfailed { color: #888; } .xpassed { color: #d68910; }
+</style>
+</head>
+<body>
+<h1>%(title)s</h1>
+<p>Started %(started)s</p>
+<table>
+<thead><tr><th>Result</th><th>Test</th><th>Duration</th><th>Details</th></tr></thead>
+<tbody>
+"""
+
+HTML_FOOT = """</tbody>
+</table>
+<p id="summary">%(summary)s</p>
+</body>
+</html>
+"""
+
+
+def new_result(nodeid):
+    return {
+        "nodeid": nodeid,
+        "outcome": "passed",
+        "duration": 0.0,
+        "phases": {},
+        "properties": {},
+        "artifacts": [],
+        "longrepr": None,
+        "sections": [],
+        "finished": None,
+    }
+
+
+def add_report(result, report):
+    """Folds the report of one phase (setup, call, teardown) into result"""
+    result["duration"] = round(result["duration"] + report.duration, 4)
+    result["phases"][report.when] = report.outcome
+    result["properties"].update(report.user_properties)
+
+    outcome = None
+    if hasattr(report, "wasxfail"):
+        outcome = "xpassed" if report.passed else "xfailed"
+    elif report.failed:
+        outcome = "failed" if report.when == "call" else "error"
+    elif report.skipped:
+        outcome = "skipped"
+    if outcome and result["outcome"] not in ("failed", "error"):
+        result["outcome"] = outcome
+
+    if report.failed:
+        text = f"[{report.when}] {report.longrepr}"
+        result["longrepr"] = f"{result['longrepr']}\n\n{text}" if result["longrepr"] else text
+        result["sections"] = [list(section) for section in report.sections]
+    elif report.skipped and isinstance(report.longrepr, tuple):
+        result["longrepr"] = report.longrepr[2]
+
+
+def finish(result):
+    result["finished"] = round(time.time(), 3)
+    for name, keys in ARTIFACT_PROPERTIES.items():
+        for entry in result["properties"].get(name, []):
+            result["artifacts"].extend(entry[key] for key in keys if entry.get(key))
+    return result
+
+
+class ResultSink:
+    """Appends one JSON line per test, each in a single write()"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(settings.RESULTS_DIR, RESULTS_FILE)
+        self._fd = None
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_TRUNC, 0o644)
+        return self
+
+    def write(self, result):
+        line = json.dumps(result, separators=(",", ":"), default=str) + "\n"
+        os.write(self._fd, line.encode("utf-8"))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class HtmlReport:
+    """HTML report written row by row; totals are added by close()"""
+
+    def __init__(self, path, title="Selenium results"):
+        self.path = path
+        self.title = title
+        self.counts = Counter()
+        self._file = None
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(HTML_HEAD % {
+            "title": html.escape(self.title),
+            "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        self._file.flush()
+        return self
+
+    def add(self, result):
+        self.counts[result["outcome"]] += 1
+        outcome = result["outcome"]
+        self._file.write(
+            f'<tr><td class="{outcome}">{outcome}</td><td>{html.escape(result["nodeid"])}</td>'
+            f'<td>{result["duration"]:.2f}s</td><td>{self._details(result)}</td></tr>\n'
+        )
+        self._file.flush()
+
+    def _details(self, result):
+        parts = []
+        base = os.path.dirname(os.path.abspath(self.path))
+        for path in result["artifacts"]:
+            href = os.path.relpath(os.path.abspath(path), base).replace(os.sep, "/")
+            parts.append(f'<a href="{html.escape(href)}">{html.escape(os.path.basename(path))}</a>')
+        if result["longrepr"] and result["outcome"] in ("failed", "error"):
+            text = result["longrepr"] + "".join(
+                f"\n\n----- {name} -----\n{content}" for name, content in result["sections"]
+            )
+            parts.append(f"<details><summary>log</summary><pre>{html.escape(text)}</pre></details>")
+        elif result["longrepr"]:
+            parts.append(html.escape(str(result["longrepr"])))
+        return " ".join(parts)
+
+    def close(self):
+        if self._file is None:
+            return
+        total = sum(self.counts.values())
+        summary = f"{total} tests: " + ", ".join(
+            f"{count} {outcome}" for outcome, count in sorted(self.counts.items())
+        )
+        self._file.write(HTML_FOOT % {"summary": html.escape(summary)})
+        self._file.close()
+        self._file = None
+
+
+def build_html(results_path, html_path):
+    """Builds the HTML report from a results file, one line at a time"""
+    report = HtmlReport(html_path).open()
+    try:
+        with open(results_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    report.add(json.loads(line))
+    finally:
+        report.close()
+    return report.counts
+
+
+class ResultsPlugin:
+    """Streams each finished test to the results file and the HTML report"""
+
+    def __init__(self, config):
+        self.enabled = settings.RESULTS and not is_worker()
+        self.sink = None
+        self.html = None
+        self._pending = {}
+
+    def pytest_collection_finish(self, session):
+        # Not pytest_sessionstart: a suite conftest found during collection
+        # registers this plugin after the session has started
+        if not self.enabled or self.sink is not None or session.config.option.collectonly:
+            return
+        self.sink = ResultSink().open()
+        if settings.RESULTS_HTML:
+            self.html = HtmlReport(settings.RESULTS_HTML).open()
+
+    def pytest_runtest_logreport(self, report):
+        if self.sink is None:
+            return
+        add_report(self._pending.setdefault(report.nodeid, new_result(report.nodeid)), report)
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        result = self._pending.pop(nodeid, None)
+        if self.sink is None or result is None:
+            return
+        finish(result)
+        self.sink.write(result)
+        if self.html is not None:
+            self.html.add(result)
+
+    def pytest_sessionfinish(self, session):
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+        if self.html is not None:
+            self.html.close()
+            self.html = None
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(settings.RESULTS_DIR, RESULTS_FILE)
+    target = sys.argv[2] if len(sys.argv) > 2 else "selenium_report.html"
+    counts = build_html(source, target)
+    print(f"{target}: {sum(counts.values())} tests")
@@ -0,0 +1,241 @@
+"""
+Rolling screencast of the test browsers, kept only for failed tests.
+
+With ``settings.SCREENCAST`` every browser started by the pool (``attach``)
+streams low-resolution CDP ``Page.startScreencast`` frames over its own CDP
+channel. Frames stay base64 strings in a ring buffer per browser: the last
+``settings.SCREENCAST_FRAMES`` frames, within a byte budget shared by every
+browser of the process (``settings.SCREENCAST_MEMORY_MB``); the oldest
+frames go first.
+
+Buffers are cleared when a test starts and when it ends, so a passing test
+costs nothing beyond the streaming. When a test fails, the frames of its
+browsers are written through the failure artifact store
+(``common.screenshots``): one content-addressed JPEG per frame and a small
+HTML player that replays them with their original timing, linked from the
+report.
+"""
+import base64
+import json
+import os
+import threading
+import time
+import warnings
+import weakref
+from collections import deque
+
+import pytest
+
+from common import settings
+from common.cdp import CdpChannel
+from common.screenshots import ARTIFACTS, captured, drivers_of, html_report_link
+
+try:
+    from pytest_html import extras
+except ImportError:
+    extras = None
+
+
+PLAYER_EXTENSION = "screencast.html"
+
+PLAYER_HTML = """<!DOCTYPE html>
+<meta charset="utf-8">
+<title>Screencast</title>
+<body style="margin:0;background:#222;color:#ddd;font:13px sans-serif">
+<img id="frame" style="display:block;max-width:100%%">
+<div id="info" style="padding:4px"></div>
+<script>
+var frames = %s;
+var index = 0, img = document.getElementById('frame'), info = document.getElementById('info');
+function show() {
+    var frame = frames[index];
+    img.src = frame[1];
+    info.textContent = (index + 1) + '/' + frames.length + '  t=' + frame[0].toFixed(2) + 's';
+    index = (index + 1) %% frames.length;
+    var delay = index ? (frames[index][0] - frame[0]) * 1000 : 1500;
+    setTimeout(show, Math.max(delay, 16));
+}
+show();
+</script>
+"""
+
+
+def _utf8(text):
+    return text.encode("utf-8")
+
+
+class MemoryBudget:
+    """Bytes of frames held by all the recorders of the process"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self, size):
+        with self._lock:
+            if self.used + size > self.limit:
+                return False
+            self.used += size
+            return True
+
+    def give(self, size):
+        with self._lock:
+            self.used -= size
+
+
+BUDGET = MemoryBudget(settings.SCREENCAST_MEMORY_MB * 1024 * 1024)
+
+
+class Recorder:
+    """Screencast of one browser into a bounded ring buffer"""
+
+    def __init__(self, driver, budget=BUDGET, max_frames=None):
+        self.driver = driver
+        self.budget = budget
+        self.max_frames = max_frames or settings.SCREENCAST_FRAMES
+        self.frames = deque()
+        self.channel = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.channel = CdpChannel(self.driver).start()
+        page = self.channel.devtools.page
+        self.channel.listen(page.ScreencastFrame, self._frame)
+        self.channel.execute(page.start_screencast(
+            format_="jpeg",
+            quality=settings.SCREENCAST_QUALITY,
+            max_width=settings.SCREENCAST_MAX_WIDTH,
+            max_height=settings.SCREENCAST_MAX_HEIGHT,
+        ))
+        return self
+
+    def stop(self):
+        if self.channel is not None:
+            self.channel.close()
+            self.channel = None
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            while self.frames:
+                self._drop_oldest()
+
+    def snapshot(self):
+        """(timestamp, base64 JPEG) frames currently held, oldest first"""
+        with self._lock:
+            return list(self.frames)
+
+    def keep(self, timestamp, data):
+        size = len(data)
+        with self._lock:
+            if len(self.frames) >= self.max_frames:
+                self._drop_oldest()
+            while not self.budget.take(size):
+                if not self.frames:
+                    # Other browsers hold the whole budget: skip this frame
+                    return
+                self._drop_oldest()
+            self.frames.append((timestamp, data))
+
+    def _drop_oldest(self):
+        _, data = self.frames.popleft()
+        self.budget.give(len(data))
+
+    async def _frame(self, event):
+        try:
+            self.keep(event.metadata.timestamp or time.time(), event.data)
+            # Chrome sends the next frame only once this one is acknowledged
+            await self.channel.send(self.channel.devtools.page.screencast_frame_ack(event.session_id))
+        except Exception:
+            # The browser closed mid-frame
+            pass
+
+
+_recorders = weakref.WeakKeyDictionary()
+
+
+def attach(driver):
+    """Starts recording a new browser; returns the driver"""
+    if not settings.SCREENCAST:
+        return driver
+    recorder = Recorder(driver)
+    try:
+        _recorders[driver] = recorder.start()
+    except Exception as e:
+        recorder.stop()
+        warnings.warn(f"screencast disabled for this browser: {e}")
+    return driver
+
+
+def detach(driver):
+    """Stops the recording of a browser that is about to quit"""
+    recorder = _recorders.pop(driver, None)
+    if recorder is not None:
+        recorder.stop()
+
+
+def save(frames, store=ARTIFACTS):
+    """Schedules the frames and their player; returns the player's path"""
+    start = frames[0][0]
+    timeline = [
+        [round(timestamp - start, 3), os.path.basename(store.put(data, "jpeg", base64.b64decode))]
+        for timestamp, data in frames
+    ]
+    return store.put(PLAYER_HTML % json.dumps(timeline), PLAYER_EXTENSION, _utf8)
+
+
+def store_recording(driver, store=ARTIFACTS):
+    """Saves the frames held for a browser; returns {player, frames}, or None"""
+    recorder = _recorders.get(driver)
+    frames = recorder.snapshot() if recorder is not None else []
+    if not frames:
+        return None
+    return {"player": save(frames, store), "frames": len(frames)}
+
+
+class ScreencastPlugin:
+    """Drops the frames of passing tests and saves those of failed ones"""
+
+    def __init__(self, config):
+        self.config = config
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self._clear()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.failed and report.when in ("setup", "call"):
+            self._save(item, report)
+        elif report.when == "teardown":
+            self._clear()
+
+    def _clear(self):
+        for recorder in list(_recorders.values()):
+            recorder.clear()
+
+    def _save(self, item, report):
+        players = captured(item, "screencast")
+        for driver in drivers_of(item):
+            player = store_recording(driver)
+            if player is not None:
+                players.append(player)
+        if not players:
+            return
+        report.user_properties.append(("screencast", players))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        # Before pytest-html keeps the report; worker reports arrive here too
+        for name, players in report.user_properties:
+            if name != "screencast":
+                continue
+            for player in players:
+                link = html_report_link(self.config, player["player"])
+                if link is None:
+                    return
+                report.extra = getattr(report, "extra", [])
+                report.extra.append(extras.url(link, "Screencast"))
@@ -0,0 +1,211 @@
+"""
+Failure screenshots and DOM snapshots.
+
+When a test fails in setup or call, ``FailureCapturePlugin`` captures every
+browser the test used, on the test thread and while the page still shows the
+failure:
+
+* a screenshot through CDP ``Page.captureScreenshot`` in
+  ``settings.SCREENSHOT_FORMAT`` (jpeg/webp at ``settings.SCREENSHOT_QUALITY``),
+  or WebDriver's PNG screenshot when the driver has no CDP,
+* the DOM HTML of the page.
+
+Both come back as strings. Only the SHA-256 of each string is computed on the
+test thread; decoding, gzip and the writes run on a thread pool so teardown
+does not wait for the disk. Files are named by that hash under
+``settings.SCREENSHOTS_DIR``, so the same frame from repeated failures is
+stored once. The paths are attached to the report as the
+``failure_artifacts`` user property; the pool is drained before the reports
+are written at the end of the session. With ``--html``, the process that
+writes the pytest-html report (the controller of a parallel run) adds the
+screenshot and a DOM link to it, with paths relative to the report so they
+resolve from any working directory and when both are archived together.
+
+Code that drives a browser outside the test's fixtures (the login batch runs
+every case in one module-scoped browser) captures it with ``store_capture``
+while the page still shows the problem and hands the paths to the test with
+``add_captured``; they are reported the same way if the test fails.
+"""
+import base64
+import gzip
+import hashlib
+import html
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from common import settings
+
+try:
+    from pytest_html import extras
+except ImportError:
+    extras = None
+
+
+DOM_EXTENSION = "html.gz"
+
+
+def _gzip(html):
+    return gzip.compress(html.encode("utf-8"), mtime=0)
+
+
+class ArtifactStore:
+    """Content-addressed files written by a background thread pool"""
+
+    def __init__(self, path=None, workers=None):
+        self.path = path or settings.SCREENSHOTS_DIR
+        self.workers = workers or settings.SCREENSHOT_WORKERS
+        self._executor = None
+        self._scheduled = {}
+        self._lock = threading.Lock()
+
+    def put(self, data, extension, encode):
+        """
+        Schedules encode(data) to be written as <sha256 of data>.<extension>;
+        returns the path right away
+        """
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        path = os.path.join(self.path, f"{digest}.{extension}")
+        with self._lock:
+            if path not in self._scheduled:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="artifacts")
+                self._scheduled[path] = self._executor.submit(self._write, path, data, encode)
+        return path
+
+    def _write(self, path, data, encode):
+        if os.path.exists(path):
+            return
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encode(data))
+        os.replace(tmp_path, path)
+
+    def flush(self):
+        """Waits for the pending writes; a failed write is reported as a warning"""
+        with self._lock:
+            futures = list(self._scheduled.items())
+        wait([future for _, future in futures])
+        for path, future in futures:
+            if future.exception() is not None:
+                warnings.warn(f"failure artifact {path} not written: {future.exception()}")
+
+
+ARTIFACTS = ArtifactStore()
+
+# Artifacts captured for a test before it failed: {user property: [entries]}
+CAPTURED = pytest.StashKey()
+
+
+def capture(driver):
+    """(format, base64 image, DOM HTML) of the current page"""
+    image_format = settings.SCREENSHOT_FORMAT
+    if hasattr(driver, "execute_cdp_cmd"):
+        params = {"format": image_format}
+        if image_format != "png":
+            params["quality"] = settings.SCREENSHOT_QUALITY
+        image = driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+    else:
+        image, image_format = driver.get_screenshot_as_base64(), "png"
+    return image_format, image, driver.page_source
+
+
+def store_capture(driver, store=ARTIFACTS):
+    """Captures the page; returns its {screenshot, dom} paths, written in the background"""
+    image_format, image, html = capture(driver)
+    return {
+        "screenshot": store.put(image, image_format, base64.b64decode),
+        "dom": store.put(html, DOM_EXTENSION, _gzip),
+    }
+
+
+def add_captured(item, name, entries):
+    """Attaches entries of user property name (failure_artifacts, screencast) to a test"""
+    item.stash.setdefault(CAPTURED, {}).setdefault(name, []).extend(entries)
+
+
+def captured(item, name):
+    return list(item.stash.get(CAPTURED, {}).get(name, []))
+
+
+def html_report_link(config, path):
+    """
+    Link to path from the pytest-html report (--html), or None without that
+    report. Relative to the report's folder; a file URI when there is no
+    relative path (another drive)
+    """
+    htmlpath = config.getoption("htmlpath", None)
+    if extras is None or not htmlpath:
+        return None
+    path = os.path.abspath(path)
+    try:
+        return os.path.relpath(path, os.path.dirname(os.path.abspath(htmlpath))).replace(os.sep, "/")
+    except ValueError:
+        return Path(path).as_uri()
+
+
+def html_image(src):
+    """pytest-html image extra for a linked file (its image extra needs a path relative to the CWD)"""
+    src = html.escape(src, quote=True)
+    return extras.html(f'<div class="image"><a href="{src}" target="_blank"><img src="{src}"/></a></div>')
+
+
+def drivers_of(item):
+    """Browsers among the fixtures of a test"""
+    drivers = {}
+    for value in getattr(item, "funcargs", {}).values():
+        if isinstance(value, WebDriver):
+            drivers[id(value)] = value
+    return list(drivers.values())
+
+
+class FailureCapturePlugin:
+    """Attaches a screenshot and the DOM of each browser to failed tests"""
+
+    def __init__(self, config):
+        self.config = config
+        self.store = ARTIFACTS
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if settings.SCREENSHOTS and report.failed and report.when in ("setup", "call"):
+            self._capture(item, report)
+
+    def _capture(self, item, report):
+        artifacts = captured(item, "failure_artifacts")
+        for driver in drivers_of(item):
+            try:
+                artifacts.append(store_capture(driver, self.store))
+            except WebDriverException:
+                # The browser is gone (crash, closed window): nothing to show
+                continue
+        if not artifacts:
+            return
+        report.user_properties.append(("failure_artifacts", artifacts))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        # Before pytest-html keeps the report; worker reports arrive here too
+        for name, artifacts in report.user_properties:
+            if name != "failure_artifacts":
+                continue
+            for artifact in artifacts:
+                screenshot = html_report_link(self.config, artifact["screenshot"])
+                if screenshot is None:
+                    return
+                report.extra = getattr(report, "extra", [])
+                report.extra.append(html_image(screenshot))
+                report.extra.append(extras.url(html_report_link(self.config, artifact["dom"]), "DOM"))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session):
+        self.store.flush()
@@ -0,0 +1,172 @@
+"""
+Runtime settings shared by all the Selenium suites.
+
+Everything is read from environment variables, like ``CHROME_BINARY``, so a
+CI job can tune a run without editing the suites.
+"""
+import os
+from urllib.parse import urlsplit
+
+
+def env_bool(name, default):
+    """Read a boolean flag (1/0, true/false, yes/no, on/off)"""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name, default):
+    """Read an integer, falling back to the default when unset"""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def env_float(name, default):
+    """Read a float, falling back to the default when unset"""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def env_list(name, default):
+    """Read a comma-separated list; an empty value gives an empty list"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def env_shard(name):
+    """Read an "index/count" shard such as 0/4, None when unset"""
+    value = os.environ.get(name)
+    if not value:
+        return None
+    index, count = (int(part) for part in value.split("/"))
+    return index, count
+
+
+# Application under test: the public site, any other URL, or "local" for the
+# offline stand-in (common/standin) on SAUCEDEMO_STANDIN_PORT. With port 0 the
+# server binds a free port when it starts (one per process, so parallel workers
+# each get their own server) and sets STANDIN_PORT and BASE_URL then; until
+# that session fixture has run, BASE_URL is None
+SAUCEDEMO_URL = "https://www.saucedemo.com/"
+STANDIN_HOST = "127.0.0.1"
+STANDIN = os.environ.get("SAUCEDEMO_BASE_URL") == "local"
+if STANDIN:
+    STANDIN_PORT = env_int("SAUCEDEMO_STANDIN_PORT", 0)
+    BASE_URL = f"http://{STANDIN_HOST}:{STANDIN_PORT}/" if STANDIN_PORT else None
+else:
+    STANDIN_PORT = None
+    BASE_URL = os.environ.get("SAUCEDEMO_BASE_URL") or SAUCEDEMO_URL
+    if not BASE_URL.endswith("/"):
+        BASE_URL += "/"
+# Latency and fault profile of the stand-in when a test does not pick one
+STANDIN_PROFILE = os.environ.get("SAUCEDEMO_STANDIN_PROFILE", "saucedemo")
+# Host of the target, used to keep per-target caches apart (latencies, images)
+TARGET = STANDIN_HOST if STANDIN else urlsplit(BASE_URL).hostname
+
+# Browser pool: keep sessions alive between tests instead of quitting them
+REUSE_BROWSER = env_bool("SELENIUM_REUSE_BROWSER", True)
+POOL_MAX_IDLE = env_int("SELENIUM_POOL_MAX_IDLE", 1)
+
+# Parallel mode: number of worker processes (0 or 1 runs sequentially)
+WORKERS = env_int("SELENIUM_WORKERS", 0)
+
+# Persistent cache shared by every process and run (resolved drivers, ...)
+CACHE_DIR = os.environ.get(
+    "SELENIUM_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "utopia-selenium"),
+)
+
+# Network layer (CDP): URL patterns blocked in every browser, and the on-disk
+# cache of static assets shared by browsers and workers (lifetime cap, seconds)
+BLOCKED_URLS = env_list("SELENIUM_BLOCKED_URLS", [
+    "*.backtrace.io/*",
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+])
+ASSET_CACHE = env_bool("SELENIUM_ASSET_CACHE", True)
+ASSET_CACHE_MAX_AGE = env_int("SELENIUM_ASSET_CACHE_MAX_AGE", 86400)
+
+# Reference image hashes (common/images.py) are recorded again once older
+# than this many seconds, so a redeployed site gets a fresh reference
+IMAGE_MANIFEST_MAX_AGE = env_int("SELENIUM_IMAGE_MANIFEST_MAX_AGE", 86400)
+
+# Run outputs (navigation metrics, ...), relative to the working directory
+RESULTS_DIR = os.environ.get("SELENIUM_RESULTS_DIR", "results")
+
+# Test results streamed to RESULTS_DIR/results.jsonl as tests finish, and
+# appended as rows to an HTML report when RESULTS_HTML names one
+RESULTS = env_bool("SELENIUM_RESULTS", True)
+RESULTS_HTML = os.environ.get("SELENIUM_RESULTS_HTML") or None
+
+# Navigation metrics: timing entries read after each navigation, plus the
+# CDP Performance.getMetrics counters (one more command per navigation)
+NAVIGATION_METRICS = env_bool("SELENIUM_NAVIGATION_METRICS", True)
+CDP_METRICS = env_bool("SELENIUM_CDP_METRICS", False)
+
+# Performance budget suite (opt-in): repetitions per user; a regression is a
+# one-sided Mann-Whitney U test below PERF_ALPHA with a median slowdown above
+# PERF_TOLERANCE; baseline file (default: in the cache dir), rewritten on request
+PERFORMANCE = env_bool("SELENIUM_PERFORMANCE", False)
+PERF_REPEAT = env_int("SELENIUM_PERF_REPEAT", 20)
+PERF_ALPHA = env_float("SELENIUM_PERF_ALPHA", 0.01)
+PERF_TOLERANCE = env_float("SELENIUM_PERF_TOLERANCE", 0.10)
+PERF_BASELINE = os.environ.get("SELENIUM_PERF_BASELINE") or None
+PERF_UPDATE_BASELINE = env_bool("SELENIUM_PERF_UPDATE_BASELINE", False)
+
+# Data-driven cases read from .jsonl datasets: at most DATA_LIMIT of them,
+# and with SELENIUM_DATA_SHARD=i/n only every n-th case starting at i
+DATA_LIMIT = env_int("SELENIUM_DATA_LIMIT", None)
+DATA_SHARD = env_shard("SELENIUM_DATA_SHARD")
+
+# Failure artifacts: screenshot (CDP Page.captureScreenshot) and DOM of each
+# browser of a failed test, named by content hash and written in the background
+SCREENSHOTS = env_bool("SELENIUM_SCREENSHOTS", True)
+SCREENSHOTS_DIR = os.environ.get("SELENIUM_SCREENSHOTS_DIR", "screenshots")
+SCREENSHOT_FORMAT = os.environ.get("SELENIUM_SCREENSHOT_FORMAT", "jpeg")
+SCREENSHOT_QUALITY = env_int("SELENIUM_SCREENSHOT_QUALITY", 80)
+SCREENSHOT_WORKERS = env_int("SELENIUM_SCREENSHOT_WORKERS", 2)
+
+# Screencast (opt-in): low-resolution CDP frames kept in a ring buffer per
+# browser, capped per process, saved only for failed tests
+SCREENCAST = env_bool("SELENIUM_SCREENCAST", False)
+SCREENCAST_FRAMES = env_int("SELENIUM_SCREENCAST_FRAMES", 300)
+SCREENCAST_MEMORY_MB = env_int("SELENIUM_SCREENCAST_MEMORY_MB", 64)
+SCREENCAST_QUALITY = env_int("SELENIUM_SCREENCAST_QUALITY", 40)
+SCREENCAST_MAX_WIDTH = env_int("SELENIUM_SCREENCAST_MAX_WIDTH", 800)
+SCREENCAST_MAX_HEIGHT = env_int("SELENIUM_SCREENCAST_MAX_HEIGHT", 600)
+
+# Page log: records at LOG_LEVEL or above kept in a ring buffer of LOG_BUFFER
+# records per test, dumped into the report of failed tests (every test with LOG_ALL)
+LOG_LEVEL = os.environ.get("SELENIUM_LOG_LEVEL", "INFO")
+LOG_BUFFER = env_int("SELENIUM_LOG_BUFFER", 500)
+LOG_ALL = env_bool("SELENIUM_LOG_ALL", False)
+
+# Form filling: "script" (values set in one script call), "cdp" (CDP
+# Input.insertText) or "keys" (WebDriver send_keys, one key event per character)
+INPUT_MODE = os.environ.get("SELENIUM_INPUT_MODE", "script")
+
+# Negative login cases run in one page load by an in-page script; 0 goes
+# back to one page load and typed input per case
+LOGIN_BATCH = env_bool("SELENIUM_LOGIN_BATCH", True)
+
+# Browser-state checkpoints kept per process (count, maximum age in seconds)
+CHECKPOINT_MAX_ENTRIES = env_int("SELENIUM_CHECKPOINT_MAX_ENTRIES", 32)
+CHECKPOINT_MAX_AGE = env_int("SELENIUM_CHECKPOINT_MAX_AGE", 300)
+
+# Adaptive timeouts: deadline = percentile of the recorded latencies + margin,
+# once a (user, transition) pair has enough samples
+ADAPTIVE_TIMEOUTS = env_bool("SELENIUM_ADAPTIVE_TIMEOUTS", True)
+TIMEOUT_PERCENTILE = env_float("SELENIUM_TIMEOUT_PERCENTILE", 99)
+TIMEOUT_MARGIN = env_float("SELENIUM_TIMEOUT_MARGIN", 2.0)
+TIMEOUT_MIN_SAMPLES = env_int("SELENIUM_TIMEOUT_MIN_SAMPLES", 5)
+TIMEOUT_MAX = env_float("SELENIUM_TIMEOUT_MAX", 60)
+# Consecutive waits ended at a learned deadline before a pair goes back to
+# the caller's default (until one succeeds)
+TIMEOUT_MISSES = env_int("SELENIUM_TIMEOUT_MISSES", 3)
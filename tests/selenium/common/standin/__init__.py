@@ -0,0 +1,226 @@
+"""
+Offline stand-in for https://www.saucedemo.com.
+
+A small single-page app served by ``http.server`` on the loopback interface.
+It reproduces what the suites rely on: the login, inventory, item detail,
+cart and checkout pages with the same ids, classes and ``data-test``
+attributes, the same error messages, the ``session-username`` cookie and the
+cart kept in localStorage (``cart-contents``). Navigation inside the app uses
+the History API, like the real site, so URL-change waits behave the same.
+
+Set ``SAUCEDEMO_BASE_URL=local`` to run the suites against it: the
+``saucedemo`` session fixture starts the server on ``settings.STANDIN_PORT``
+(0: the free port the server binds) and publishes its address as
+``settings.BASE_URL``, which the page objects read once it has run.
+
+Delays and faults come from a profile (``common.standin.profiles``), chosen
+per test by the ``standin_profile`` fixture:
+``@pytest.mark.standin_profile("slow-network")`` or indirect parametrization
+of ``standin_profile``; other tests use ``settings.STANDIN_PROFILE``. The app
+asks ``/standin/route`` before showing a page, which applies the route's
+delay and tells it which JS error to throw.
+"""
+import json
+import mimetypes
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from common import settings
+from common.network import ASSET_CACHE
+from common.standin.profiles import (  # noqa: F401  (re-exported for tests)
+    PROFILES, Delay, Profile, Rule, exponential, fixed, get_profile, lognormal, normal, uniform,
+)
+from common.timeouts import TIMEOUTS
+
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Every route of the app is served by the same page, as on the real site
+APP_ROUTES = {
+    "/",
+    "/index.html",
+    "/inventory.html",
+    "/inventory-item.html",
+    "/cart.html",
+    "/checkout-step-one.html",
+    "/checkout-step-two.html",
+    "/checkout-complete.html",
+}
+
+# Asked by the app before it shows a route
+ROUTE_ENDPOINT = "/standin/route"
+SESSION_COOKIE = "session-username"
+
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("text/javascript", ".js")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the app shell for app routes and files under /static"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        profile = self.server.profile
+        if url.path == ROUTE_ENDPOINT:
+            route = parse_qs(url.query).get("path", ["/"])[0]
+            rule = profile.rule_for(route, self.user())
+            time.sleep(profile.delay(rule))
+            self.send_json({"error": rule.js_error if rule else None})
+            return
+
+        rule = profile.rule_for(url.path, self.user())
+        if url.path in APP_ROUTES:
+            target = STATIC_DIR / "index.html"
+        elif url.path == "/favicon.ico":
+            target = STATIC_DIR / "favicon.svg"
+        elif url.path.startswith("/static/"):
+            target = (STATIC_DIR / url.path[len("/static/"):]).resolve()
+            if STATIC_DIR.resolve() not in target.parents or not target.is_file():
+                self.send_error(404)
+                return
+        else:
+            self.send_error(404)
+            return
+
+        if url.path not in APP_ROUTES:
+            time.sleep(profile.delay(rule))
+        status = profile.fails(rule)
+        if status:
+            self.send_error(status)
+            return
+        # Only images are cacheable, so edits of the app show up immediately
+        self.send_file(target, cache=url.path.startswith("/static/media/") or url.path == "/favicon.ico")
+
+    def user(self):
+        """User of the session-username cookie, or None"""
+        cookie = SimpleCookie()
+        try:
+            cookie.load(self.headers.get("Cookie", ""))
+        except Exception:
+            return None
+        morsel = cookie.get(SESSION_COOKIE)
+        return morsel.value if morsel else None
+
+    def send_json(self, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_file(self, path, cache=True):
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600" if cache else "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """The stand-in app on a background thread"""
+
+    def __init__(self, port=0, host=settings.STANDIN_HOST, profile=settings.STANDIN_PROFILE):
+        self.host = host
+        self.port = port
+        self.profile = get_profile(profile)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), StandInHandler)
+        self._server.daemon_threads = True
+        self._server.profile = self.profile
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="saucedemo-standin", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def use(self, profile):
+        """Switches to another profile; returns the previous one"""
+        previous, self.profile = self.profile, get_profile(profile)
+        if self._server is not None:
+            self._server.profile = self.profile
+        return previous
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class StandInPlugin:
+    """
+    Provides the session-wide ``saucedemo`` fixture (base URL of the app) and
+    the per-test ``standin_profile`` fixture
+    """
+
+    def __init__(self, config):
+        self.server = None
+
+    @pytest.fixture(scope="session", autouse=True)
+    def saucedemo(self):
+        """Base URL of the application under test; starts the stand-in when selected"""
+        if not settings.STANDIN:
+            yield settings.BASE_URL
+            return
+        with StandInServer(port=settings.STANDIN_PORT) as self.server:
+            # The real port is only known once the server listens
+            settings.STANDIN_PORT = self.server.port
+            settings.BASE_URL = self.server.url
+            yield settings.BASE_URL
+        self.server = None
+
+    @pytest.fixture(autouse=True)
+    def standin_profile(self, request, saucedemo):
+        """
+        Profile of the stand-in for this test, from indirect parametrization or
+        the ``standin_profile`` marker; skips the test on another target
+        """
+        marker = request.node.get_closest_marker("standin_profile")
+        selected = getattr(request, "param", None) or (marker.args[0] if marker else None)
+        if self.server is None:
+            if selected is not None:
+                pytest.skip("needs the offline stand-in (SAUCEDEMO_BASE_URL=local)")
+            yield None
+            return
+
+        profile = get_profile(selected or settings.STANDIN_PROFILE)
+        profile.reset()
+        previous = self.server.use(profile)
+        TIMEOUTS.scope = None if profile.name == settings.STANDIN_PROFILE else profile.name
+        # Assets come from the server under a profile, not from the shared cache
+        ASSET_CACHE.bypass = TIMEOUTS.scope is not None
+        try:
+            yield profile
+        finally:
+            TIMEOUTS.scope = None
+            ASSET_CACHE.bypass = False
+            self.server.use(previous)
@@ -0,0 +1,167 @@
+"""
+Latency and fault-injection profiles of the offline stand-in.
+
+A profile is an ordered list of rules. A rule matches a request path
+(``fnmatch`` pattern) and optionally a set of users, read from the
+``session-username`` cookie; the first matching rule applies:
+
+* on a file (``/static/...``, ``/favicon.ico``): ``delay`` before the
+  response, ``status`` instead of the file, with probability
+  ``failure_rate``;
+* on an app route (``/inventory.html``, ...): ``delay`` before the app shows
+  that page, whether it is loaded or reached in the app, ``js_error`` thrown
+  by the page once it is shown, and ``status`` for a full document load.
+
+Delays are drawn from a ``Delay`` distribution with the profile's seed, so a
+run under a profile is reproducible. Latencies learned under a profile other
+than the default are kept apart (``TimeoutManager.scope``).
+"""
+import math
+import random
+import threading
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+
+
+@dataclass(frozen=True)
+class Delay:
+    """Delay distribution, in seconds (never negative)"""
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    def sample(self, rng):
+        if self.kind == "fixed":
+            value = self.a
+        elif self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(self.a), self.b)
+        elif self.kind == "exponential":
+            value = rng.expovariate(1 / self.a)
+        else:
+            raise ValueError(f"unknown delay distribution: {self.kind}")
+        return max(value, 0.0)
+
+
+def fixed(seconds):
+    return Delay("fixed", seconds)
+
+
+def uniform(low, high):
+    return Delay("uniform", low, high)
+
+
+def normal(mean, stddev):
+    return Delay("normal", mean, stddev)
+
+
+def lognormal(median, sigma):
+    """Long-tailed delay: half the samples below median"""
+    return Delay("lognormal", median, sigma)
+
+
+def exponential(mean):
+    return Delay("exponential", mean)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """What happens to the requests matching route (and users, when given)"""
+    route: str = "*"
+    users: tuple = ()
+    delay: Delay = None
+    status: int = None
+    failure_rate: float = 1.0
+    js_error: str = None
+
+    def matches(self, path, user):
+        return fnmatchcase(path, self.route) and (not self.users or user in self.users)
+
+
+@dataclass
+class Profile:
+    """Named, seeded set of rules; the first rule matching a request applies"""
+    name: str
+    rules: list = field(default_factory=list)
+    seed: int = 0
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def rule_for(self, path, user):
+        for rule in self.rules:
+            if rule.matches(path, user):
+                return rule
+        return None
+
+    def delay(self, rule):
+        """Seconds to wait for this rule (0 without delay)"""
+        if rule is None or rule.delay is None:
+            return 0.0
+        with self._lock:
+            return rule.delay.sample(self._rng)
+
+    def fails(self, rule):
+        """Status to answer instead of the content, or None"""
+        if rule is None or rule.status is None:
+            return None
+        with self._lock:
+            return rule.status if self._rng.random() < rule.failure_rate else None
+
+    def reset(self):
+        """Restarts the random sequence, for a new test"""
+        with self._lock:
+            self._rng.seed(self.seed)
+
+
+DEFAULT_PROFILE = "saucedemo"
+
+GLITCH_USER = "performance_glitch_user"
+
+# Built-in profiles; a test can also pass its own Profile to the fixture
+PROFILES = {
+    # What the public site does: performance_glitch_user waits for the inventory
+    "saucedemo": lambda: Profile("saucedemo", [
+        Rule("/inventory.html", users=(GLITCH_USER,), delay=fixed(5.0)),
+    ]),
+    # No delay at all, for a baseline of the wait engine's own overhead
+    "instant": lambda: Profile("instant"),
+    # Every page and asset takes a long-tailed, variable time
+    "slow-network": lambda: Profile("slow-network", [
+        Rule("/static/media/*", delay=lognormal(0.3, 0.6)),
+        Rule("/static/*", delay=uniform(0.1, 0.5)),
+        Rule("*.html", delay=lognormal(0.8, 0.5)),
+        Rule("/", delay=lognormal(0.8, 0.5)),
+    ], seed=1),
+    # Config.BUGGY_USERS, with faults a test can count on
+    "buggy-users": lambda: Profile("buggy-users", [
+        Rule("*.html", users=(GLITCH_USER,), delay=normal(3.0, 1.0)),
+        Rule("/static/media/*", users=("problem_user",), status=404),
+        Rule("/inventory-item.html", users=("error_user",),
+             js_error="Failed to add item to the cart."),
+        Rule("/checkout-step-two.html", users=("error_user",),
+             js_error="Failed to finish checkout."),
+        Rule("/static/style.css", users=("visual_user",), delay=fixed(3.0)),
+    ], seed=2),
+    # Half the product images fail, the stylesheet is late
+    "broken-assets": lambda: Profile("broken-assets", [
+        Rule("/static/media/*", status=500, failure_rate=0.5),
+        Rule("/static/style.css", delay=fixed(2.0)),
+    ], seed=3),
+}
+
+
+def get_profile(profile):
+    """A fresh Profile from a built-in name, or the Profile itself"""
+    if isinstance(profile, Profile):
+        return profile
+    try:
+        return PROFILES[profile]()
+    except KeyError:
+        raise ValueError(
+            f"unknown stand-in profile {profile!r}; built-in: {', '.join(sorted(PROFILES))}"
+        ) from None
@@ -0,0 +1,629 @@
+/*
+ * Offline stand-in for the SauceDemo app (Swag Labs).
+ *
+ * Renders the login, inventory, item detail, cart and checkout pages with the
+ * ids, classes and data-test attributes of the real site. The session is the
+ * "session-username" cookie, the cart is a JSON array of item ids in
+ * localStorage["cart-contents"], and in-app navigation uses the History API.
+ * Before showing a page the app asks the server for the route's profile
+ * (/standin/route): the answer comes after the route's delay and may name a
+ * JS error to throw once the page is shown.
+ */
+(function () {
+    'use strict';
+
+    var PASSWORD = 'secret_sauce';
+    var SESSION_COOKIE = 'session-username';
+    var SESSION_MINUTES = 10;
+    var CART_KEY = 'cart-contents';
+    var MEDIA = '/static/media/';
+    var BROKEN_IMAGE = 'sl-404.svg';
+    var TAX_RATE = 0.08;
+
+    var USERS = [
+        'standard_user',
+        'locked_out_user',
+        'problem_user',
+        'performance_glitch_user',
+        'error_user',
+        'visual_user'
+    ];
+    var LOCKED_USERS = ['locked_out_user'];
+    var ROUTE_ENDPOINT = '/standin/route';
+
+    var PRODUCTS = [
+        {
+            id: 0, name: 'Sauce Labs Bike Light', price: 9.99, image: 'bike-light-1200x1500.svg',
+            desc: 'A red light isn\'t the desired state in testing but it sure helps when riding your ' +
+                'bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included.'
+        },
+        {
+            id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99, image: 'bolt-shirt-1200x1500.svg',
+            desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American ' +
+                'Apparel, 100% ringspun combed cotton, heather gray with red bolt.'
+        },
+        {
+            id: 2, name: 'Sauce Labs Onesie', price: 7.99, image: 'red-onesie-1200x1500.svg',
+            desc: 'Rib snap infant onesie for the junior automation engineer in development. ' +
+                'Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won\'t unravel.'
+        },
+        {
+            id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99, image: 'red-tatt-1200x1500.svg',
+            desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard ' +
+                'to automate a few tests. Super-soft and comfy ringspun combed cotton.'
+        },
+        {
+            id: 4, name: 'Sauce Labs Backpack', price: 29.99, image: 'sauce-backpack-1200x1500.svg',
+            desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising ' +
+                'style with unequaled laptop and tablet protection.'
+        },
+        {
+            id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99, image: 'sauce-pullover-1200x1500.svg',
+            desc: 'It\'s not every day that you come across a midweight quarter-zip fleece jacket ' +
+                'capable of handling everything from a relaxing day outdoors to a busy day at the office.'
+        }
+    ];
+
+    var SORTS = {
+        az: ['Name (A to Z)', function (a, b) { return a.name.localeCompare(b.name); }],
+        za: ['Name (Z to A)', function (a, b) { return b.name.localeCompare(a.name); }],
+        lohi: ['Price (low to high)', function (a, b) { return a.price - b.price || a.name.localeCompare(b.name); }],
+        hilo: ['Price (high to low)', function (a, b) { return b.price - a.price || a.name.localeCompare(b.name); }]
+    };
+
+    // ----- DOM helpers ----------------------------------------------------
+
+    function h(tag, attrs) {
+        var el = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (key) {
+            var value = attrs[key];
+            if (value === null || value === undefined || value === false) {
+                return;
+            }
+            if (key.indexOf('on') === 0) {
+                el.addEventListener(key.slice(2), value);
+            } else {
+                el.setAttribute(key, value === true ? '' : value);
+            }
+        });
+        for (var i = 2; i < arguments.length; i++) {
+            append(el, arguments[i]);
+        }
+        return el;
+    }
+
+    function append(el, child) {
+        if (child === null || child === undefined || child === false) {
+            return;
+        }
+        if (Array.isArray(child)) {
+            child.forEach(function (c) { append(el, c); });
+        } else {
+            el.appendChild(typeof child === 'string' ? document.createTextNode(child) : child);
+        }
+    }
+
+    function closeIcon() {
+        var ns = 'http://www.w3.org/2000/svg';
+        var svg = document.createElementNS(ns, 'svg');
+        svg.setAttribute('viewBox', '0 0 16 16');
+        svg.setAttribute('width', '16');
+        svg.setAttribute('height', '16');
+        var path = document.createElementNS(ns, 'path');
+        path.setAttribute('d', 'M3 3 L13 13 M13 3 L3 13');
+        path.setAttribute('stroke', 'currentColor');
+        path.setAttribute('stroke-width', '2');
+        svg.appendChild(path);
+        return svg;
+    }
+
+    function slug(product) {
+        return product.name.toLowerCase().replace(/\s+/g, '-');
+    }
+
+    function money(value) {
+        return '$' + value.toFixed(2);
+    }
+
+    function productById(id) {
+        return PRODUCTS.filter(function (p) { return p.id === id; })[0] || null;
+    }
+
+    // ----- session and cart -----------------------------------------------
+
+    function currentUser() {
+        var match = new RegExp('(?:^|;\\s*)' + SESSION_COOKIE + '=([^;]*)').exec(document.cookie);
+        return match && match[1] ? decodeURIComponent(match[1]) : null;
+    }
+
+    function startSession(user) {
+        var expires = new Date(Date.now() + SESSION_MINUTES * 60000).toUTCString();
+        document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(user) + '; path=/; expires=' + expires;
+    }
+
+    function endSession() {
+        document.cookie = SESSION_COOKIE + '=; path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT';
+    }
+
+    function cart() {
+        try {
+            var ids = JSON.parse(localStorage.getItem(CART_KEY));
+            return Array.isArray(ids) ? ids : [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function saveCart(ids) {
+        if (ids.length) {
+            localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function toggleCart(id) {
+        var ids = cart(), index = ids.indexOf(id);
+        if (index === -1) {
+            ids.push(id);
+        } else {
+            ids.splice(index, 1);
+        }
+        saveCart(ids);
+    }
+
+    function imageOf(product) {
+        return MEDIA + (currentUser() === 'problem_user' ? BROKEN_IMAGE : product.image);
+    }
+
+    // ----- routing ----------------------------------------------------------
+
+    var PAGES = {
+        '/': loginPage,
+        '/index.html': loginPage,
+        '/inventory.html': inventoryPage,
+        '/inventory-item.html': detailPage,
+        '/cart.html': cartPage,
+        '/checkout-step-one.html': checkoutInfoPage,
+        '/checkout-step-two.html': checkoutOverviewPage,
+        '/checkout-complete.html': checkoutCompletePage
+    };
+
+    var navigations = 0;
+
+    // Shows the page of url; push adds it to the history once it is shown
+    function show(url, push) {
+        var target = new URL(url, location.href);
+        var page = PAGES[target.pathname] || loginPage;
+        var token = ++navigations;
+        if (page !== loginPage && !currentUser()) {
+            history[push ? 'pushState' : 'replaceState'](null, '', '/');
+            mount(loginPage('Epic sadface: You can only access \'' + target.pathname + '\' when you are logged in.'));
+            return;
+        }
+        routeProfile(target.pathname).then(function (route) {
+            if (token !== navigations) {
+                return;
+            }
+            if (push) {
+                history.pushState(null, '', target.pathname + target.search);
+            }
+            mount(page());
+            if (route.error) {
+                setTimeout(function () { throw new Error(route.error); }, 0);
+            }
+        });
+    }
+
+    function routeProfile(path) {
+        return fetch(ROUTE_ENDPOINT + '?path=' + encodeURIComponent(path), {cache: 'no-store'})
+            .then(function (response) { return response.json(); })
+            .catch(function () { return {}; });
+    }
+
+    function go(url) {
+        show(url, true);
+    }
+
+    function render() {
+        show(location.href, false);
+    }
+
+    function mount(view) {
+        var root = document.getElementById('root');
+        root.textContent = '';
+        root.appendChild(view);
+        window.scrollTo(0, 0);
+    }
+
+    // ----- shared layout ----------------------------------------------------
+
+    function layout(header, content) {
+        return h('div', {id: 'page_wrapper', 'class': 'page_wrapper'},
+            h('div', {id: 'contents_wrapper'}, header, content),
+            h('footer', {'class': 'footer', 'data-test': 'footer'},
+                h('div', {'class': 'footer_copy', 'data-test': 'footer-copy'},
+                    '© 2025 Sauce Labs. All Rights Reserved. Terms of Service | Privacy Policy')));
+    }
+
+    function header(title, secondary) {
+        var menu = h('div', {'class': 'bm-menu-wrap', hidden: true},
+            h('nav', {'class': 'bm-item-list'},
+                h('a', {id: 'inventory_sidebar_link', 'class': 'bm-item menu-item', href: '#',
+                    'data-test': 'inventory-sidebar-link', onclick: function (event) {
+                        event.preventDefault();
+                        go('/inventory.html');
+                    }}, 'All Items'),
+                h('a', {id: 'about_sidebar_link', 'class': 'bm-item menu-item', href: 'https://saucelabs.com/',
+                    'data-test': 'about-sidebar-link'}, 'About'),
+                h('a', {id: 'logout_sidebar_link', 'class': 'bm-item menu-item', href: '#',
+                    'data-test': 'logout-sidebar-link', onclick: function (event) {
+                        event.preventDefault();
+                        endSession();
+                        go('/');
+                    }}, 'Logout'),
+                h('a', {id: 'reset_sidebar_link', 'class': 'bm-item menu-item', href: '#',
+                    'data-test': 'reset-sidebar-link', onclick: function (event) {
+                        event.preventDefault();
+                        saveCart([]);
+                        render();
+                    }}, 'Reset App State')),
+            h('button', {type: 'button', id: 'react-burger-cross-btn', onclick: function () {
+                menu.hidden = true;
+            }}, 'Close Menu'));
+
+        var count = cart().length;
+        return h('div', {id: 'header_container', 'class': 'header_container', 'data-test': 'header-container'},
+            h('div', {'class': 'primary_header', 'data-test': 'primary-header'},
+                h('div', {id: 'menu_button_container'},
+                    h('div', {'class': 'bm-burger-button'},
+                        h('button', {type: 'button', id: 'react-burger-menu-btn', onclick: function () {
+                            menu.hidden = false;
+                        }}, 'Open Menu')),
+                    menu),
+                h('div', {'class': 'header_label'}, h('div', {'class': 'app_logo'}, 'Swag Labs')),
+                h('div', {id: 'shopping_cart_container', 'class': 'shopping_cart_container'},
+                    h('a', {'class': 'shopping_cart_link', 'data-test': 'shopping-cart-link', onclick: function () {
+                        go('/cart.html');
+                    }}, count ? badge(count) : null))),
+            h('div', {'class': 'header_secondary_container', 'data-test': 'secondary-header'},
+                title ? h('span', {'class': 'title', 'data-test': 'title'}, title) : null,
+                secondary || null));
+    }
+
+    function badge(count) {
+        return h('span', {'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge'}, String(count));
+    }
+
+    function updateBadge() {
+        var link = document.querySelector('.shopping_cart_link');
+        if (!link) {
+            return;
+        }
+        var current = link.querySelector('.shopping_cart_badge'), count = cart().length;
+        if (!count) {
+            if (current) { current.remove(); }
+        } else if (current) {
+            current.textContent = String(count);
+        } else {
+            link.appendChild(badge(count));
+        }
+    }
+
+    // Add/Remove button updated in place, like the React component
+    function cartButton(product, extraClass, plainIds) {
+        var button = h('button', {});
+        function paint() {
+            var inCart = cart().indexOf(product.id) !== -1;
+            var id = (inCart ? 'remove' : 'add-to-cart') + (plainIds ? '' : '-' + slug(product));
+            button.id = id;
+            button.name = id;
+            button.setAttribute('data-test', id);
+            button.className = 'btn ' + (inCart ? 'btn_secondary' : 'btn_primary') + ' ' + extraClass;
+            button.textContent = inCart ? 'Remove' : 'Add to cart';
+        }
+        button.addEventListener('click', function () {
+            toggleCart(product.id);
+            paint();
+            updateBadge();
+        });
+        paint();
+        return button;
+    }
+
+    function errorBox() {
+        var box = h('div', {'class': 'error-message-container'});
+        box.show = function (message) {
+            box.className = 'error-message-container error';
+            box.textContent = '';
+            box.appendChild(h('h3', {'data-test': 'error'}, message,
+                h('button', {'class': 'error-button', 'data-test': 'error-button', type: 'button',
+                    onclick: box.clear}, closeIcon())));
+        };
+        box.clear = function () {
+            box.className = 'error-message-container';
+            box.textContent = '';
+        };
+        return box;
+    }
+
+    // ----- pages ------------------------------------------------------------
+
+    function loginPage(message) {
+        var username = h('input', {'class': 'input_error form_input', placeholder: 'Username', type: 'text',
+            'data-test': 'username', id: 'user-name', name: 'user-name', autocorrect: 'off',
+            autocapitalize: 'none'});
+        var password = h('input', {'class': 'input_error form_input', placeholder: 'Password', type: 'password',
+            'data-test': 'password', id: 'password', name: 'password', autocorrect: 'off',
+            autocapitalize: 'none'});
+        var error = errorBox();
+
+        function submit(event) {
+            event.preventDefault();
+            var user = username.value;
+            if (!user) {
+                return error.show('Epic sadface: Username is required');
+            }
+            if (!password.value) {
+                return error.show('Epic sadface: Password is required');
+            }
+            if (USERS.indexOf(user) === -1 || password.value !== PASSWORD) {
+                return error.show('Epic sadface: Username and password do not match any user in this service');
+            }
+            if (LOCKED_USERS.indexOf(user) !== -1) {
+                return error.show('Epic sadface: Sorry, this user has been locked out.');
+            }
+            startSession(user);
+            go('/inventory.html');
+        }
+
+        var view = h('div', {'class': 'login_container'},
+            h('div', {'class': 'login_logo'}, 'Swag Labs'),
+            h('div', {'class': 'login_wrapper', 'data-test': 'login-container'},
+                h('div', {'class': 'login_wrapper-inner'},
+                    h('div', {id: 'login_button_container', 'class': 'form_column'},
+                        h('div', {'class': 'login-box'},
+                            h('form', {onsubmit: submit},
+                                h('div', {'class': 'form_group'}, username),
+                                h('div', {'class': 'form_group'}, password),
+                                error,
+                                h('input', {type: 'submit', 'class': 'submit-button btn_action',
+                                    'data-test': 'login-button', id: 'login-button', name: 'login-button',
+                                    value: 'Login'})))))),
+            h('div', {'class': 'login_credentials_wrap', 'data-test': 'login-credentials-container'},
+                h('div', {'class': 'login_credentials', 'data-test': 'login-credentials'},
+                    h('h4', {}, 'Accepted usernames are:'), USERS.join('\n')),
+                h('div', {'class': 'login_password', 'data-test': 'login-password'},
+                    h('h4', {}, 'Password for all users:'), PASSWORD)));
+        if (message) {
+            error.show(message);
+        }
+        return view;
+    }
+
+    function inventoryItem(product) {
+        function open(event) {
+            event.preventDefault();
+            go('/inventory-item.html?id=' + product.id);
+        }
+        return h('div', {'class': 'inventory_item', 'data-test': 'inventory-item'},
+            h('div', {'class': 'inventory_item_img'},
+                h('a', {href: '#', id: 'item_' + product.id + '_img_link',
+                    'data-test': 'item-' + product.id + '-img-link', onclick: open},
+                    h('img', {alt: product.name, 'class': 'inventory_item_img', src: imageOf(product),
+                        'data-test': 'inventory-item-' + slug(product) + '-img'}))),
+            h('div', {'class': 'inventory_item_description', 'data-test': 'inventory-item-description'},
+                h('div', {'class': 'inventory_item_label'},
+                    h('a', {href: '#', id: 'item_' + product.id + '_title_link',
+                        'data-test': 'item-' + product.id + '-title-link', onclick: open},
+                        h('div', {'class': 'inventory_item_name ', 'data-test': 'inventory-item-name'},
+                            product.name)),
+                    h('div', {'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc'}, product.desc)),
+                h('div', {'class': 'pricebar'},
+                    h('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price'},
+                        money(product.price)),
+                    cartButton(product, 'btn_small btn_inventory'))));
+    }
+
+    function inventoryPage() {
+        var sort = 'az';
+        var list = h('div', {'class': 'inventory_list', 'data-test': 'inventory-list'});
+        var active = h('span', {'class': 'active_option', 'data-test': 'active-option'}, SORTS[sort][0]);
+        var select = h('select', {'class': 'product_sort_container', 'data-test': 'product-sort-container',
+            onchange: function () {
+                sort = select.value;
+                active.textContent = SORTS[sort][0];
+                fill();
+            }},
+            Object.keys(SORTS).map(function (key) { return h('option', {value: key}, SORTS[key][0]); }));
+
+        function fill() {
+            list.textContent = '';
+            PRODUCTS.slice().sort(SORTS[sort][1]).forEach(function (product) {
+                list.appendChild(inventoryItem(product));
+            });
+        }
+        fill();
+
+        return layout(
+            header('Products', h('div', {'class': 'right_component'},
+                h('span', {'class': 'select_container', 'data-test': 'select-container'}, active, select))),
+            h('div', {id: 'inventory_container', 'class': 'inventory_container', 'data-test': 'inventory-container'},
+                list));
+    }
+
+    function detailPage() {
+        var id = parseInt(new URLSearchParams(location.search).get('id'), 10);
+        var product = productById(id);
+        var back = h('button', {'class': 'btn btn_secondary back btn_large inventory_details_back_button',
+            'data-test': 'back-to-products', id: 'back-to-products', name: 'back-to-products',
+            onclick: function () { go('/inventory.html'); }}, 'Back to products');
+
+        var details;
+        if (!product) {
+            details = h('div', {'class': 'inventory_details_container', 'data-test': 'inventory-container'},
+                h('div', {'class': 'inventory_details_img_container'},
+                    h('img', {alt: 'ITEM NOT FOUND', 'class': 'inventory_details_img', src: MEDIA + BROKEN_IMAGE})),
+                h('div', {'class': 'inventory_details_desc_container'},
+                    h('div', {'class': 'inventory_details_name large_size', 'data-test': 'inventory-item-name'},
+                        'ITEM NOT FOUND'),
+                    h('div', {'class': 'inventory_details_desc large_size', 'data-test': 'inventory-item-desc'},
+                        'We\'re sorry, but your call could not be completed as dialled.')));
+        } else {
+            details = h('div', {'class': 'inventory_details_container', 'data-test': 'inventory-container'},
+                h('div', {'class': 'inventory_details_img_container'},
+                    h('img', {alt: product.name, 'class': 'inventory_details_img', src: imageOf(product),
+                        'data-test': 'item-' + slug(product) + '-img'})),
+                h('div', {'class': 'inventory_details_desc_container'},
+                    h('div', {'class': 'inventory_details_name large_size', 'data-test': 'inventory-item-name'},
+                        product.name),
+                    h('div', {'class': 'inventory_details_desc large_size', 'data-test': 'inventory-item-desc'},
+                        product.desc),
+                    h('div', {'class': 'inventory_details_price', 'data-test': 'inventory-item-price'},
+                        money(product.price)),
+                    cartButton(product, 'btn_large btn_inventory', true)));
+        }
+
+        return layout(
+            header(null, h('div', {'class': 'left_component'}, back)),
+            h('div', {'class': 'inventory_details', 'data-test': 'inventory-details'}, details));
+    }
+
+    function cartRow(product, removable) {
+        var row = h('div', {'class': 'cart_item', 'data-test': 'inventory-item'},
+            h('div', {'class': 'cart_quantity', 'data-test': 'item-quantity'}, '1'),
+            h('div', {'class': 'cart_item_label'},
+                h('a', {href: '#', id: 'item_' + product.id + '_title_link',
+                    'data-test': 'item-' + product.id + '-title-link', onclick: function (event) {
+                        event.preventDefault();
+                        go('/inventory-item.html?id=' + product.id);
+                    }},
+                    h('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name'}, product.name)),
+                h('div', {'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc'}, product.desc),
+                h('div', {'class': 'item_pricebar'},
+                    h('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price'},
+                        money(product.price)),
+                    removable ? h('button', {'class': 'btn btn_secondary btn_small cart_button',
+                        id: 'remove-' + slug(product), name: 'remove-' + slug(product),
+                        'data-test': 'remove-' + slug(product), onclick: function () {
+                            toggleCart(product.id);
+                            row.remove();
+                            updateBadge();
+                        }}, 'Remove') : null)));
+        return row;
+    }
+
+    function cartProducts() {
+        return cart().map(productById).filter(Boolean);
+    }
+
+    function cartPage() {
+        var list = h('div', {'class': 'cart_list', 'data-test': 'cart-list'},
+            h('div', {'class': 'cart_quantity_label', 'data-test': 'cart-quantity-label'}, 'QTY'),
+            h('div', {'class': 'cart_desc_label', 'data-test': 'cart-desc-label'}, 'Description'),
+            cartProducts().map(function (product) { return cartRow(product, true); }));
+
+        return layout(header('Your Cart'),
+            h('div', {id: 'cart_contents_container', 'class': 'cart_contents_container',
+                'data-test': 'cart-contents-container'},
+                list,
+                h('div', {'class': 'cart_footer'},
+                    h('button', {'class': 'btn btn_secondary back btn_medium', id: 'continue-shopping',
+                        name: 'continue-shopping', 'data-test': 'continue-shopping',
+                        onclick: function () { go('/inventory.html'); }}, 'Continue Shopping'),
+                    h('button', {'class': 'btn btn_action btn_medium checkout_button', id: 'checkout',
+                        name: 'checkout', 'data-test': 'checkout',
+                        onclick: function () { go('/checkout-step-one.html'); }}, 'Checkout'))));
+    }
+
+    function checkoutInfoPage() {
+        function field(id, placeholder, test) {
+            return h('div', {'class': 'form_group'},
+                h('input', {'class': 'input_error form_input', placeholder: placeholder, type: 'text',
+                    'data-test': test, id: id, name: id, autocorrect: 'off', autocapitalize: 'none'}));
+        }
+        var first = field('first-name', 'First Name', 'firstName');
+        var last = field('last-name', 'Last Name', 'lastName');
+        var postal = field('postal-code', 'Zip/Postal Code', 'postalCode');
+        var error = errorBox();
+
+        function submit(event) {
+            event.preventDefault();
+            var checks = [
+                [first, 'Error: First Name is required'],
+                [last, 'Error: Last Name is required'],
+                [postal, 'Error: Postal Code is required']
+            ];
+            for (var i = 0; i < checks.length; i++) {
+                if (!checks[i][0].querySelector('input').value) {
+                    return error.show(checks[i][1]);
+                }
+            }
+            go('/checkout-step-two.html');
+        }
+
+        return layout(header('Checkout: Your Information'),
+            h('div', {id: 'checkout_info_container', 'class': 'checkout_info_container',
+                'data-test': 'checkout-info-container'},
+                h('div', {'class': 'checkout_info_wrapper'},
+                    h('form', {onsubmit: submit},
+                        h('div', {'class': 'checkout_info'}, first, last, postal, error),
+                        h('div', {'class': 'checkout_buttons'},
+                            h('button', {'class': 'btn btn_secondary back btn_medium cart_cancel_link',
+                                id: 'cancel', name: 'cancel', 'data-test': 'cancel', type: 'button',
+                                onclick: function () { go('/cart.html'); }}, 'Cancel'),
+                            h('input', {type: 'submit', 'class': 'submit-button btn btn_primary cart_button btn_action',
+                                id: 'continue', name: 'continue', 'data-test': 'continue', value: 'Continue'}))))));
+    }
+
+    function checkoutOverviewPage() {
+        var products = cartProducts();
+        var subtotal = products.reduce(function (sum, p) { return sum + p.price; }, 0);
+        var tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+
+        function label(cls, test, text) {
+            return h('div', {'class': cls, 'data-test': test}, text);
+        }
+
+        return layout(header('Checkout: Overview'),
+            h('div', {id: 'checkout_summary_container', 'class': 'checkout_summary_container',
+                'data-test': 'checkout-summary-container'},
+                h('div', {'class': 'cart_list', 'data-test': 'cart-list'},
+                    h('div', {'class': 'cart_quantity_label', 'data-test': 'cart-quantity-label'}, 'QTY'),
+                    h('div', {'class': 'cart_desc_label', 'data-test': 'cart-desc-label'}, 'Description'),
+                    products.map(function (product) { return cartRow(product, false); })),
+                h('div', {'class': 'summary_info', 'data-test': 'summary-info'},
+                    label('summary_info_label', 'payment-info-label', 'Payment Information:'),
+                    label('summary_value_label', 'payment-info-value', 'SauceCard #31337'),
+                    label('summary_info_label', 'shipping-info-label', 'Shipping Information:'),
+                    label('summary_value_label', 'shipping-info-value', 'Free Pony Express Delivery!'),
+                    label('summary_info_label summary_total_label', 'total-info-label', 'Price Total'),
+                    label('summary_subtotal_label', 'subtotal-label', 'Item total: ' + money(subtotal)),
+                    label('summary_tax_label', 'tax-label', 'Tax: ' + money(tax)),
+                    label('summary_info_label summary_total_label', 'total-label', 'Total: ' + money(subtotal + tax)),
+                    h('div', {'class': 'cart_footer'},
+                        h('button', {'class': 'btn btn_secondary back btn_medium cart_cancel_link', id: 'cancel',
+                            name: 'cancel', 'data-test': 'cancel',
+                            onclick: function () { go('/inventory.html'); }}, 'Cancel'),
+                        h('button', {'class': 'btn btn_action btn_medium cart_button', id: 'finish',
+                            name: 'finish', 'data-test': 'finish', onclick: function () {
+                                saveCart([]);
+                                go('/checkout-complete.html');
+                            }}, 'Finish')))));
+    }
+
+    function checkoutCompletePage() {
+        return layout(header('Checkout: Complete!'),
+            h('div', {id: 'checkout_complete_container', 'class': 'checkout_complete_container',
+                'data-test': 'checkout-complete-container'},
+                h('h2', {'class': 'complete-header', 'data-test': 'complete-header'}, 'Thank you for your order!'),
+                h('div', {'class': 'complete-text', 'data-test': 'complete-text'},
+                    'Your order has been dispatched, and will arrive just as fast as the pony can get there!'),
+                h('button', {'class': 'btn btn_primary btn_small', id: 'back-to-products', name: 'back-to-products',
+                    'data-test': 'back-to-products', onclick: function () { go('/inventory.html'); }},
+                    'Back Home')));
+    }
+
+    window.addEventListener('popstate', render);
+    render();
+})();
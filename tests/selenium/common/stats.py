@@ -0,0 +1,65 @@
+"""
+Small statistics helpers shared by the suites (no numpy dependency).
+"""
+import math
+
+
+def percentile(values, q):
+    """q-th percentile (0-100) with linear interpolation between samples"""
+    if not values:
+        raise ValueError("percentile of an empty sequence")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values):
+    """n, mean, p50, p95 and p99 of a sample"""
+    return {
+        "n": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+def normal_cdf(z):
+    return 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+
+def mann_whitney_greater(a, b):
+    """
+    One-sided Mann-Whitney U test that a tends to be larger than b.
+    Returns (U of a, p-value), with average ranks for ties, the tie
+    correction and a continuity correction on the normal approximation.
+    """
+    if not a or not b:
+        raise ValueError("Mann-Whitney U test needs two non-empty samples")
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tied = j - i + 1
+        tie_term += tied ** 3 - tied
+        i = j + 1
+
+    n_a, n_b = len(a), len(b)
+    n = n_a + n_b
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n_a * (n_a + 1) / 2
+    mean = n_a * n_b / 2
+    variance = n_a * n_b / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0 if u <= mean else 0.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return u, 1 - normal_cdf(z)
@@ -0,0 +1,169 @@
+"""
+Adaptive timeouts learned from measured latency.
+
+Page objects time their waits per (user, transition), for example
+``("performance_glitch_user", "login")``. Successful waits are recorded and
+saved in ``latencies-<host>.json`` under ``settings.CACHE_DIR`` at the end of the
+session, so later runs know how long each transition really takes. A wait's
+deadline is then a high percentile of those samples plus a margin instead of
+a fixed value: short for ``standard_user``, long enough for
+``performance_glitch_user``, and a regression fails fast.
+
+Until a pair has ``settings.TIMEOUT_MIN_SAMPLES`` samples the caller's
+default timeout is used. Only successful waits are samples, so a learned
+deadline cannot grow by itself when the site gets slower: after
+``settings.TIMEOUT_MISSES`` consecutive waits of a pair ended at a learned
+deadline shorter than the default, the default is used again for that pair
+until a wait succeeds, and the slower latencies are recorded. Setting ``scope`` (the stand-in does it for a
+latency profile) keeps the samples of deliberately slowed runs apart.
+"""
+import json
+import os
+import threading
+import time
+import weakref
+
+from common import settings
+from common.stats import percentile
+
+
+LATENCY_FILE = "latencies-{target}.json"
+
+# Samples kept per (user, transition); older ones are dropped
+MAX_SAMPLES = 200
+
+ANONYMOUS = "anonymous"
+
+
+class TimeoutManager:
+    """Records latencies per (user, transition) and derives deadlines from them"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(settings.CACHE_DIR, LATENCY_FILE.format(target=settings.TARGET))
+        self._samples = None
+        self._pending = {}
+        # Consecutive waits per key that ended at a learned deadline
+        self._misses = {}
+        self._users = weakref.WeakKeyDictionary()
+        # Prefix of the keys, e.g. the stand-in profile (None: plain keys)
+        self.scope = None
+        self._lock = threading.Lock()
+
+    # ----- current user per session ---------------------------------------
+
+    def bind(self, driver, user):
+        """Attributes the waits of this session to a user (None when logged out)"""
+        with self._lock:
+            if user:
+                self._users[driver] = user
+            else:
+                self._users.pop(driver, None)
+
+    def user_of(self, driver):
+        with self._lock:
+            return self._users.get(driver, ANONYMOUS)
+
+    # ----- deadlines -------------------------------------------------------
+
+    def deadline(self, user, transition, default):
+        """Timeout in seconds for a transition, or default while unknown"""
+        if not settings.ADAPTIVE_TIMEOUTS:
+            return default
+        with self._lock:
+            if self._misses.get(_key(user, transition, self.scope), 0) >= settings.TIMEOUT_MISSES:
+                return default
+        samples = self.samples(user, transition)
+        if len(samples) < settings.TIMEOUT_MIN_SAMPLES:
+            return default
+        learned = percentile(samples, settings.TIMEOUT_PERCENTILE) + settings.TIMEOUT_MARGIN
+        return round(min(learned, settings.TIMEOUT_MAX), 3)
+
+    def samples(self, user, transition):
+        key = _key(user, transition, self.scope)
+        with self._lock:
+            self._load()
+            return self._samples.get(key, []) + self._pending.get(key, [])
+
+    def record(self, user, transition, seconds):
+        if not settings.ADAPTIVE_TIMEOUTS:
+            return
+        key = _key(user, transition, self.scope)
+        with self._lock:
+            self._pending.setdefault(key, []).append(round(seconds, 4))
+            self._misses.pop(key, None)
+
+    def missed(self, user, transition, timeout, default):
+        """Counts a wait that ended at its deadline, when that deadline was learned"""
+        if timeout >= default:
+            return
+        key = _key(user, transition, self.scope)
+        with self._lock:
+            self._misses[key] = self._misses.get(key, 0) + 1
+
+    def measure(self, driver, transition, wait, default):
+        """
+        Calls wait(timeout) with the deadline for the session's user and
+        records the latency when it succeeds (no exception, result not False);
+        otherwise counts a miss of the learned deadline
+        """
+        user = self.user_of(driver)
+        timeout = self.deadline(user, transition, default)
+        start = time.monotonic()
+        try:
+            result = wait(timeout)
+        except Exception:
+            self.missed(user, transition, timeout, default)
+            raise
+        if result is False:
+            self.missed(user, transition, timeout, default)
+        else:
+            self.record(user, transition, time.monotonic() - start)
+        return result
+
+    # ----- persistence -----------------------------------------------------
+
+    def save(self):
+        """Merges this process's samples into the file (other workers may have written)"""
+        with self._lock:
+            if not self._pending:
+                return
+            merged = _read(self.path)
+            for key, values in self._pending.items():
+                merged[key] = (merged.get(key, []) + values)[-MAX_SAMPLES:]
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(merged, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._samples = merged
+            self._pending = {}
+
+    def _load(self):
+        if self._samples is None:
+            self._samples = _read(self.path)
+
+
+def _key(user, transition, scope=None):
+    key = f"{user or ANONYMOUS}|{transition}"
+    return f"{scope}:{key}" if scope else key
+
+
+def _read(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+TIMEOUTS = TimeoutManager()
+
+
+class AdaptiveTimeoutsPlugin:
+    """Saves the latencies recorded by this process when the session ends"""
+
+    def __init__(self, config):
+        pass
+
+    def pytest_sessionfinish(self):
+        TIMEOUTS.save()
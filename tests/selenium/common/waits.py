@@ -0,0 +1,302 @@
+"""
+Event-driven waits for the page objects.
+
+Each wait is a single ``execute_async_script`` call: the condition is
+checked inside the page on every animation frame and the call returns as
+soon as it holds, instead of sleeping a fixed amount and checking afterwards.
+A small instrumentation script, installed once per document, feeds the
+conditions:
+
+* a MutationObserver records when the DOM last changed (quiescence),
+* fetch/XHR calls and resource timing entries track network activity,
+* locators are resolved in the page (id, css, class name, name, tag, xpath).
+
+Every wait is recorded in ``RECORDER`` so the time a test spends waiting is
+reported with its result (see ``WaitStatsPlugin``).
+
+Timing policy: sessions run with an implicit wait of 0 (``apply_timing_policy``).
+Every wait is explicit, either a ``WebDriverWait`` or one of the event waits
+here, and presence checks (``probe_elements``) answer from the current DOM in
+one script call. An implicit wait would silently add its full duration to
+every lookup of an element that is absent.
+"""
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+
+
+INSTRUMENT_SCRIPT = """
+if (!window.__waitEngine) {
+    var engine = window.__waitEngine = {
+        id: Math.random().toString(36).slice(2),
+        mutations: 0, lastMutation: performance.now(),
+        inflight: 0, lastNetwork: performance.now()
+    };
+    new MutationObserver(function (records) {
+        engine.mutations += records.length;
+        engine.lastMutation = performance.now();
+    }).observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+
+    var networkDone = function () { engine.inflight--; engine.lastNetwork = performance.now(); };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            engine.inflight++;
+            return fetch.apply(this, arguments).finally(networkDone);
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        engine.inflight++;
+        this.addEventListener('loadend', networkDone);
+        return send.apply(this, arguments);
+    };
+    if (window.PerformanceObserver) {
+        new PerformanceObserver(function () { engine.lastNetwork = performance.now(); })
+            .observe({entryTypes: ['resource']});
+    }
+
+    engine.find = function (locator) {
+        switch (locator.by) {
+            case 'id': return document.getElementById(locator.value);
+            case 'class name': return document.getElementsByClassName(locator.value)[0] || null;
+            case 'name': return document.getElementsByName(locator.value)[0] || null;
+            case 'tag name': return document.getElementsByTagName(locator.value)[0] || null;
+            case 'xpath': return document.evaluate(locator.value, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            default: return document.querySelector(locator.value);
+        }
+    };
+    engine.findAll = function (locator) {
+        switch (locator.by) {
+            case 'id': return document.querySelectorAll('[id="' + CSS.escape(locator.value) + '"]');
+            case 'class name': return document.getElementsByClassName(locator.value);
+            case 'name': return document.getElementsByName(locator.value);
+            case 'tag name': return document.getElementsByTagName(locator.value);
+            case 'xpath':
+                var result = document.evaluate(locator.value, document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                var nodes = [];
+                for (var i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+                return nodes;
+            default: return document.querySelectorAll(locator.value);
+        }
+    };
+    engine.visible = function (el) {
+        if (!el || !el.isConnected) { return false; }
+        var style = getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') {
+            return false;
+        }
+        var rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+}
+return window.__waitEngine;
+"""
+
+WAIT_SCRIPT = """
+var kind = arguments[0], options = arguments[1], done = arguments[arguments.length - 1];
+var engine = (function () { %s })();
+var start = performance.now();
+
+var conditions = {
+    dom_quiet: function () {
+        return performance.now() - engine.lastMutation >= options.quiet_ms;
+    },
+    url: function () {
+        var url = location.href;
+        if (options.from_url && url === options.from_url) { return false; }
+        return !options.contains || url.indexOf(options.contains) !== -1;
+    },
+    network_idle: function () {
+        var images = Array.prototype.some.call(document.images, function (img) {
+            return img.src && !img.complete;
+        });
+        return document.readyState === 'complete' && engine.inflight <= 0 && !images
+            && performance.now() - engine.lastNetwork >= options.idle_ms;
+    },
+    element: function () {
+        var el = engine.find(options.locator);
+        switch (options.state) {
+            case 'present': return !!el;
+            case 'absent': return !el;
+            case 'visible': return engine.visible(el);
+            case 'hidden': return !engine.visible(el);
+            case 'enabled': return !!el && !el.disabled;
+            case 'clickable':
+                return engine.visible(el) && !el.disabled
+                    && getComputedStyle(el).pointerEvents !== 'none';
+        }
+        return false;
+    }
+};
+
+(function tick() {
+    if (conditions[kind]()) {
+        return done({ok: true, url: location.href});
+    }
+    if (performance.now() - start >= options.timeout_ms) {
+        return done({ok: false, url: location.href});
+    }
+    // animation frames are not delivered to hidden pages
+    document.hidden ? setTimeout(tick, 50) : requestAnimationFrame(tick);
+})();
+""" % INSTRUMENT_SCRIPT
+
+# Answers presence questions for several locators from the current DOM
+PROBE_SCRIPT = """
+var engine = (function () { %s })();
+return arguments[0].map(function (locator) {
+    var nodes = engine.findAll(locator), first = nodes[0] || null;
+    return {
+        count: nodes.length,
+        visible: engine.visible(first),
+        text: first ? (first.innerText || first.textContent || '').trim() : null
+    };
+});
+""" % INSTRUMENT_SCRIPT
+
+# WebDriver's default script timeout; longer waits raise it first
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+# No implicit wait: see the timing policy above
+IMPLICIT_WAIT = 0
+
+
+def apply_timing_policy(driver):
+    """Disables the implicit wait so only explicit waits are in effect"""
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    return driver
+
+
+def probe_elements(driver, locators):
+    """
+    Checks (By, value) locators against the current DOM in one script call,
+    without waiting. Returns one {count, visible, text} dict per locator.
+    """
+    payload = [{"by": by, "value": value} for by, value in locators]
+    return driver.execute_script(PROBE_SCRIPT, payload)
+
+
+class WaitRecorder:
+    """Accumulates the time spent in waits, per kind, for the current test"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.totals = {}
+            self.count = 0
+
+    def record(self, kind, seconds):
+        with self._lock:
+            self.totals[kind] = self.totals.get(kind, 0.0) + seconds
+            self.count += 1
+
+    @property
+    def total(self):
+        return sum(self.totals.values())
+
+    def summary(self):
+        with self._lock:
+            return {
+                "total": round(sum(self.totals.values()), 3),
+                "count": self.count,
+                "by_kind": {kind: round(value, 3) for kind, value in self.totals.items()},
+            }
+
+
+RECORDER = WaitRecorder()
+
+
+class EventWaiter:
+    """Waits on in-page events and returns as soon as the condition holds"""
+
+    def __init__(self, driver, recorder=RECORDER):
+        self.driver = driver
+        self.recorder = recorder
+
+    def dom_quiet(self, quiet_ms=100, timeout=10):
+        """No DOM mutation for quiet_ms milliseconds"""
+        return self._wait("dom_quiet", {"quiet_ms": quiet_ms}, timeout)
+
+    def url_change(self, from_url=None, contains=None, timeout=10):
+        """URL differs from from_url and/or contains a fragment; returns the URL"""
+        result = self._wait("url", {"from_url": from_url, "contains": contains}, timeout)
+        return result["url"]
+
+    def network_idle(self, idle_ms=250, timeout=10):
+        """Document loaded, no fetch/XHR or image pending for idle_ms milliseconds"""
+        return self._wait("network_idle", {"idle_ms": idle_ms}, timeout)
+
+    def element(self, locator, state="visible", timeout=10):
+        """
+        Element in the given state: present, absent, visible, hidden,
+        enabled or clickable. locator is a (By, value) tuple.
+        """
+        by, value = locator
+        return self._wait("element", {"locator": {"by": by, "value": value}, "state": state}, timeout)
+
+    def _wait(self, kind, options, timeout):
+        options = dict(options, timeout_ms=int(timeout * 1000))
+        if timeout + 1 > DEFAULT_SCRIPT_TIMEOUT:
+            self.driver.set_script_timeout(timeout + 5)
+        start = time.monotonic()
+        try:
+            while True:
+                try:
+                    result = self.driver.execute_async_script(WAIT_SCRIPT, kind, options)
+                    break
+                except JavascriptException as e:
+                    if "unloaded" not in (e.msg or ""):
+                        raise
+                    # A full page load destroyed the document mid-wait: check again
+                    # on the new document with what is left of the timeout
+                    remaining = timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        raise TimeoutException(f"{kind} wait timed out during navigation")
+                    options["timeout_ms"] = int(remaining * 1000)
+        except WebDriverException as e:
+            if isinstance(e, TimeoutException):
+                raise
+            raise TimeoutException(f"{kind} wait failed: {e.msg}") from e
+        finally:
+            self.recorder.record(kind, time.monotonic() - start)
+        if not result or not result.get("ok"):
+            raise TimeoutException(f"{kind} condition not met after {timeout}s: {options}")
+        return result
+
+
+class WaitStatsPlugin:
+    """Attaches each test's wait time to its report and summarizes the run"""
+
+    def __init__(self, config):
+        self.per_test = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        RECORDER.reset()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_makereport(self, item, call):
+        if call.when == "teardown":
+            item.user_properties.append(("wait_time", RECORDER.summary()))
+
+    def pytest_runtest_logreport(self, report):
+        for name, value in report.user_properties:
+            if name == "wait_time":
+                self.per_test[report.nodeid] = value["total"]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.per_test:
+            return
+        slowest = sorted(self.per_test.items(), key=lambda pair: pair[1], reverse=True)[:10]
+        terminalreporter.write_sep("=", "time spent waiting (top 10)")
+        for nodeid, seconds in slowest:
+            terminalreporter.write_line(f"{seconds:8.2f}s  {nodeid}")
+        terminalreporter.write_line(f"{sum(self.per_test.values()):8.2f}s  total")
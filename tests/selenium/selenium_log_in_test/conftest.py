@@ -2,7 +2,18 @@ import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-import os
+import sys
+from pathlib import Path
+
+# Shared helpers live in tests/selenium/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common.browser_pool import BrowserPool
+from common.driver_resolver import default_chrome_binary, resolve_chrome
+from common.plugin import register as register_plugins
+
+def pytest_configure(config):
+    register_plugins(config)
 
 @pytest.fixture(scope="session")
 def chrome_options():
@@ -17,16 +28,27 @@ def chrome_options():
     options.add_argument("--disable-dev-shm-usage")
     
     # Point to Chromium or Chrome binary
-    # Default to Chromium, override with env variable if needed (good for CI)
-    options.binary_location = os.environ.get("CHROME_BINARY", "/usr/bin/chromium-browser")
+    # Default to Chromium on Linux, override with env variable if needed (good for CI)
+    options.binary_location = default_chrome_binary()
     
     return options
 
+@pytest.fixture(scope="session")
+def browser_pool(chrome_options):
+    """Chrome sessions reused across tests, reset between them"""
+    # Chromedriver is resolved once per Chrome version and cached on disk
+    # (set CHROMEDRIVER to force a custom ChromeDriver path)
+    chrome = resolve_chrome(chrome_options.binary_location)
+    pool = BrowserPool(
+        lambda: webdriver.Chrome(service=Service(chrome.driver_path), options=chrome_options)
+    )
+    yield pool
+    pool.close()
+
 @pytest.fixture(scope="function")
-def driver(chrome_options):
+def driver(browser_pool):
     """Selenium WebDriver fixture"""
-    # Optionally, you can specify a custom ChromeDriver path
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = browser_pool.acquire()
     yield driver
-    driver.quit()
+    browser_pool.release(driver)
 
@@ -1,10 +1,8 @@
-import json
 from pathlib import Path
 
-def load_test_data(relative_path):
-    base_dir = Path(__file__).resolve().parent.parent
-    file_path = base_dir / relative_path
+from common.data import load_test_data as _load_test_data
 
-    with open(file_path, encoding="utf-8") as f:
-        return json.load(f)
 
+def load_test_data(relative_path, schema=None):
+    # Paths are relative to the suite folder; loading is shared (common/data.py)
+    return _load_test_data(relative_path, schema, base_dir=Path(__file__).resolve().parent.parent)
@@ -1,9 +1,8 @@
-import json
 from pathlib import Path
 
-def load_test_data(filename="login_errors.json"):
-    # Assuming the JSON file is in the same folder as this script
-    file_path = Path(__file__).parent / filename
-    
-    with open(file_path, encoding="utf-8") as f:
-        return json.load(f)
\ No newline at end of file
+from common.data import load_test_data as _load_test_data
+
+
+def load_test_data(filename="login_errors.json", schema=None):
+    # Data files live next to this script; loading is shared (common/data.py)
+    return _load_test_data(filename, schema, base_dir=Path(__file__).parent)
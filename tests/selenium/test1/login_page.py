@@ -1,22 +1,29 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from common import settings
+from common.forms import fill_form
+from common.login_batch import run_login_batch
 from login_locators import LoginLocators  # Fixed import
 
 class LoginPage:
 
-    URL = "https://www.saucedemo.com/"
-
     def __init__(self, driver):
         self.driver = driver
+        # Read per page: the stand-in's URL is set when its server starts
+        self.URL = settings.BASE_URL
         self.wait = WebDriverWait(driver, 10)
 
     def load(self):
         self.driver.get(self.URL)
 
-    def login(self, username, password):
-        self._type(LoginLocators.USERNAME, username)
-        self._type(LoginLocators.PASSWORD, password)
-        self.driver.find_element(*LoginLocators.LOGIN_BTN).click()
+    def login(self, username, password, mode=None):
+        # One script call by default; mode="keys" types key by key (see common.forms)
+        fill_form(
+            self.driver,
+            [(LoginLocators.USERNAME, username), (LoginLocators.PASSWORD, password)],
+            submit=LoginLocators.LOGIN_BTN,
+            mode=mode,
+        )
 
     def get_error_message(self):
         return self.wait.until(
@@ -29,7 +36,12 @@ class LoginPage:
     def is_error_closed(self):
         return len(self.driver.find_elements(*LoginLocators.ERROR_MSG)) == 0
 
-    def _type(self, locator, value):
-        element = self.driver.find_element(*locator)
-        element.clear()
-        element.send_keys(value)
\ No newline at end of file
+    def run_error_cases(self, cases):
+        """Runs every case in one page load; returns {case: result}"""
+        return run_login_batch(self.driver, self.URL, {
+            "username": LoginLocators.USERNAME,
+            "password": LoginLocators.PASSWORD,
+            "button": LoginLocators.LOGIN_BTN,
+            "error": LoginLocators.ERROR_MSG,
+            "close": LoginLocators.ERROR_CLOSE_BTN,
+        }, cases)
\ No newline at end of file
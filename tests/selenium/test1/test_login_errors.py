@@ -1,15 +1,64 @@
 import pytest
 from login_page import LoginPage  # Fixed import
 from json_reader import load_test_data  # Fixed import
+from common import pagelog, settings
+from common.data import LOGIN_ERROR_SCHEMA
+from common.login_batch import collected_cases
+from common.screenshots import add_captured
 from selenium.common.exceptions import TimeoutException
 
-test_data = load_test_data("login_errors.json")  # Just pass filename since same folder
+test_data = load_test_data("login_errors.json", LOGIN_ERROR_SCHEMA)  # Just pass filename since same folder
+
+
+@pytest.fixture(scope="module")
+def batch_results(request, browser_pool):
+    """Results of every selected case of this module, run in one page load"""
+    driver = browser_pool.acquire()
+    try:
+        return LoginPage(driver).run_error_cases(collected_cases(request, "data"))
+    finally:
+        browser_pool.release(driver)
+
+
+@pytest.fixture
+def case_driver(request):
+    """The test's browser when cases run one by one (SELENIUM_LOGIN_BATCH=0), else None"""
+    # A test argument, so failure capture (common.screenshots.drivers_of) finds it
+    return None if settings.LOGIN_BATCH else request.getfixturevalue("driver")
+
 
 @pytest.mark.parametrize("data", test_data, ids=lambda d: d["case"])
-def test_login_error_messages(driver, data):
+def test_login_error_messages(request, case_driver, data):
+    if settings.LOGIN_BATCH:
+        check_batch_result(request, request.getfixturevalue("batch_results")[data["case"]], data)
+    else:
+        check_in_browser(case_driver, data)
+
+
+def check_batch_result(request, result, data):
+    # The batch browser is not a fixture of this test: report what it captured
+    for name, entries in result.get("artifacts", {}).items():
+        add_captured(request.node, name, entries)
+    pagelog.on_failure("batch result", lambda: {
+        key: value for key, value in result.items() if key != "artifacts"
+    })
+
+    if result["logged_in"]:
+        pytest.fail(f"Test {data['case']} failed: user logged in instead of showing error ({result['url']})")
+    assert result["error"] == data["expected_error"], (
+        f"Test {data['case']} failed: expected error '{data['expected_error']}', got '{result['error']}'"
+        + (f" ({result['problem']})" if result["problem"] else "")
+    )
+    assert result["closed"], (
+        f"Test {data['case']} failed: error '{result['error']}' could not be closed ({result['problem']})"
+    )
+
+
+def check_in_browser(driver, data):
     login = LoginPage(driver)
     login.load()
-    login.login(data["username"], data["password"])
+    # Typed key by key, as before the batch runner
+    login.login(data["username"], data["password"], mode="keys")
 
     try:
         # Try to get the error message
@@ -1,10 +1,17 @@
 """
 Classe de base pour toutes les pages
 """
+import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from common.checkpoint import capture_state, restore_state
+from common.forms import fill_form
+from common.images import shared_checker
+from common.metrics import NAVIGATIONS
+from common.timeouts import TIMEOUTS
+from common.waits import EventWaiter, probe_elements
 from config import Config  # Fixed import
 
 
@@ -14,6 +21,8 @@ class BasePage:
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
+        # Attentes sur événements (DOM, URL, réseau, état d'élément)
+        self.waits = EventWaiter(driver)
     
     def find_element(self, by, value):
         """Trouve un élément avec attente explicite"""
@@ -41,12 +50,45 @@ class BasePage:
             return False
     
     def is_element_present(self, by, value):
-        """Vérifie si un élément est présent dans le DOM"""
-        try:
-            self.driver.find_element(by, value)
-            return True
-        except:
-            return False
+        """Vérifie si un élément est présent dans le DOM (instantané, sans attente)"""
+        return self.count_elements(by, value) > 0
+    
+    def is_element_absent(self, by, value):
+        """Vérifie qu'un élément est absent du DOM (instantané, sans attente)"""
+        return self.count_elements(by, value) == 0
+    
+    def count_elements(self, by, value):
+        """Compte les éléments correspondants dans le DOM actuel"""
+        return probe_elements(self.driver, [(by, value)])[0]['count']
+    
+    def get_text_if_present(self, by, value):
+        """Texte du premier élément correspondant, ou None s'il est absent"""
+        return probe_elements(self.driver, [(by, value)])[0]['text']
+    
+    def probe_elements(self, *locators):
+        """
+        Vérifie plusieurs locators en un seul appel JavaScript
+        Retourne un dict {count, visible, text} par locator
+        """
+        return probe_elements(self.driver, locators)
+    
+    def timed_wait(self, transition, wait, default=None):
+        """
+        Attente mesurée: wait(timeout) reçoit un délai appris des latences
+        observées pour (utilisateur, transition), default tant qu'il n'y en a pas assez
+        """
+        return TIMEOUTS.measure(self.driver, transition, wait, default or Config.EXPLICIT_WAIT)
+    
+    def timed_navigation(self, transition, wait, default=None):
+        """
+        Attente mesurée d'une navigation dans l'application, suivie de la
+        mesure de la page arrivée (métriques de navigation, un seul appel JavaScript)
+        """
+        start = time.monotonic()
+        result = self.timed_wait(transition, wait, default)
+        if result is not False:
+            NAVIGATIONS.record(self.driver, transition, time.monotonic() - start)
+        return result
     
     def get_text(self, by, value):
         """Récupère le texte d'un élément"""
@@ -58,10 +100,45 @@ class BasePage:
         element.clear()
         element.send_keys(text)
     
+    def fill_form(self, fields, submit=None, mode=None):
+        """
+        Remplit un formulaire: fields est une liste de ((by, value), texte), puis
+        clique sur submit s'il est donné. mode: "script" (un seul appel JavaScript),
+        "cdp" (Input.insertText) ou "keys" (frappe touche par touche), défaut
+        settings.INPUT_MODE
+        """
+        fill_form(self.driver, fields, submit, mode, timeout=Config.EXPLICIT_WAIT)
+    
     def get_current_url(self):
         """Récupère l'URL actuelle"""
         return self.driver.current_url
     
-    def navigate_to(self, url):
-        """Navigate vers une URL"""
-        self.driver.get(url)
\ No newline at end of file
+    def navigate_to(self, url, transition="navigate"):
+        """
+        Navigate vers une URL puis mesure le chargement (métriques de navigation)
+        transition=None: pas de mesure, la navigation est mesurée par l'attente qui suit
+        """
+        start = time.monotonic()
+        self.driver.get(url)
+        if transition:
+            NAVIGATIONS.record(self.driver, transition, time.monotonic() - start)
+    
+    def check_images(self, manifest=None):
+        """
+        Vérifie le contenu de toutes les images de la page (téléchargement
+        concurrent + SHA-256 comparé au manifeste de référence)
+        """
+        try:
+            # Laisser les images finir de charger; une image bloquée sera signalée cassée
+            self.waits.network_idle(timeout=5)
+        except TimeoutException:
+            pass
+        return shared_checker().check(self.driver, manifest)
+    
+    def capture_state(self):
+        """Capture l'état du navigateur (cookies, localStorage, sessionStorage, URL)"""
+        return capture_state(self.driver)
+    
+    def restore_state(self, state):
+        """Restaure un état capturé sans rejouer le parcours UI"""
+        restore_state(self.driver, state)
\ No newline at end of file
@@ -1,20 +1,29 @@
 """
 Configuration globale pour les tests SauceDemo
 """
+from common import settings
+
 
 class Config:
     """Configuration centralisée"""
     
-    # URL de base
-    BASE_URL = "https://www.saucedemo.com/"
+    # URL de base (SAUCEDEMO_BASE_URL, ou "local" pour le stand-in hors ligne,
+    # dont l'adresse est fixée au démarrage du serveur: fixture base_url)
+    BASE_URL = settings.BASE_URL
     
     # Timeouts - Augmentés pour plus de stabilité
-    IMPLICIT_WAIT = 10
+    # Politique d'attente: pas d'attente implicite (0), uniquement des attentes
+    # explicites (WebDriverWait, self.waits) et des vérifications instantanées
+    IMPLICIT_WAIT = 0
     EXPLICIT_WAIT = 15
     
     # Credentials
     PASSWORD = "secret_sauce"
     
+    # Connexion des fixtures authentifiées: True = cookie de session (rapide),
+    # False = formulaire. Les tests marqués ui_login utilisent toujours le formulaire
+    FAST_LOGIN = True
+    
     # Utilisateurs disponibles
     USERS = [
         "standard_user",
@@ -30,7 +39,7 @@ class Config:
     FUNCTIONAL_USERS = [
         "standard_user",           # ✅ User stable et fiable
         # "problem_user",          # ⚠️  Images cassées intentionnellement
-        # "performance_glitch_user", # ⏱️ Très lent (délais de 5+ secondes)
+        "performance_glitch_user", # ⏱️ Lent: délais appris (common/timeouts.py)
         # "error_user",            # ⚠️  Comportements erratiques
         # "visual_user"            # ❌ Bugs visuels CSS
     ]
@@ -43,6 +52,21 @@ class Config:
         "visual_user"
     ]
     
+    # Budgets de latence (secondes) de la suite de performance, par utilisateur
+    # et par parcours: connexion, chargement de l'inventaire, ouverture d'un produit
+    PERFORMANCE_BUDGETS = {
+        "standard_user": {
+            "login": {"p50": 2.0, "p95": 4.0, "p99": 5.0},
+            "inventory": {"p50": 2.0, "p95": 4.0, "p99": 5.0},
+            "detail": {"p50": 1.5, "p95": 3.0, "p99": 4.0},
+        },
+        "performance_glitch_user": {
+            "login": {"p50": 7.0, "p95": 9.0, "p99": 10.0},
+            "inventory": {"p50": 7.0, "p95": 9.0, "p99": 10.0},
+            "detail": {"p50": 3.0, "p95": 5.0, "p99": 6.0},
+        },
+    }
+    
     # Produits attendus
     EXPECTED_PRODUCTS = [
         {"name": "Sauce Labs Bike Light", "price": "$9.99"},
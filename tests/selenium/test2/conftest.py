@@ -1,11 +1,19 @@
 import pytest
 import sys
-import os
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from pathlib import Path
 
+# Shared helpers live in tests/selenium/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from common.browser_pool import BrowserPool
+from common.checkpoint import CheckpointCache
+from common.driver_resolver import default_chrome_binary, resolve_chrome
+from common.images import REFERENCE_USER, ImageManifest
+from common.plugin import register as register_plugins
+from common.waits import apply_timing_policy
 from config import Config
 from login_page import LoginPage
 from inventory_page import InventoryPage
@@ -16,23 +24,8 @@ def get_chrome_options():
     """Create Chrome options based on the operating system"""
     options = Options()
     
-    # Set binary location based on OS
-    if sys.platform.startswith('linux'):
-        # Ubuntu/Linux
-        chrome_binary = os.environ.get("CHROME_BINARY", "/usr/bin/chromium-browser")
-        options.binary_location = chrome_binary
-    elif sys.platform.startswith('win32'):
-        # Windows
-        chrome_binary = os.environ.get("CHROME_BINARY", r"C:\Program Files\Google\Chrome\Application\chrome.exe")
-        options.binary_location = chrome_binary
-    elif sys.platform.startswith('win32'):
-        # Windows
-        chrome_binary = os.environ.get("CHROME_BINARY", r"C:\Program Files\Google\Chrome\Application\chrome.exe")
-        options.binary_location = chrome_binary
-    elif sys.platform.startswith('darwin'):
-        # macOS
-        chrome_binary = os.environ.get("CHROME_BINARY", "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
-        options.binary_location = chrome_binary
+    # Binary location based on OS (Linux, Windows, macOS), CHROME_BINARY overrides it
+    options.binary_location = default_chrome_binary()
     
     # Common options for all platforms
     options.add_argument("--headless=new")
@@ -45,23 +38,77 @@ def get_chrome_options():
     return options
 
 
-@pytest.fixture(scope="function")
-def driver():
-    """Cross-platform WebDriver fixture"""
+def pytest_configure(config):
+    register_plugins(config)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def base_url(saucedemo):
+    """Config.BASE_URL of the run: the stand-in's port is known once its server listens"""
+    Config.BASE_URL = saucedemo
+    return saucedemo
+
+
+def start_driver():
+    """Start a new cross-platform Chrome session"""
     options = get_chrome_options()
     
-    try:
-        # Try using webdriver-manager to automatically handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-    except Exception:
-        # Fallback: try without explicit service
-        driver = webdriver.Chrome(options=options)
-    
-    driver.implicitly_wait(5)
+    # Chromedriver resolved once per browser version and cached on disk
+    chrome = resolve_chrome(options.binary_location)
+    driver = webdriver.Chrome(service=Service(chrome.driver_path), options=options)
     
+    # Implicit wait disabled: only explicit waits (see common/waits.py)
+    return apply_timing_policy(driver)
+
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    """Chrome sessions reused across tests, reset between them"""
+    pool = BrowserPool(start_driver)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def driver(browser_pool):
+    """Cross-platform WebDriver fixture"""
+    driver = browser_pool.acquire()
     yield driver
-    driver.quit()
+    browser_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def checkpoints():
+    """Named browser states shared by the tests of this process"""
+    return CheckpointCache()
+
+
+@pytest.fixture
+def checkpoint(driver, checkpoints):
+    """
+    checkpoint(key, build): restores the state saved under key, or runs
+    build() and saves the state it leaves (cookies, storage, URL)
+    """
+    def _checkpoint(key, build):
+        return checkpoints.restore_or_build(driver, key, build)
+    return _checkpoint
+
+
+@pytest.fixture(scope="session")
+def image_manifest(browser_pool):
+    """Reference image hashes, recorded once with standard_user and cached on disk"""
+    manifest = ImageManifest()
+    if not manifest:
+        driver = browser_pool.acquire()
+        try:
+            LoginPage(driver).login_with_session(REFERENCE_USER)
+            inventory = InventoryPage(driver)
+            inventory.get_all_products()
+            manifest.record(inventory.check_images())
+            manifest.save()
+        finally:
+            browser_pool.release(driver)
+    return manifest
 
 
 @pytest.fixture
@@ -79,19 +126,27 @@ def product_detail_page(driver):
     return ProductDetailPage(driver)
 
 
+def log_in(login_page, username, request):
+    """Session cookie login, unless the test checks the form (ui_login marker)"""
+    if Config.FAST_LOGIN and request.node.get_closest_marker("ui_login") is None:
+        login_page.login_with_session(username)
+        # Not a form login: keep it out of the learned "login" deadline
+        assert login_page.is_login_successful(timeout=Config.EXPLICIT_WAIT)
+    else:
+        login_page.navigate()
+        login_page.login(username)
+        assert login_page.is_login_successful()
+
+
 @pytest.fixture
-def authenticated_user(driver, login_page):
-    login_page.navigate()
-    login_page.login("standard_user")
-    assert login_page.is_login_successful()
+def authenticated_user(driver, login_page, request):
+    log_in(login_page, "standard_user", request)
     return driver
 
 
 @pytest.fixture
-def authenticated_user_factory(driver, login_page):
+def authenticated_user_factory(driver, login_page, request):
     def _login(username):
-        login_page.navigate()
-        login_page.login(username)
-        assert login_page.is_login_successful()
+        log_in(login_page, username, request)
         return driver
     return _login
\ No newline at end of file
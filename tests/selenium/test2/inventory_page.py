@@ -6,8 +6,13 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from base_page import BasePage  # Fixed import
+from common import pagelog
+from common.inventory import take_snapshot
 from typing import List, Dict
-import time
+from urllib.parse import urljoin
+from config import Config  # Fixed import
+
+log = pagelog.get("inventory")
 
 
 class InventoryPage(BasePage):
@@ -24,6 +29,10 @@ class InventoryPage(BasePage):
     SHOPPING_CART_LINK = (By.CLASS_NAME, "shopping_cart_link")
     PRODUCT_SORT_CONTAINER = (By.CLASS_NAME, "product_sort_container")
     
+    def __init__(self, driver):
+        super().__init__(driver)
+        self._snapshot = None
+    
     def is_on_inventory_page(self):
         """Vérifie qu'on est sur la page inventaire"""
         return "/inventory.html" in self.get_current_url()
@@ -32,34 +41,35 @@ class InventoryPage(BasePage):
         """
         Récupère tous les produits avec leurs informations
         Méthode robuste avec attentes explicites
+        
+        Un seul appel JavaScript lit tout l'inventaire (nom, prix, description,
+        src et taille naturelle de l'image, id et état du bouton, id produit).
+        Les WebElements ('element', 'image', 'add_button', 'name_link') ne sont
+        recherchés que si le test y accède.
+        """
+        return list(self.snapshot())
+    
+    def snapshot(self, refresh=False):
         """
-        products = []
+        Instantané de l'inventaire indexé par nom (by_name) et par id (by_id)
+        Réutilisé tant que l'URL, le tri et le DOM n'ont pas changé
+        """
+        if not refresh and self._snapshot is not None and self._snapshot.is_current():
+            return self._snapshot
         
-        # Attendre que les produits soient chargés
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_all_elements_located(self.INVENTORY_ITEMS)
+        # Attendre que les produits soient chargés (délai appris par utilisateur)
+        self.timed_wait(
+            "inventory",
+            lambda timeout: WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_all_elements_located(self.INVENTORY_ITEMS)
+            ),
+            default=10,
         )
-        time.sleep(0.5)
-        
-        items = self.driver.find_elements(*self.INVENTORY_ITEMS)
-        
-        for item in items:
-            try:
-                product = {
-                    'name': item.find_element(By.CLASS_NAME, "inventory_item_name").text,
-                    'price': item.find_element(By.CLASS_NAME, "inventory_item_price").text,
-                    'description': item.find_element(By.CLASS_NAME, "inventory_item_desc").text,
-                    'image': item.find_element(By.CSS_SELECTOR, ".inventory_item_img img"),
-                    'add_button': item.find_element(By.CSS_SELECTOR, "button[id^='add-to-cart']"),
-                    'name_link': item.find_element(By.CLASS_NAME, "inventory_item_name"),
-                    'element': item
-                }
-                products.append(product)
-            except Exception as e:
-                print(f"⚠️  Erreur lors de la récupération d'un produit: {e}")
-                continue
+        # Attendre que le rendu soit stable (plus de mutation du DOM)
+        self.waits.dom_quiet()
         
-        return products
+        self._snapshot = take_snapshot(self.driver)
+        return self._snapshot
     
     def get_product_count(self) -> int:
         """Retourne le nombre total de produits"""
@@ -67,22 +77,36 @@ class InventoryPage(BasePage):
     
     def get_product_by_name(self, product_name: str) -> Dict:
         """Récupère un produit spécifique par son nom"""
-        products = self.get_all_products()
-        for product in products:
-            if product['name'] == product_name:
-                return product
-        return None
+        return self.snapshot().by_name.get(product_name)
+    
+    def get_product_by_id(self, item_id: int) -> Dict:
+        """Récupère un produit par son id (inventory-item.html?id=N)"""
+        return self.snapshot().by_id.get(item_id)
     
     def verify_product_exists(self, product_name: str, expected_price: str) -> bool:
         """Vérifie qu'un produit spécifique existe avec son prix"""
-        products = self.get_all_products()
-        for product in products:
-            if product['name'] == product_name and product['price'] == expected_price:
-                return True
-        return False
+        product = self.get_product_by_name(product_name)
+        return product is not None and product['price'] == expected_price
+    
+    def verify_expected_products(self, expected_products: List[Dict]) -> List[Dict]:
+        """
+        Compare le catalogue attendu à l'inventaire en une seule extraction
+        Retourne les produits attendus absents (nom + prix), liste vide si tout est là
+        """
+        actual = {(product['name'], product['price']) for product in self.snapshot()}
+        missing = {(p['name'], p['price']) for p in expected_products} - actual
+        return [p for p in expected_products if (p['name'], p['price']) in missing]
+    
+    def verify_all_product_elements(self) -> Dict[str, Dict]:
+        """
+        Vérifie les éléments de tous les produits en un seul appel JavaScript
+        Retourne un tableau {nom du produit: résultats}: image visible, src et
+        taille naturelle, bouton présent, activé et cliquable, nom cliquable
+        """
+        return self.snapshot().health()
     
     def verify_product_elements(self, product: Dict) -> Dict[str, bool]:
-        """Vérifie tous les éléments d'un produit"""
+        """Vérifie tous les éléments d'un produit (ligne du tableau de verify_all_product_elements)"""
         results = {
             'has_visible_image': False,
             'has_add_button': False,
@@ -92,157 +116,72 @@ class InventoryPage(BasePage):
         }
         
         try:
-            # Vérifier l'image
-            img = product['image']
-            try:
-                results['has_visible_image'] = img.is_displayed()
-            except:
-                results['has_visible_image'] = False
-            
-            try:
-                src = img.get_attribute('src')
-                results['image_has_src'] = bool(src) and src != ''
-            except:
-                results['image_has_src'] = False
-            
-            # Vérifier le bouton Add to cart
-            try:
-                btn = product['add_button']
-                results['has_add_button'] = btn.is_displayed()
-                results['button_is_enabled'] = btn.is_enabled()
-            except:
-                pass
-            
-            # Vérifier le nom cliquable
-            try:
-                name_link = product['name_link']
-                results['has_clickable_name'] = name_link.is_displayed() and name_link.is_enabled()
-            except:
-                pass
-            
+            results.update(self.verify_all_product_elements().get(product['name'], {}))
         except Exception as e:
-            print(f"⚠️  Erreur lors de la vérification du produit {product.get('name', 'Unknown')}: {e}")
+            log.warning("Erreur lors de la vérification du produit %s: %s", product.get('name', 'Unknown'), e)
         
         return results
     
-    def click_product_by_name(self, product_name: str):
+    def open_product_by_name(self, product_name: str, click_through: bool = False):
         """
-        Clique sur un produit par son nom
-        SauceDemo utilise JavaScript, tous les liens ont href="#"
+        Ouvre la page de détails d'un produit en une seule étape
+        Par défaut: navigation directe vers inventory-item.html?id=N (id lu dans l'instantané)
+        click_through=True: clic sur le nom du produit, pour tester le lien lui-même
         """
-        print(f"\n🔍 Recherche du produit: '{product_name}'")
+        product = self.get_product_by_name(product_name)
+        if product is None:
+            raise Exception(f"❌ Produit non trouvé: {product_name}")
         
-        # Attendre le chargement
-        time.sleep(1)
+        item_id = product['item_id']
+        if click_through or item_id is None:
+            # SauceDemo utilise JavaScript, tous les liens ont href="#"
+            self.driver.execute_script(
+                "arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();",
+                product['name_link']
+            )
+        else:
+            # Mesurée par l'attente de l'URL ci-dessous
+            self.navigate_to(urljoin(Config.BASE_URL, f"inventory-item.html?id={item_id}"), transition=None)
         
-        # Trouver tous les produits
-        products = self.get_all_products()
-        
-        for product in products:
-            if product['name'] == product_name:
-                print(f"✓ Produit trouvé: {product_name}")
-                
-                # Trouver l'élément du produit
-                item_element = product['element']
-                
-                # STRATÉGIE 1: Cliquer sur le lien de l'image avec JavaScript
-                try:
-                    image_link = item_element.find_element(By.CSS_SELECTOR, "a[id*='img']")
-                    print(f"  - Lien image trouvé: {image_link.get_attribute('id')}")
-                    
-                    # Scroll
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", image_link)
-                    time.sleep(0.5)
-                    
-                    # Forcer le clic avec JavaScript
-                    self.driver.execute_script("arguments[0].click();", image_link)
-                    time.sleep(2)  # Attendre plus longtemps
-                    
-                    print(f"✓ URL après clic JS: {self.driver.current_url}")
-                    
-                    if "inventory-item.html" in self.driver.current_url or "?id=" in self.driver.current_url:
-                        print(f"✅ Navigation réussie!")
-                        return
-                        
-                except Exception as e1:
-                    print(f"⚠️  Stratégie 1 échouée: {e1}")
-                
-                # STRATÉGIE 2: Cliquer sur le nom du produit avec JavaScript
-                try:
-                    name_link = product['name_link']
-                    
-                    # Trouver le lien parent <a>
-                    parent_a = name_link.find_element(By.XPATH, "./parent::a")
-                    print(f"  - Lien nom trouvé: {parent_a.get_attribute('id')}")
-                    
-                    # Scroll
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", parent_a)
-                    time.sleep(0.5)
-                    
-                    # Clic JavaScript
-                    self.driver.execute_script("arguments[0].click();", parent_a)
-                    time.sleep(2)
-                    
-                    print(f"✓ URL après clic nom: {self.driver.current_url}")
-                    
-                    if "inventory-item.html" in self.driver.current_url or "?id=" in self.driver.current_url:
-                        print(f"✅ Navigation réussie (via nom)!")
-                        return
-                        
-                except Exception as e2:
-                    print(f"⚠️  Stratégie 2 échouée: {e2}")
-                
-                # STRATÉGIE 3: Navigation directe via URL
-                try:
-                    # Extraire l'ID du produit depuis l'attribut data ou construire l'URL
-                    print(f"  - Tentative navigation directe...")
-                    
-                    # Trouver l'ID dans l'un des liens
-                    all_links = item_element.find_elements(By.TAG_NAME, "a")
-                    for link in all_links:
-                        link_id = link.get_attribute('id')
-                        if 'title_link' in link_id or 'img' in link_id:
-                            # Extraire le numéro d'item (ex: item_4_title_link → 4)
-                            import re
-                            match = re.search(r'item_(\d+)_', link_id)
-                            if match:
-                                item_id = match.group(1)
-                                detail_url = f"https://www.saucedemo.com/inventory-item.html?id={item_id}"
-                                print(f"  - Navigation directe vers: {detail_url}")
-                                self.driver.get(detail_url)
-                                time.sleep(2)
-                                print(f"✅ Navigation directe réussie!")
-                                return
-                                
-                except Exception as e3:
-                    print(f"⚠️  Stratégie 3 échouée: {e3}")
-        
-        # Si rien n'a fonctionné
-        raise Exception(f"❌ Impossible de naviguer vers: {product_name}")
+        # Arrivée confirmée par l'événement de changement d'URL
+        url = self.wait_for_detail_url(item_id)
+        log.info("%s ouvert: %s", product_name, url)
+    
+    def click_product_by_name(self, product_name: str):
+        """Clique sur un produit par son nom (vérifie le lien du catalogue)"""
+        self.open_product_by_name(product_name, click_through=True)
+    
+    def wait_for_detail_url(self, item_id=None):
+        """Attend l'ouverture de la page de détails (du produit item_id si fourni)"""
+        fragment = "inventory-item.html" if item_id is None else f"inventory-item.html?id={item_id}"
+        return self.timed_navigation(
+            "open_detail",
+            lambda timeout: self.waits.url_change(contains=fragment, timeout=timeout),
+            default=5,
+        )
     
     def add_product_to_cart_by_name(self, product_name: str):
         """Ajoute un produit au panier par son nom"""
-        products = self.get_all_products()
-        for product in products:
-            if product['name'] == product_name:
-                try:
-                    btn = product['add_button']
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                    time.sleep(0.3)
-                    btn.click()
-                    return
-                except:
-                    self.driver.execute_script("arguments[0].click();", btn)
-                    return
+        product = self.get_product_by_name(product_name)
+        if product is not None:
+            btn = product['add_button']
+            try:
+                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
+                btn.click()
+            except:
+                self.driver.execute_script("arguments[0].click();", btn)
+            # Le clic modifie le DOM: l'instantané sera relu au prochain accès
+            return
         
         raise Exception(f"❌ Produit non trouvé: {product_name}")
     
     def get_cart_item_count(self) -> int:
         """Récupère le nombre d'articles dans le panier"""
+        # Pas de badge = panier vide: vérification instantanée, sans attente
+        badge_text = self.get_text_if_present(*self.SHOPPING_CART_BADGE)
         try:
-            badge_text = self.get_text(*self.SHOPPING_CART_BADGE)
             return int(badge_text)
-        except:
+        except (TypeError, ValueError):
             return 0
     
     def open_shopping_cart(self):
@@ -3,10 +3,15 @@ Tests pour la vérification des produits SauceDemo
 Test Selenium 2: Navigation et vérification des produits
 """
 
+import logging
 import pytest
-import time
 from selenium.webdriver.common.by import By
 from config import Config  # Fixed import
+from common import pagelog
+from common.images import problems
+from common.waits import EventWaiter
+
+log = pagelog.get("tests.products")
 
 
 class TestProductVerification:
@@ -19,31 +24,26 @@ class TestProductVerification:
         """
         
         for username in Config.USERS:
-            print(f"\n{'='*60}")
-            print(f"Test de connexion pour: {username}")
-            print(f"{'='*60}")
+            log.info("Test de connexion pour: %s", username)
             
             login_page.navigate()
-            time.sleep(0.5)  # Attendre le chargement de la page
             login_page.login(username)
             
             if username == "locked_out_user":
                 # Cet utilisateur ne peut pas se connecter
-                time.sleep(1)  # Attendre le message d'erreur
                 assert login_page.is_error_displayed(), \
                     f"Message d'erreur attendu pour {username}"
-                error = login_page.get_error_message()
-                print(f"✓ {username}: Bloqué comme prévu")
-                print(f"  Message: {error}")
+                log.info("%s: bloqué comme prévu", username)
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Message: %s", login_page.get_error_message())
             else:
                 # Tous les autres devraient pouvoir se connecter
-                # Note: Augmentation du timeout pour performance_glitch_user
-                is_successful = login_page.is_login_successful(timeout=10)
+                # Délai appris par utilisateur (performance_glitch_user inclus)
+                is_successful = login_page.is_login_successful()
                 assert is_successful, \
                     f"Connexion échouée pour {username}"
-                print(f"✓ {username}: Connexion réussie")
+                log.info("%s: connexion réussie", username)
                 driver.back()
-                time.sleep(0.5)
     
     @pytest.mark.parametrize("username", Config.FUNCTIONAL_USERS)
     def test_complete_product_verification(self, driver, login_page, inventory_page, 
@@ -61,42 +61,36 @@ class TestProductVerification:
         7. Vérifier le nombre total de produits (6)
         """
         
-        print(f"\n{'='*70}")
-        print(f"TEST COMPLET POUR L'UTILISATEUR: {username}")
-        print(f"{'='*70}")
+        log.info("Test complet pour l'utilisateur: %s", username)
         
         # ===== STEP 1: Se connecter =====
-        print(f"\n--- STEP 1: Connexion ---")
+        log.info("STEP 1: Connexion")
         login_page.navigate()
-        time.sleep(0.5)
         login_page.login(username)
         
-        # Timeout augmenté pour performance_glitch_user
-        timeout = 15 if username == "performance_glitch_user" else 10
-        assert login_page.is_login_successful(timeout=timeout), \
+        assert login_page.is_login_successful(), \
             f"Connexion échouée pour {username}"
-        print(f"✓ Connexion réussie pour {username}")
+        log.info("Connexion réussie pour %s", username)
         
-        time.sleep(1)  # Attendre le chargement complet de la page
+        inventory_page.waits.dom_quiet()  # Attendre que la liste soit rendue
         
         # ===== STEP 2: Vérifier tous les produits =====
-        print(f"\n--- STEP 2: Vérification de la présence de tous les produits ---")
-        for expected_product in Config.EXPECTED_PRODUCTS:
-            exists = inventory_page.verify_product_exists(
-                expected_product['name'], 
-                expected_product['price']
-            )
-            assert exists, \
-                f"Produit manquant: {expected_product['name']} - {expected_product['price']}"
-            print(f"✓ {expected_product['name']} - {expected_product['price']}")
+        log.info("STEP 2: Vérification de la présence de tous les produits")
+        # Une seule extraction, comparée au catalogue attendu
+        missing = inventory_page.verify_expected_products(Config.EXPECTED_PRODUCTS)
+        assert not missing, \
+            "Produits manquants: " + ", ".join(f"{p['name']} - {p['price']}" for p in missing)
+        log.info("%d produits attendus présents", len(Config.EXPECTED_PRODUCTS))
         
         # ===== STEP 3: Vérifier les éléments de chaque produit =====
-        print(f"\n--- STEP 3: Vérification des éléments de chaque produit ---")
+        log.info("STEP 3: Vérification des éléments de chaque produit")
         all_products = inventory_page.get_all_products()
+        # Tableau des vérifications de tous les produits (un seul appel JavaScript)
+        health = inventory_page.verify_all_product_elements()
         
         for idx, product in enumerate(all_products, 1):
-            print(f"\nProduit {idx}/{len(all_products)}: {product['name']}")
-            verification = inventory_page.verify_product_elements(product)
+            log.debug("Produit %d/%d: %s", idx, len(all_products), product['name'])
+            verification = health[product['name']]
             
             # Vérification de l'image - Tolérant pour problem_user et visual_user
             if username not in ["problem_user", "visual_user"]:
@@ -104,69 +98,54 @@ class TestProductVerification:
                     f"Image non visible pour {product['name']}"
                 assert verification['image_has_src'], \
                     f"Image sans src pour {product['name']}"
-                print(f"  ✓ Image visible avec src")
             else:
-                print(f"  ⚠️  Images peuvent être cassées (user avec bugs)")
+                log.debug("Images peuvent être cassées (user avec bugs)")
             
             # Vérification du bouton Add to cart
             assert verification['has_add_button'], \
                 f"Bouton 'Add to cart' non visible pour {product['name']}"
             assert verification['button_is_enabled'], \
                 f"Bouton 'Add to cart' non activé pour {product['name']}"
-            print(f"  ✓ Bouton 'Add to cart' présent et activé")
             
             # Vérification du nom cliquable
             assert verification['has_clickable_name'], \
                 f"Nom non cliquable pour {product['name']}"
-            print(f"  ✓ Nom de produit cliquable")
         
         # ===== STEP 4: Cliquer sur "Sauce Labs Backpack" =====
-        print(f"\n--- STEP 4: Navigation vers 'Sauce Labs Backpack' ---")
-        inventory_page.click_product_by_name("Sauce Labs Backpack")
-        time.sleep(2)  # Attendre la navigation
-        print(f"✓ Clic effectué sur 'Sauce Labs Backpack'")
+        log.info("STEP 4: Navigation vers 'Sauce Labs Backpack'")
+        inventory_page.click_product_by_name("Sauce Labs Backpack")  # Teste le lien du catalogue
         
         # ===== STEP 5: Vérifier la page de détails =====
-        print(f"\n--- STEP 5: Vérification de la page de détails ---")
+        log.info("STEP 5: Vérification de la page de détails")
         assert product_detail_page.is_on_detail_page(), \
             "Pas sur la page de détails du produit"
-        print(f"✓ Sur la page de détails du produit")
         
         detail_name = product_detail_page.get_product_name()
         detail_price = product_detail_page.get_product_price()
         
         assert detail_name == "Sauce Labs Backpack", \
             f"Nom incorrect: attendu 'Sauce Labs Backpack', obtenu '{detail_name}'"
-        print(f"✓ Nom du produit correct: {detail_name}")
         
         assert detail_price == "$29.99", \
             f"Prix incorrect: attendu '$29.99', obtenu '{detail_price}'"
-        print(f"✓ Prix du produit correct: {detail_price}")
         
         assert product_detail_page.is_product_image_visible(), \
             "Image du produit non visible"
-        print(f"✓ Image du produit visible")
         
         # ===== STEP 6: Retourner à la liste des produits =====
-        print(f"\n--- STEP 6: Retour à la liste des produits ---")
+        log.info("STEP 6: Retour à la liste des produits")
         product_detail_page.back_to_products()
-        time.sleep(1)  # Attendre le retour
         
         assert inventory_page.is_on_inventory_page(), \
             "Pas revenu à la page inventaire"
-        print(f"✓ Retour réussi à la liste des produits")
         
         # ===== STEP 7: Vérifier le nombre total de produits =====
-        print(f"\n--- STEP 7: Vérification du nombre total de produits ---")
+        log.info("STEP 7: Vérification du nombre total de produits")
         product_count = inventory_page.get_product_count()
         
         assert product_count == 6, \
             f"Nombre de produits incorrect: {product_count} (attendu: 6)"
-        print(f"✓ Nombre total de produits: {product_count} ✓")
-        
-        print(f"\n{'='*70}")
-        print(f"✅ TOUS LES TESTS RÉUSSIS POUR {username}")
-        print(f"{'='*70}\n")
+        log.info("Tous les tests réussis pour %s", username)
 
 
 class TestProductElements:
@@ -177,33 +156,110 @@ class TestProductElements:
     
     def test_all_products_have_images(self, authenticated_user, inventory_page):
         """Vérifie que tous les produits ont des images visibles"""
-        products = inventory_page.get_all_products()
+        health = inventory_page.verify_all_product_elements()
         
-        for product in products:
-            assert product['image'].is_displayed(), \
-                f"Image non visible pour {product['name']}"
-            assert product['image'].get_attribute('src'), \
-                f"Image sans src pour {product['name']}"
+        for name, result in health.items():
+            assert result['has_visible_image'], \
+                f"Image non visible pour {name}"
+            assert result['image_has_src'], \
+                f"Image sans src pour {name}"
     
     def test_all_products_have_add_to_cart_button(self, authenticated_user, inventory_page):
         """Vérifie que tous les produits ont un bouton Add to cart"""
-        products = inventory_page.get_all_products()
+        health = inventory_page.verify_all_product_elements()
         
-        for product in products:
-            assert product['add_button'].is_displayed(), \
-                f"Bouton non visible pour {product['name']}"
-            assert product['add_button'].is_enabled(), \
-                f"Bouton non activé pour {product['name']}"
+        for name, result in health.items():
+            assert result['has_add_button'], \
+                f"Bouton non visible pour {name}"
+            assert result['button_is_enabled'], \
+                f"Bouton non activé pour {name}"
     
     def test_all_products_have_clickable_names(self, authenticated_user, inventory_page):
         """Vérifie que tous les produits ont des noms cliquables"""
-        products = inventory_page.get_all_products()
+        health = inventory_page.verify_all_product_elements()
         
-        for product in products:
-            assert product['name_link'].is_displayed(), \
-                f"Nom non visible pour {product['name']}"
-            assert product['name_link'].is_enabled(), \
-                f"Nom non cliquable pour {product['name']}"
+        for name, result in health.items():
+            assert result['has_clickable_name'], \
+                f"Nom non cliquable pour {name}"
+
+
+class TestProductImages:
+    """
+    Intégrité des images: contenu téléchargé et comparé aux images de
+    référence enregistrées avec standard_user
+    """
+    
+    def test_inventory_images_match_reference(self, authenticated_user, inventory_page, image_manifest):
+        """Toutes les images du catalogue sont intactes et correspondent à leur produit"""
+        inventory_page.get_all_products()
+        results = inventory_page.check_images(image_manifest)
+        
+        assert results, "Aucune image trouvée"
+        assert not problems(results), "\n".join(problems(results))
+    
+    def test_problem_user_wrong_images_detected(self, authenticated_user_factory, inventory_page,
+                                                image_manifest):
+        """problem_user reçoit de mauvaises images: la vérification doit les signaler"""
+        authenticated_user_factory("problem_user")
+        inventory_page.get_all_products()
+        results = [r for r in inventory_page.check_images(image_manifest) if r.product]
+        
+        assert any(not r.ok for r in results), \
+            "Images de problem_user identiques à la référence"
+
+
+class TestSlowConditions:
+    """
+    Profils du stand-in hors ligne (SAUCEDEMO_BASE_URL=local): délais et
+    pannes reproductibles. Ignorés sur le site public
+    """
+    
+    @pytest.mark.standin_profile("slow-network")
+    def test_inventory_under_slow_network(self, authenticated_user, inventory_page):
+        """Le catalogue complet est lu malgré des délais variables sur chaque page"""
+        missing = inventory_page.verify_expected_products(Config.EXPECTED_PRODUCTS)
+        
+        assert not missing, f"Produits manquants: {missing}"
+    
+    @pytest.mark.standin_profile("broken-assets")
+    def test_failed_images_detected(self, authenticated_user, inventory_page):
+        """Les images refusées par le serveur sont signalées comme cassées"""
+        inventory_page.get_all_products()
+        results = [r for r in inventory_page.check_images() if r.product]
+        
+        assert any(r.broken for r in results), "Aucune image cassée détectée"
+
+
+class TestCart:
+    """
+    Panier de standard_user: le premier test le remplit par l'interface, les
+    suivants restaurent le checkpoint (cookies, localStorage) sans rejouer les clics
+    """
+    
+    CART = ["Sauce Labs Backpack", "Sauce Labs Bike Light"]
+    
+    @pytest.fixture
+    def filled_cart(self, authenticated_user, inventory_page, checkpoint):
+        def build():
+            for name in self.CART:
+                inventory_page.add_product_to_cart_by_name(name)
+        
+        checkpoint("standard_user/cart", build)
+        return self.CART
+    
+    def test_cart_badge_counts_products(self, filled_cart, inventory_page):
+        """Le badge du panier compte les produits ajoutés"""
+        assert inventory_page.is_on_inventory_page()
+        inventory_page.get_all_products()
+        
+        assert inventory_page.get_cart_item_count() == len(filled_cart)
+    
+    def test_cart_product_detail_offers_remove(self, filled_cart, inventory_page, product_detail_page):
+        """La page de détail d'un produit du panier propose de le retirer"""
+        inventory_page.open_product_by_name(filled_cart[0])
+        
+        assert product_detail_page.is_on_detail_page()
+        assert product_detail_page.is_added_to_cart()
 
 
 class TestProductNavigation:
@@ -218,9 +274,8 @@ class TestProductNavigation:
                                       product_detail_page, product_name, expected_price):
         """Teste la navigation vers les détails de différents produits"""
         
-        # Naviguer vers le produit
-        inventory_page.click_product_by_name(product_name)
-        time.sleep(1)
+        # Naviguer vers le produit (URL directe via l'id du produit)
+        inventory_page.open_product_by_name(product_name)
         
         # Vérifier la page de détails
         assert product_detail_page.is_on_detail_page()
@@ -229,7 +284,6 @@ class TestProductNavigation:
         
         # Retourner à l'inventaire
         product_detail_page.back_to_products()
-        time.sleep(0.5)
         assert inventory_page.is_on_inventory_page()
 
 
@@ -237,52 +291,54 @@ class TestProductNavigation:
 # TEST TEMPORAIRE DE DEBUG - À SUPPRIMER APRÈS
 # ============================================================
 def test_debug_product_structure(authenticated_user):
-    """Test de debug pour comprendre la structure HTML"""
+    """
+    Test de debug pour comprendre la structure HTML
+    Lancer avec SELENIUM_LOG_LEVEL=DEBUG SELENIUM_LOG_ALL=1 pour voir l'analyse
+    """
     driver = authenticated_user
     
-    # Attendre le chargement
-    time.sleep(2)
+    # Attendre que le DOM soit stable
+    EventWaiter(driver).dom_quiet()
     
     # Trouver tous les items
     items = driver.find_elements(By.CLASS_NAME, "inventory_item")
-    print(f"\n📦 Nombre de produits trouvés: {len(items)}")
+    log.info("Nombre de produits trouvés: %d", len(items))
     
-    # Analyser le premier produit
-    if items:
+    # Analyser le premier produit (appels au navigateur seulement en DEBUG)
+    if items and log.isEnabledFor(logging.DEBUG):
         first_item = items[0]
-        print(f"\n🔍 Structure HTML du premier produit:")
-        print(first_item.get_attribute('outerHTML')[:800])
+        log.debug("Structure HTML du premier produit: %s", first_item.get_attribute('outerHTML')[:800])
         
         # Chercher le nom avec espace
         try:
             name_with_space = first_item.find_element(By.CSS_SELECTOR, ".inventory_item_name ")
-            print(f"\n✓ Classe avec espace trouvée: '{name_with_space.text}'")
+            log.debug("Classe avec espace trouvée: '%s'", name_with_space.text)
         except:
-            print(f"\n❌ Classe avec espace NON trouvée")
+            log.debug("Classe avec espace NON trouvée")
         
         # Chercher le nom sans espace
         try:
             name_without_space = first_item.find_element(By.CSS_SELECTOR, ".inventory_item_name")
-            print(f"✓ Classe sans espace trouvée: '{name_without_space.text}'")
+            log.debug("Classe sans espace trouvée: '%s'", name_without_space.text)
         except:
-            print(f"❌ Classe sans espace NON trouvée")
+            log.debug("Classe sans espace NON trouvée")
         
         # Chercher les liens
         try:
             links = first_item.find_elements(By.TAG_NAME, "a")
-            print(f"\n🔗 Liens trouvés dans le produit: {len(links)}")
+            log.debug("Liens trouvés dans le produit: %d", len(links))
             for idx, link in enumerate(links):
-                print(f"  Lien {idx+1}:")
-                print(f"    - id: {link.get_attribute('id')}")
-                print(f"    - href: {link.get_attribute('href')}")
-                print(f"    - class: {link.get_attribute('class')}")
+                log.debug(
+                    "Lien %d: id=%s href=%s class=%s",
+                    idx + 1, link.get_attribute('id'), link.get_attribute('href'), link.get_attribute('class'),
+                )
                 try:
                     inner_text = link.find_element(By.CSS_SELECTOR, "div").text
-                    print(f"    - texte intérieur: {inner_text}")
+                    log.debug("  texte intérieur: %s", inner_text)
                 except:
-                    print(f"    - texte: {link.text}")
+                    log.debug("  texte: %s", link.text)
         except Exception as e:
-            print(f"❌ Erreur lors de la recherche des liens: {e}")
+            log.debug("Erreur lors de la recherche des liens: %s", e)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Shared helpers live in tests/selenium/common
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
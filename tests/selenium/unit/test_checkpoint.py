@@ -0,0 +1,132 @@
+"""Offline tests of the checkpoint cache and state restore"""
+import time
+
+from common.checkpoint import BrowserState, CheckpointCache, cdp_cookie, restore_state
+
+
+def state(url="https://www.saucedemo.com/inventory.html", age=0):
+    return BrowserState(url=url, captured_at=time.time() - age)
+
+
+def test_get_returns_what_was_put():
+    cache = CheckpointCache(max_entries=2, max_age=60)
+    saved = state()
+    cache.put("standard_user/cart", saved)
+    assert cache.get("standard_user/cart") is saved
+    assert cache.get("problem_user/cart") is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = CheckpointCache(max_entries=2, max_age=60)
+    cache.put("a", state())
+    cache.put("b", state())
+    cache.get("a")
+    cache.put("c", state())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+
+
+def test_old_entries_expire():
+    cache = CheckpointCache(max_entries=2, max_age=60)
+    cache.put("a", state(age=61))
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_discard():
+    cache = CheckpointCache(max_entries=2, max_age=60)
+    cache.put("a", state())
+    cache.discard("a")
+    cache.discard("missing")
+    assert cache.get("a") is None
+
+
+def test_origin():
+    assert state("https://www.saucedemo.com/cart.html?x=1").origin == "https://www.saucedemo.com"
+
+
+class Session:
+    """Records the commands a WebDriver session receives"""
+
+    def __init__(self, current_url="about:blank"):
+        self.current_url = current_url
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def add_cookie(self, cookie):
+        self.calls.append(("add_cookie", cookie["name"]))
+
+    def execute_script(self, script, *args):
+        self.calls.append(("execute_script", args))
+
+
+class CdpSession(Session):
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append((command, params))
+        if command == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": "7"}
+        return {}
+
+
+CART_STATE = BrowserState(
+    url="https://www.saucedemo.com/inventory.html",
+    cookies=[
+        {"name": "session-username", "value": "standard_user", "path": "/", "domain": "www.saucedemo.com",
+         "secure": False, "httpOnly": False, "sameSite": "Lax", "expiry": 1900000000},
+        {"name": "token", "value": "x", "path": "/", "httpOnly": True},
+    ],
+    local_storage={"cart-contents": "[4,0]"},
+)
+
+
+def test_cdp_cookie_keeps_domain_flags_and_same_site():
+    url = CART_STATE.url
+    assert cdp_cookie(CART_STATE.cookies[0], url) == {
+        "name": "session-username", "value": "standard_user", "path": "/", "domain": "www.saucedemo.com",
+        "secure": False, "httpOnly": False, "sameSite": "Lax", "expires": 1900000000,
+    }
+    assert cdp_cookie(CART_STATE.cookies[1], url) == {
+        "name": "token", "value": "x", "path": "/", "httpOnly": True, "url": url,
+    }
+
+
+def test_restore_over_cdp_loads_the_page_once():
+    session = CdpSession()
+    restore_state(session, CART_STATE)
+    commands = [call[0] for call in session.calls]
+    assert commands == [
+        "Network.setCookies", "Page.addScriptToEvaluateOnNewDocument", "get", "Page.removeScriptToEvaluateOnNewDocument",
+    ]
+    assert len(session.calls[0][1]["cookies"]) == 2
+    source = session.calls[1][1]["source"]
+    assert '"origin": "https://www.saucedemo.com"' in source and "cart-contents" in source
+    assert session.calls[2] == ("get", CART_STATE.url)
+    assert session.calls[3][1] == {"identifier": "7"}
+
+
+def test_restore_without_cdp_writes_from_the_origin():
+    session = Session()
+    restore_state(session, CART_STATE)
+    assert [call[0] for call in session.calls] == ["get", "add_cookie", "add_cookie", "execute_script", "get"]
+    assert session.calls[0] == ("get", "https://www.saucedemo.com/favicon.ico")
+
+    on_origin = Session(current_url="https://www.saucedemo.com/")
+    restore_state(on_origin, CART_STATE)
+    assert on_origin.calls[0][0] == "add_cookie"
+
+
+def test_restore_or_build_builds_once():
+    cache = CheckpointCache(max_entries=2, max_age=60)
+    session = CdpSession()
+    session.execute_script = lambda script: {"url": CART_STATE.url, "local": {"cart-contents": "[4,0]"}, "session": {}}
+    session.get_cookies = lambda: CART_STATE.cookies
+    builds = []
+    first = cache.restore_or_build(session, "cart", lambda: builds.append(1))
+    second = cache.restore_or_build(session, "cart", lambda: builds.append(1))
+    assert builds == [1]
+    assert second is first
+    assert ("get", CART_STATE.url) in session.calls
@@ -0,0 +1,127 @@
+"""Offline tests of the test-data loader"""
+import json
+from pathlib import Path
+
+import pytest
+
+from common import settings
+from common.data import (
+    LOGIN_ERROR_SCHEMA, DataError, JsonlCases, LazyRecord, Schema, iter_jsonl, load_json, load_test_data,
+)
+
+
+DATA_DIR = Path(__file__).parent / "data"
+DATASET = DATA_DIR / "login_errors.jsonl"
+
+pytest_plugins = ["pytester"]
+
+
+def records(params):
+    return [param.values[0] for param in params]
+
+
+def test_iter_jsonl_skips_blank_lines_and_keeps_line_numbers():
+    params = list(iter_jsonl(DATASET, LOGIN_ERROR_SCHEMA))
+    assert [param.id for param in params] == [
+        "login_errors-1", "login_errors-2", "login_errors-4", "login_errors-5", "login_errors-6",
+    ]
+    assert records(params)[2]["case"] == "invalid_user_1"
+
+
+def test_iter_jsonl_limit_and_shard():
+    assert [param.id for param in iter_jsonl(DATASET, limit=2)] == ["login_errors-1", "login_errors-2"]
+    assert [param.id for param in iter_jsonl(DATASET, shard=(1, 2))] == ["login_errors-2", "login_errors-4", "login_errors-6"]
+    assert [param.id for param in iter_jsonl(DATASET, limit=1, shard=(0, 2))] == ["login_errors-1"]
+
+
+def test_lazy_record_reads_its_line_on_first_access(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text('{"case": "a"}\n{"case": "b"}\n')
+    record = records(iter_jsonl(path))[1]
+    assert isinstance(record, LazyRecord)
+    assert record._record is None
+    assert record["case"] == "b"
+    assert dict(record) == {"case": "b"}
+    assert repr(record) == "LazyRecord(cases.jsonl:2)"
+
+
+def test_lazy_record_reports_its_line(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text('{"case": "a", "username": "u", "password": "p", "expected_error": "e"}\n{"case": "b"}\nnot json\n')
+    first, second, third = records(iter_jsonl(path, LOGIN_ERROR_SCHEMA))
+    assert first["case"] == "a"
+    with pytest.raises(DataError, match=r"cases.jsonl:2: missing field 'username'"):
+        second["case"]
+    with pytest.raises(DataError, match=r"cases.jsonl:3"):
+        third["case"]
+
+
+def test_schema_checks_fields_types_and_keys():
+    schema = Schema(key="case", case=str, retries=int)
+    assert schema.validate({"case": "a", "retries": 1}, "x") == {"case": "a", "retries": 1}
+    with pytest.raises(DataError, match="x: field 'retries' should be int, got str"):
+        schema.validate({"case": "a", "retries": "1"}, "x")
+    with pytest.raises(DataError, match="x: expected an object, got list"):
+        schema.validate([], "x")
+    with pytest.raises(DataError, match=r"f.json\[1\]: duplicate case 'a'"):
+        schema.validate_all([{"case": "a", "retries": 1}, {"case": "a", "retries": 2}], "f.json")
+    with pytest.raises(DataError, match="f.json: expected a list of records, got dict"):
+        schema.validate_all({}, "f.json")
+
+
+def test_load_json_returns_a_copy(tmp_path):
+    path = tmp_path / "cases.json"
+    path.write_text(json.dumps([{"case": "a", "tags": ["smoke"]}]))
+    first = load_json(path)
+    first[0]["tags"].append("edited")
+    first.append({"case": "b"})
+    assert load_json(path) == [{"case": "a", "tags": ["smoke"]}]
+
+
+def test_load_json_reads_an_edited_file_again(tmp_path):
+    path = tmp_path / "cases.json"
+    path.write_text(json.dumps([{"case": "a"}]))
+    assert load_json(path) == [{"case": "a"}]
+    path.write_text(json.dumps([{"case": "a"}, {"case": "b"}]))
+    assert len(load_json(path)) == 2
+
+
+def test_load_json_reports_invalid_files(tmp_path):
+    path = tmp_path / "cases.json"
+    path.write_text("[{")
+    with pytest.raises(DataError, match="cases.json"):
+        load_json(path)
+
+
+def test_load_test_data_jsonl_is_read_when_iterated(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DATA_LIMIT", 2)
+    monkeypatch.setattr(settings, "DATA_SHARD", None)
+    path = tmp_path / "cases.jsonl"
+    cases = load_test_data("cases.jsonl", base_dir=tmp_path)
+    assert isinstance(cases, JsonlCases)
+    path.write_text('{"case": "a"}\n{"case": "b"}\n{"case": "c"}\n')
+    assert [param.id for param in cases] == ["cases-1", "cases-2"]
+    # Iterable again, e.g. by a second parametrize
+    assert len(list(cases)) == 2
+
+
+def test_jsonl_cases_are_generated_at_collection(pytester, monkeypatch):
+    monkeypatch.setattr(settings, "DATA_SHARD", (0, 2))
+    monkeypatch.setattr(settings, "DATA_LIMIT", None)
+    pytester.makepyfile(f"""
+        import pytest
+        from common.data import LOGIN_ERROR_SCHEMA, load_test_data
+
+        test_data = load_test_data({str(DATASET)!r}, LOGIN_ERROR_SCHEMA)
+
+        @pytest.mark.parametrize("data", test_data, ids=lambda d: d["case"])
+        def test_case(data):
+            assert data["expected_error"].startswith("Epic sadface")
+    """)
+    result = pytester.runpytest("-q", "-p", "no:cacheprovider", "--collect-only")
+    result.stdout.fnmatch_lines([
+        "*test_case[[]login_errors-1[]]*",
+        "*test_case[[]login_errors-5[]]*",
+        "2 tests collected*",
+    ])
+    assert pytester.runpytest("-q", "-p", "no:cacheprovider").ret == 0
@@ -0,0 +1,61 @@
+"""Offline tests of the image manifest and the shared checker"""
+import json
+import time
+
+from common import images
+from common.images import ImageManifest, ImageResult, close_shared_checker, problems, shared_checker
+
+
+def reference():
+    return [
+        ImageResult(product="Sauce Labs Backpack", src="/static/backpack.jpg", natural_width=640,
+                    status=200, size=100, sha256="aaa"),
+        ImageResult(product="Sauce Labs Bike Light", src="/static/missing.jpg", status=404),
+    ]
+
+
+def test_manifest_round_trip(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    manifest = ImageManifest(path, max_age=60)
+    assert not manifest
+    manifest.record(reference())
+    manifest.save()
+
+    loaded = ImageManifest(path, max_age=60)
+    assert loaded.expected("Sauce Labs Backpack") == "aaa"
+    assert loaded.expected("Sauce Labs Bike Light") is None
+    assert loaded.recorded_at == manifest.recorded_at
+
+
+def test_expired_manifest_is_recorded_again(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"recorded_at": time.time() - 120, "images": {"Backpack": {"sha256": "aaa"}}}))
+    assert not ImageManifest(str(path), max_age=60)
+    assert ImageManifest(str(path), max_age=600)
+
+
+def test_manifest_without_date_is_expired(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"Backpack": {"sha256": "aaa", "src": "/static/backpack.jpg"}}))
+    assert not ImageManifest(str(path), max_age=60)
+
+
+def test_shared_checker_is_closed_and_replaced():
+    checker = shared_checker()
+    assert shared_checker() is checker
+    close_shared_checker()
+    assert images._checker is None
+    assert checker.executor._shutdown
+    replacement = shared_checker()
+    assert replacement is not checker
+    close_shared_checker()
+    close_shared_checker()
+
+
+def test_problems_lists_broken_and_wrong_images():
+    results = reference()
+    results[0].expected = "bbb"
+    assert problems(results) == [
+        "Sauce Labs Backpack: wrong image /static/backpack.jpg",
+        "Sauce Labs Bike Light: broken image /static/missing.jpg (HTTP 404, 0 bytes, width 0)",
+    ]
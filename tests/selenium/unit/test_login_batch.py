@@ -0,0 +1,86 @@
+"""Offline tests of the login batch runner, with a recorded WebDriver session"""
+import base64
+import os
+
+import pytest
+
+from common import settings
+from common.login_batch import run_login_batch
+from common.screenshots import ARTIFACTS
+
+
+LOCATORS = {name: ("css selector", f"#{name}") for name in ("username", "password", "button", "error", "close")}
+
+CASES = [
+    {"case": case, "username": case, "password": "x", "expected_error": "Epic sadface"}
+    for case in ("empty_username", "wrong_message", "invalid_user")
+]
+
+
+def result(case, closed=True, error="Epic sadface", problem=None):
+    return {"case": case, "error": error, "closed": closed, "logged_in": False, "url": "/", "problem": problem}
+
+
+class Session:
+    """Plays back the outcomes of the batch script"""
+
+    page_source = "<html><h3 data-test='error'>Epic sadface: wrong</h3></html>"
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.loads = 0
+        self.batches = []
+
+    def get(self, url):
+        self.loads += 1
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, batch, locators, timeout):
+        self.batches.append(batch)
+        return self.outcomes.pop(0)
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(b"png").decode("ascii")
+
+
+@pytest.fixture
+def artifacts_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENSHOTS", True)
+    monkeypatch.setattr(ARTIFACTS, "path", str(tmp_path))
+    return tmp_path
+
+
+def test_failed_case_is_captured_before_the_page_reloads(artifacts_dir):
+    session = Session([
+        {"results": [result("empty_username"), result("wrong_message", closed=False, error="Epic sadface: wrong")],
+         "error": None},
+        {"results": [result("invalid_user")], "error": None},
+    ])
+    results = run_login_batch(session, "https://www.saucedemo.com/", LOCATORS, CASES)
+
+    assert list(results) == ["empty_username", "wrong_message", "invalid_user"]
+    assert session.loads == 2
+    assert session.batches[0][1]["expected_error"] == "Epic sadface"
+    assert [case["case"] for case in session.batches[1]] == ["invalid_user"]
+    assert "artifacts" not in results["empty_username"]
+    assert "artifacts" not in results["invalid_user"]
+
+    captured = results["wrong_message"]["artifacts"]["failure_artifacts"][0]
+    ARTIFACTS.flush()
+    assert captured["screenshot"].endswith(".png")
+    assert os.path.isfile(captured["screenshot"]) and os.path.isfile(captured["dom"])
+
+
+def test_case_the_page_cannot_run_is_reported(artifacts_dir, monkeypatch):
+    monkeypatch.setattr(settings, "SCREENSHOTS", False)
+    session = Session([
+        {"results": [], "error": "TypeError: x is null"},
+        {"results": [result("wrong_message"), result("invalid_user")], "error": None},
+    ])
+    results = run_login_batch(session, "https://www.saucedemo.com/", LOCATORS, CASES)
+
+    assert results["empty_username"]["problem"] == "TypeError: x is null"
+    assert results["empty_username"]["artifacts"] == {}
+    assert results["invalid_user"]["closed"]
@@ -0,0 +1,59 @@
+"""Offline tests of the asset cache"""
+import time
+from email.utils import formatdate
+
+import pytest
+
+from common.network import AssetCache
+
+
+URL = "https://www.saucedemo.com/static/js/main.js"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AssetCache(path=str(tmp_path / "assets"), max_age=3600)
+
+
+@pytest.mark.parametrize("headers, lifetime", [
+    ([("Cache-Control", "public, max-age=600")], 600),
+    ([("Cache-Control", "max-age=999999")], 3600),
+    ([("cache-control", "max-age=0")], 0),
+    ([("Cache-Control", "no-cache, max-age=600")], 0),
+    ([("Cache-Control", "no-store")], 0),
+    ([("Cache-Control", "private, max-age=600")], 0),
+    ([], 0),
+    ([("Content-Type", "text/javascript")], 0),
+    ([("Expires", "Wed, 21 Oct 2015 07:28:00 GMT"), ("Date", "Wed, 21 Oct 2015 07:18:00 GMT")], 600),
+    ([("Expires", "Wed, 21 Oct 2015 07:28:00 GMT"), ("Date", "Wed, 21 Oct 2015 08:28:00 GMT")], 0),
+    ([("Expires", "0")], 0),
+    ([("Expires", "Wed, 21 Oct 2015 07:28:00 GMT"), ("Cache-Control", "max-age=60")], 60),
+])
+def test_lifetime_needs_explicit_freshness(cache, headers, lifetime):
+    assert cache.lifetime(headers) == lifetime
+
+
+def test_expires_without_date_counts_from_now(cache):
+    assert 0 < cache.lifetime([("Expires", formatdate(time.time() + 120, usegmt=True))]) <= 120
+
+
+def test_put_and_get(cache):
+    headers = [("Cache-Control", "max-age=600"), ("Content-Encoding", "gzip"), ("Content-Type", "text/javascript")]
+    assert cache.put(URL, 200, headers, b"console.log(1)")
+    status, stored_headers, body = cache.get(URL)
+    assert status == 200
+    assert body == b"console.log(1)"
+    assert [name for name, _ in stored_headers] == ["Cache-Control", "Content-Type"]
+    assert cache.get(URL + "?v=2") is None
+
+
+def test_responses_without_freshness_are_not_stored(cache):
+    assert not cache.put(URL, 200, [("Content-Type", "text/javascript")], b"x")
+    assert cache.get(URL) is None
+
+
+def test_expired_entries_are_not_served(cache, monkeypatch):
+    cache.put(URL, 200, [("Cache-Control", "max-age=60")], b"x")
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.get(URL) is None
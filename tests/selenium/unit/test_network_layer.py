@@ -0,0 +1,92 @@
+"""Offline tests of the request interception, with a recorded CDP channel"""
+import base64
+
+import pytest
+import trio
+from selenium.webdriver.common.devtools import v125 as devtools
+
+from common.network import AssetCache, CacheStats, NetworkLayer
+
+
+URL = "https://www.saucedemo.com/static/media/bike-light.jpg"
+
+
+class Channel:
+    """Records the CDP commands sent by the layer; fails the listed methods"""
+
+    def __init__(self, fail=(), responses=None):
+        self.devtools = devtools
+        self.sent = []
+        self.fail = fail
+        self.responses = responses or {}
+
+    async def send(self, command):
+        request = next(command)
+        self.sent.append(request["method"])
+        if request["method"] in self.fail:
+            raise RuntimeError(f"{request['method']} failed")
+        try:
+            command.send(self.responses.get(request["method"], {}))
+        except StopIteration as stop:
+            return stop.value
+
+
+def paused(status=None, headers=()):
+    event = {
+        "requestId": "interception-1",
+        "request": {
+            "url": URL, "method": "GET", "headers": {},
+            "initialPriority": "Low", "referrerPolicy": "no-referrer",
+        },
+        "frameId": "frame-1",
+        "resourceType": "Image",
+    }
+    if status is not None:
+        event["responseStatusCode"] = status
+        event["responseHeaders"] = [{"name": name, "value": value} for name, value in headers]
+    return devtools.fetch.RequestPaused.from_json(event)
+
+
+@pytest.fixture
+def layer(tmp_path):
+    layer = NetworkLayer(driver=None, cache=AssetCache(path=str(tmp_path), max_age=3600), stats=CacheStats())
+    layer.channel = Channel()
+    return layer
+
+
+def test_miss_continues_and_response_is_stored(layer):
+    layer.channel.responses["Fetch.getResponseBody"] = {
+        "body": base64.b64encode(b"jpeg").decode("ascii"), "base64Encoded": True,
+    }
+    trio.run(layer._paused, paused())
+    trio.run(layer._paused, paused(200, [("Cache-Control", "max-age=600")]))
+    assert layer.channel.sent == ["Fetch.continueRequest", "Fetch.getResponseBody", "Fetch.continueResponse"]
+    assert layer.cache.get(URL)[2] == b"jpeg"
+    assert layer.stats.summary()["stored"] == 1
+
+
+def test_hit_is_fulfilled_from_the_cache(layer):
+    layer.cache.put(URL, 200, [("Cache-Control", "max-age=600")], b"jpeg")
+    trio.run(layer._paused, paused())
+    assert layer.channel.sent == ["Fetch.fulfillRequest"]
+    assert layer.stats.summary()["hits"] == 1
+
+
+def test_failed_fulfill_falls_back_to_the_network(layer):
+    layer.cache.put(URL, 200, [("Cache-Control", "max-age=600")], b"jpeg")
+    layer.channel.fail = ("Fetch.fulfillRequest",)
+    trio.run(layer._paused, paused())
+    assert layer.channel.sent == ["Fetch.fulfillRequest", "Fetch.continueRequest"]
+
+
+def test_failed_store_still_continues_the_response(layer):
+    layer.channel.fail = ("Fetch.getResponseBody",)
+    trio.run(layer._paused, paused(200, [("Cache-Control", "max-age=600")]))
+    assert layer.channel.sent == ["Fetch.getResponseBody", "Fetch.continueResponse"]
+    assert layer.cache.get(URL) is None
+
+
+def test_gone_request_is_ignored(layer):
+    layer.channel.fail = ("Fetch.continueRequest",)
+    trio.run(layer._paused, paused())
+    assert layer.channel.sent == ["Fetch.continueRequest", "Fetch.continueRequest"]
@@ -0,0 +1,73 @@
+"""Offline tests of the worker split and command line (no browser)"""
+from common.parallel import fixture_group, split_items, worker_args
+
+pytest_plugins = ["pytester"]
+
+
+def test_split_items_deals_round_robin():
+    assert split_items(list(range(7)), 3) == [[0, 3, 6], [1, 4], [2, 5]]
+
+
+def test_split_items_never_makes_empty_workers():
+    assert split_items([1, 2], 5) == [[1], [2]]
+    assert split_items([], 4) == [[]]
+    assert split_items([1, 2, 3], 0) == [[1, 2, 3]]
+
+
+def test_split_items_keeps_every_item_once():
+    items = [f"test_{index}" for index in range(23)]
+    shares = split_items(items, 4)
+    assert sorted(item for share in shares for item in share) == sorted(items)
+    assert max(map(len, shares)) - min(map(len, shares)) <= 1
+
+
+def test_worker_args_drops_report_options():
+    args = ["tests/selenium", "--html", "report.html", "-q", "--junitxml=out.xml", "--junit-xml", "x.xml", "-k", "login"]
+    assert worker_args(args) == ["tests/selenium", "-q", "-k", "login"]
+
+
+def test_worker_args_keeps_similar_options():
+    args = ["--html-title=x", "--self-contained-html", "-p", "no:cacheprovider"]
+    assert worker_args(args) == args
+
+
+def test_split_items_keeps_groups_together():
+    items = ["a1", "a2", "a3", "b1", "c1", "c2"]
+    shares = split_items(items, 2, key=lambda item: item[0])
+    assert shares == [["a1", "a2", "a3"], ["b1", "c1", "c2"]]
+    assert split_items(items, 5, key=lambda item: item[0]) == [["a1", "a2", "a3"], ["c1", "c2"], ["b1"]]
+
+
+def test_fixture_group_follows_the_widest_shared_scope(pytester):
+    pytester.makepyfile(test_groups="""
+        import pytest
+
+        @pytest.fixture(scope="module")
+        def measured():
+            return 1
+
+        @pytest.fixture(scope="class")
+        def page():
+            return 2
+
+        def test_alone():
+            pass
+
+        def test_measured(measured):
+            pass
+
+        class TestPage:
+            def test_one(self, page):
+                pass
+
+            def test_two(self, page):
+                pass
+
+            def test_plain(self):
+                pass
+    """)
+    items = {item.name: item for item in pytester.inline_genitems()[0]}
+    assert fixture_group(items["test_alone"]) is items["test_alone"]
+    assert fixture_group(items["test_measured"]) == "test_groups.py"
+    assert fixture_group(items["test_one"]) == fixture_group(items["test_two"]) == "test_groups.py::TestPage"
+    assert fixture_group(items["test_plain"]) is items["test_plain"]
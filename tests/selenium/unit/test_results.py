@@ -0,0 +1,123 @@
+"""Offline tests of the streamed results and HTML report"""
+import json
+
+from _pytest.reports import TestReport
+
+from common import settings
+from common.results import HtmlReport, ResultSink, add_report, build_html, finish, new_result
+
+pytest_plugins = ["pytester"]
+
+
+NODEID = "test2/test_products_navigation.py::test_inventory"
+
+
+def report(when, outcome, longrepr=None, user_properties=(), sections=(), **extra):
+    result = TestReport(
+        NODEID, ("test_products_navigation.py", 1, "test_inventory"), {}, outcome, longrepr, when,
+        sections=list(sections), duration=0.5, user_properties=list(user_properties),
+    )
+    result.__dict__.update(extra)
+    return result
+
+
+def run(*reports):
+    result = new_result(NODEID)
+    for phase in reports:
+        add_report(result, phase)
+    return finish(result)
+
+
+def test_passed_test():
+    result = run(
+        report("setup", "passed"),
+        report("call", "passed", user_properties=[("asset_cache", {"hits": 3})]),
+        report("teardown", "passed"),
+    )
+    assert result["outcome"] == "passed"
+    assert result["duration"] == 1.5
+    assert result["phases"] == {"setup": "passed", "call": "passed", "teardown": "passed"}
+    assert result["properties"] == {"asset_cache": {"hits": 3}}
+    assert result["longrepr"] is None
+
+
+def test_failure_keeps_error_sections_and_artifacts():
+    artifacts = [{"screenshot": "screenshots/a.jpeg", "dom": "screenshots/a.html.gz"}]
+    result = run(
+        report("setup", "passed"),
+        report("call", "failed", "AssertionError: boom", [("failure_artifacts", artifacts)],
+               sections=[("page log", "0.000s INFO login: ok")]),
+        report("teardown", "passed"),
+    )
+    assert result["outcome"] == "failed"
+    assert result["longrepr"] == "[call] AssertionError: boom"
+    assert result["sections"] == [["page log", "0.000s INFO login: ok"]]
+    assert result["artifacts"] == ["screenshots/a.jpeg", "screenshots/a.html.gz"]
+
+
+def test_teardown_failure_is_an_error_and_not_overwritten():
+    result = run(
+        report("setup", "passed"),
+        report("call", "failed", "call failed"),
+        report("teardown", "failed", "teardown failed"),
+    )
+    assert result["outcome"] == "failed"
+    assert result["longrepr"] == "[call] call failed\n\n[teardown] teardown failed"
+    assert run(report("setup", "failed", "no browser"))["outcome"] == "error"
+
+
+def test_skip_and_xfail():
+    skipped = run(report("setup", "skipped", ("file.py", 3, "Skipped: no stand-in")))
+    assert skipped["outcome"] == "skipped"
+    assert skipped["longrepr"] == "Skipped: no stand-in"
+    assert run(report("call", "skipped", ("file.py", 3, "reason"), wasxfail="bug"))["outcome"] == "xfailed"
+    assert run(report("call", "passed", wasxfail="bug"))["outcome"] == "xpassed"
+
+
+def test_html_report_is_built_row_by_row(tmp_path):
+    passed = run(report("call", "passed"))
+    failed = run(report("call", "failed", "AssertionError: <boom>",
+                        [("failure_artifacts", [{"screenshot": str(tmp_path / "shots" / "a.jpeg")}])]))
+    html_path = tmp_path / "report" / "index.html"
+    html = HtmlReport(str(html_path), title="Run").open()
+    html.add(passed)
+    content = html_path.read_text()
+    assert NODEID in content and "summary" not in content
+    html.add(failed)
+    html.close()
+    content = html_path.read_text()
+    assert html.counts == {"passed": 1, "failed": 1}
+    assert "2 tests: 1 failed, 1 passed" in content
+    assert "AssertionError: &lt;boom&gt;" in content
+    assert 'href="../shots/a.jpeg"' in content
+
+
+def test_build_html_from_results_file(tmp_path):
+    results_path = tmp_path / "results.jsonl"
+    sink = ResultSink(str(results_path)).open()
+    sink.write(run(report("call", "passed")))
+    sink.write(run(report("call", "failed", "boom")))
+    sink.close()
+    lines = results_path.read_text().splitlines()
+    assert [json.loads(line)["outcome"] for line in lines] == ["passed", "failed"]
+    counts = build_html(str(results_path), str(tmp_path / "report.html"))
+    assert counts == {"passed": 1, "failed": 1}
+
+
+def test_plugin_registered_by_a_nested_conftest_writes_results(pytester, monkeypatch):
+    pytester.mkpydir("suite")
+    pytester.path.joinpath("suite", "conftest.py").write_text(
+        "from common.results import ResultsPlugin\n"
+        "\n"
+        "def pytest_configure(config):\n"
+        "    config.pluginmanager.register(ResultsPlugin(config), 'selenium-results')\n"
+    )
+    pytester.path.joinpath("suite", "test_one.py").write_text("def test_one():\n    pass\n")
+    monkeypatch.setattr(settings, "RESULTS", True)
+    monkeypatch.setattr(settings, "RESULTS_DIR", str(pytester.path / "results"))
+    monkeypatch.setattr(settings, "RESULTS_HTML", str(pytester.path / "report.html"))
+
+    assert pytester.runpytest("-q", "-p", "no:cacheprovider").ret == 0
+    lines = (pytester.path / "results" / "results.jsonl").read_text().splitlines()
+    assert [json.loads(line)["nodeid"] for line in lines] == ["suite/test_one.py::test_one"]
+    assert "1 tests: 1 passed" in (pytester.path / "report.html").read_text()
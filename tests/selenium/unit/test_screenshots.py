@@ -0,0 +1,55 @@
+"""Offline tests of the failure artifact store and its pytest-html links"""
+import base64
+import gzip
+import os
+
+from _pytest.reports import TestReport
+
+from common.screenshots import DOM_EXTENSION, ArtifactStore, FailureCapturePlugin, _gzip, html_report_link
+
+
+class Config:
+    """pytest config with only the --html option"""
+
+    def __init__(self, htmlpath=None):
+        self.htmlpath = htmlpath
+
+    def getoption(self, name, default=None):
+        return self.htmlpath if name == "htmlpath" else default
+
+
+def test_store_writes_each_content_once(tmp_path):
+    store = ArtifactStore(path=str(tmp_path), workers=2)
+    image = base64.b64encode(b"jpeg").decode("ascii")
+    first = store.put(image, "jpeg", base64.b64decode)
+    assert store.put(image, "jpeg", base64.b64decode) == first
+    dom = store.put("<html></html>", DOM_EXTENSION, _gzip)
+    store.flush()
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(first), os.path.basename(dom)])
+    with open(dom, "rb") as f:
+        assert gzip.decompress(f.read()) == b"<html></html>"
+
+
+def test_links_are_relative_to_the_html_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = Config(htmlpath="reports/selenium_report.html")
+    assert html_report_link(config, "screenshots/a.jpeg") == "../screenshots/a.jpeg"
+    assert html_report_link(config, str(tmp_path / "reports" / "a.jpeg")) == "a.jpeg"
+    assert html_report_link(Config(), "screenshots/a.jpeg") is None
+
+
+def test_failed_report_gets_linked_extras(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    plugin = FailureCapturePlugin(Config(htmlpath="selenium_report.html"))
+    artifacts = [{"screenshot": str(tmp_path / "screenshots" / "a.jpeg"), "dom": "screenshots/a.html.gz"}]
+    report = TestReport("test_x", ("x.py", 1, "test_x"), {}, "failed", "boom", "call",
+                        user_properties=[["failure_artifacts", artifacts]])
+    plugin.pytest_runtest_logreport(report)
+    assert [extra["format_type"] for extra in report.extra] == ["html", "url"]
+    assert 'src="screenshots/a.jpeg"' in report.extra[0]["content"]
+    assert report.extra[1]["content"] == "screenshots/a.html.gz"
+
+    without_html = TestReport("test_x", ("x.py", 1, "test_x"), {}, "failed", "boom", "call",
+                              user_properties=[("failure_artifacts", artifacts)])
+    FailureCapturePlugin(Config()).pytest_runtest_logreport(without_html)
+    assert not getattr(without_html, "extra", [])
@@ -0,0 +1,46 @@
+"""Offline tests of the stand-in server (no browser)"""
+from urllib.request import urlopen
+
+from common import settings
+from common.standin import ROUTE_ENDPOINT, StandInServer
+
+pytest_plugins = ["pytester"]
+
+
+def test_port_zero_binds_a_free_port_when_started():
+    server = StandInServer(port=0, profile="instant")
+    assert server.port == 0
+    with server:
+        assert server.port != 0
+        assert server.url == f"http://{settings.STANDIN_HOST}:{server.port}/"
+        with urlopen(server.url + "inventory.html") as response:
+            assert response.status == 200
+            assert b"<html" in response.read().lower()
+    assert server._server is None
+
+
+def test_two_servers_get_their_own_port():
+    with StandInServer(profile="instant") as first, StandInServer(profile="instant") as second:
+        assert first.port != second.port
+        with urlopen(second.url + ROUTE_ENDPOINT.lstrip("/") + "?path=/inventory.html") as response:
+            assert response.status == 200
+
+
+def test_fixture_publishes_the_url_once_the_server_listens(pytester, monkeypatch):
+    monkeypatch.setattr(settings, "STANDIN", True)
+    monkeypatch.setattr(settings, "STANDIN_PORT", 0)
+    monkeypatch.setattr(settings, "BASE_URL", None)
+    pytester.makeconftest("""
+        from common.standin import StandInPlugin
+
+        def pytest_configure(config):
+            config.pluginmanager.register(StandInPlugin(config), "selenium-standin")
+    """)
+    pytester.makepyfile("""
+        from common import settings
+
+        def test_base_url(saucedemo):
+            assert saucedemo == settings.BASE_URL == f"http://127.0.0.1:{settings.STANDIN_PORT}/"
+            assert settings.STANDIN_PORT != 0
+    """)
+    assert pytester.runpytest("-q", "-p", "no:cacheprovider").ret == 0
@@ -0,0 +1,51 @@
+"""Offline tests of the statistics helpers"""
+import pytest
+
+from common.stats import mann_whitney_greater, percentile, summarize
+
+
+def test_percentile_interpolates():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([5, 1, 3], 0) == 1
+    assert percentile([5, 1, 3], 100) == 5
+    assert percentile([0, 10], 90) == pytest.approx(9)
+
+
+def test_percentile_of_nothing_fails():
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_summarize():
+    summary = summarize([1.0, 2.0, 3.0])
+    assert summary["n"] == 3
+    assert summary["mean"] == 2.0
+    assert summary["p50"] == 2.0
+
+
+def test_mann_whitney_detects_a_shift():
+    slow = [1.0 + index / 100 for index in range(30)]
+    fast = [0.5 + index / 100 for index in range(30)]
+    u, p = mann_whitney_greater(slow, fast)
+    assert u > len(slow) * len(fast) / 2
+    assert p < 0.001
+    assert mann_whitney_greater(fast, slow)[1] > 0.99
+
+
+def test_mann_whitney_matches_the_reference_value():
+    # Ranks 3.5 + 5.5 + 7 + 8 = 24, U = 24 - 10; tie-corrected variance 11.714,
+    # z = (14 - 8 - 0.5) / sqrt(11.714) (scipy's asymptotic method gives the same)
+    u, p = mann_whitney_greater([3, 4, 5, 6], [1, 2, 3, 4])
+    assert u == 14.0
+    assert p == pytest.approx(0.0540, abs=1e-4)
+
+
+def test_mann_whitney_identical_samples():
+    u, p = mann_whitney_greater([2, 2, 2], [2, 2])
+    assert u == 3.0
+    assert p == 1.0
+
+
+def test_mann_whitney_needs_two_samples():
+    with pytest.raises(ValueError):
+        mann_whitney_greater([], [1])
@@ -0,0 +1,102 @@
+"""Offline tests of the adaptive deadlines"""
+import json
+
+import pytest
+
+from common import settings
+from common.timeouts import MAX_SAMPLES, TimeoutManager
+
+
+class Session:
+    """Stands for a WebDriver: the manager only uses it as a key"""
+
+
+@pytest.fixture
+def timeouts(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ADAPTIVE_TIMEOUTS", True)
+    monkeypatch.setattr(settings, "TIMEOUT_MIN_SAMPLES", 5)
+    monkeypatch.setattr(settings, "TIMEOUT_PERCENTILE", 100)
+    monkeypatch.setattr(settings, "TIMEOUT_MARGIN", 0.5)
+    monkeypatch.setattr(settings, "TIMEOUT_MAX", 10)
+    monkeypatch.setattr(settings, "TIMEOUT_MISSES", 2)
+    return TimeoutManager(path=str(tmp_path / "latencies.json"))
+
+
+def test_default_until_enough_samples(timeouts):
+    for _ in range(4):
+        timeouts.record("standard_user", "login", 1.0)
+    assert timeouts.deadline("standard_user", "login", 15) == 15
+    timeouts.record("standard_user", "login", 1.0)
+    assert timeouts.deadline("standard_user", "login", 15) == 1.5
+
+
+def test_deadline_is_percentile_plus_margin_capped(timeouts):
+    for seconds in (1, 2, 3, 4, 5):
+        timeouts.record("performance_glitch_user", "login", seconds)
+    assert timeouts.deadline("performance_glitch_user", "login", 15) == 5.5
+    for _ in range(5):
+        timeouts.record("performance_glitch_user", "login", 30)
+    assert timeouts.deadline("performance_glitch_user", "login", 15) == 10
+
+
+def test_users_transitions_and_scopes_are_separate(timeouts):
+    for _ in range(5):
+        timeouts.record("standard_user", "login", 1.0)
+    assert timeouts.deadline("standard_user", "inventory", 15) == 15
+    assert timeouts.deadline("problem_user", "login", 15) == 15
+    timeouts.scope = "slow"
+    assert timeouts.deadline("standard_user", "login", 15) == 15
+
+
+def test_disabled_returns_default(timeouts, monkeypatch):
+    for _ in range(5):
+        timeouts.record("standard_user", "login", 1.0)
+    monkeypatch.setattr(settings, "ADAPTIVE_TIMEOUTS", False)
+    assert timeouts.deadline("standard_user", "login", 15) == 15
+
+
+def test_measure_records_only_successful_waits(timeouts):
+    driver = Session()
+    timeouts.bind(driver, "standard_user")
+    assert timeouts.measure(driver, "login", lambda timeout: timeout, 15) == 15
+    assert timeouts.measure(driver, "login", lambda timeout: False, 15) is False
+    assert len(timeouts.samples("standard_user", "login")) == 1
+
+
+def test_missed_learned_deadline_goes_back_to_default(timeouts):
+    driver = Session()
+    timeouts.bind(driver, "standard_user")
+    for _ in range(5):
+        timeouts.record("standard_user", "login", 1.0)
+
+    def time_out(timeout):
+        raise TimeoutError(timeout)
+
+    with pytest.raises(TimeoutError):
+        timeouts.measure(driver, "login", time_out, 15)
+    assert timeouts.measure(driver, "login", lambda timeout: False, 15) is False
+    assert timeouts.deadline("standard_user", "login", 15) == 15
+    # The site got slower: the wait succeeds within the default and is learned
+    timeouts.record("standard_user", "login", 4.0)
+    assert timeouts.deadline("standard_user", "login", 15) == 4.5
+
+
+def test_misses_at_the_default_are_not_counted(timeouts):
+    driver = Session()
+    timeouts.bind(driver, "standard_user")
+    for _ in range(3):
+        timeouts.measure(driver, "login", lambda timeout: False, 15)
+    for _ in range(5):
+        timeouts.record("standard_user", "login", 1.0)
+    assert timeouts.deadline("standard_user", "login", 15) == 1.5
+
+
+def test_save_merges_and_trims(timeouts, tmp_path):
+    path = tmp_path / "latencies.json"
+    path.write_text(json.dumps({"standard_user|login": [9.0] * MAX_SAMPLES}))
+    timeouts.record("standard_user", "login", 1.0)
+    timeouts.save()
+    saved = json.loads(path.read_text())["standard_user|login"]
+    assert len(saved) == MAX_SAMPLES
+    assert saved[-1] == 1.0
+    assert TimeoutManager(path=str(path)).samples("standard_user", "login") == saved
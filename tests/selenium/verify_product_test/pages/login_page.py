@@ -9,6 +9,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
+from urllib.parse import urljoin
+from common.timeouts import TIMEOUTS
 from pages.base_page import BasePage
 from config.config import Config
 
@@ -23,13 +25,19 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = (By.CSS_SELECTOR, "[data-test='error']")
     ERROR_CLOSE_BUTTON = (By.CLASS_NAME, "error-button")
     
+    # Cookie posé par SauceDemo après une connexion réussie
+    SESSION_COOKIE = "session-username"
+    
     def __init__(self, driver):
         super().__init__(driver)
         self.url = Config.BASE_URL
+        # Connexion par le formulaire en cours: mesurée comme une navigation
+        self._form_login = False
     
     def navigate(self):
         """Navigate vers la page de login"""
-        self.navigate_to(self.url)
+        TIMEOUTS.bind(self.driver, None)
+        self.navigate_to(self.url, "login_page")
     
     def enter_username(self, username):
         """Saisir le nom d'utilisateur"""
@@ -43,12 +51,36 @@ class LoginPage(BasePage):
         """Cliquer sur le bouton de connexion"""
         self.click_element(*self.LOGIN_BUTTON)
     
-    def login(self, username, password=None):
-        """Effectuer une connexion complète"""
+    def login(self, username, password=None, mode=None):
+        """
+        Effectuer une connexion complète
+        Saisie et soumission en un seul appel par défaut; mode="keys" pour la
+        frappe touche par touche (voir BasePage.fill_form)
+        """
         password = password or Config.PASSWORD
-        self.enter_username(username)
-        self.enter_password(password)
-        self.click_login_button()
+        # Les attentes suivantes sont mesurées pour cet utilisateur
+        TIMEOUTS.bind(self.driver, username)
+        self.fill_form(
+            [(self.USERNAME_INPUT, username), (self.PASSWORD_INPUT, password)],
+            submit=self.LOGIN_BUTTON,
+            mode=mode,
+        )
+        self._form_login = True
+    
+    def login_with_session(self, username):
+        """
+        Connexion rapide sans passer par le formulaire
+        Pose directement le cookie de session puis ouvre l'inventaire
+        """
+        cookie = {"name": self.SESSION_COOKIE, "value": username, "path": "/"}
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            # CDP: le cookie peut être posé avant d'avoir ouvert le site
+            self.driver.execute_cdp_cmd("Network.setCookie", {**cookie, "url": self.url})
+        else:
+            self.navigate()
+            self.driver.add_cookie(cookie)
+        TIMEOUTS.bind(self.driver, username)
+        self.navigate_to(urljoin(self.url, "inventory.html"), "session_login")
     
     def get_error_message(self):
         """Récupère le message d'erreur"""
@@ -59,17 +91,32 @@ class LoginPage(BasePage):
     
     def is_error_displayed(self):
         """Vérifie si un message d'erreur est affiché"""
-        return self.is_element_visible(*self.ERROR_MESSAGE, timeout=5)  # Augmenté de 3 à 5
+        return self.timed_wait(
+            "login_error",
+            lambda timeout: self.is_element_visible(*self.ERROR_MESSAGE, timeout=timeout),
+            default=5,
+        )
     
-    def is_login_successful(self, timeout=5):
-        """Vérifie si la connexion a réussi"""
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.url_contains("/inventory.html")
-            )
-            return True
-        except TimeoutException:
-            return False
+    def is_login_successful(self, timeout=None):
+        """
+        Vérifie si la connexion a réussi
+        Sans timeout, le délai est appris des connexions précédentes de l'utilisateur
+        """
+        def wait(timeout):
+            try:
+                WebDriverWait(self.driver, timeout).until(
+                    EC.url_contains("/inventory.html")
+                )
+                return True
+            except TimeoutException:
+                return False
+        
+        if timeout is not None:
+            return wait(timeout)
+        if self._form_login:
+            self._form_login = False
+            return self.timed_navigation("login", wait)
+        return self.timed_wait("login", wait)
     
     def close_error_message(self):
         """Ferme le message d'erreur"""
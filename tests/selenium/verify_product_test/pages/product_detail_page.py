@@ -5,8 +5,11 @@ Page Object pour la page de détails d'un produit
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from pages.base_page import BasePage
-import time
+from common import pagelog
+
+log = pagelog.get("product_detail")
 
 
 class ProductDetailPage(BasePage):
@@ -24,23 +27,25 @@ class ProductDetailPage(BasePage):
     def is_on_detail_page(self):
         """
         Vérifie qu'on est sur la page de détails
-        Attend jusqu'à 10 secondes que la page se charge
+        Attend que la page se charge (10 secondes tant que le délai n'est pas appris)
         """
-        try:
+        def wait(timeout):
             # Attendre que l'URL contienne "inventory-item"
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(self.driver, timeout).until(
                 lambda d: "inventory-item.html" in d.current_url or "?id=" in d.current_url
             )
             
             # Attendre que le nom du produit soit visible
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(self.driver, timeout).until(
                 EC.visibility_of_element_located(self.PRODUCT_NAME)
             )
-            
             return True
+        
+        try:
+            return self.timed_wait("detail_page", wait, default=10)
         except Exception as e:
-            print(f"❌ Pas sur la page de détails: {e}")
-            print(f"   URL actuelle: {self.driver.current_url}")
+            log.error("Pas sur la page de détails: %s", e)
+            pagelog.on_failure("URL actuelle", lambda: self.driver.current_url)
             return False
     
     def get_product_name(self) -> str:
@@ -57,56 +62,17 @@ class ProductDetailPage(BasePage):
     
     def is_product_image_visible(self) -> bool:
         """
-        Vérifie si l'image du produit est visible
-        Version avec debug détaillé
+        Vérifie si l'image du produit est visible (attente sur événement)
+        Le contenu de l'image est vérifié par check_images()
         """
-        print("\n🔍 Vérification de l'image du produit...")
-        
         try:
-            # Attendre que l'image soit dans le DOM
-            img = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(self.PRODUCT_IMAGE)
+            self.timed_wait(
+                "detail_image",
+                lambda timeout: self.waits.element(self.PRODUCT_IMAGE, "visible", timeout=timeout),
+                default=10,
             )
-            print(f"✓ Image trouvée dans le DOM")
-            
-            # Vérifier les propriétés de l'image
-            src = img.get_attribute('src')
-            print(f"  - src: {src}")
-            
-            is_displayed = img.is_displayed()
-            print(f"  - is_displayed: {is_displayed}")
-            
-            width = img.size['width']
-            height = img.size['height']
-            print(f"  - Dimensions: {width}x{height}")
-            
-            # Attendre que l'image soit visible
-            try:
-                WebDriverWait(self.driver, 20).until(
-                    EC.visibility_of_element_located(self.PRODUCT_IMAGE)
-                )
-                print(f"✓ Image est visible")
-                return True
-            except Exception as e:
-                print(f"❌ Image pas visible après attente: {e}")
-                
-                # Essayer de forcer un wait plus long
-                time.sleep(2)
-                is_visible_now = img.is_displayed()
-                print(f"  - Visible après 2s de plus: {is_visible_now}")
-                return is_visible_now
-                
-        except Exception as e:
-            print(f"❌ Erreur lors de la recherche de l'image: {e}")
-            
-            # Afficher le HTML de la page pour debug
-            try:
-                detail_container = self.driver.find_element(By.CLASS_NAME, "inventory_details_container")
-                print(f"\n📄 HTML du conteneur:")
-                print(detail_container.get_attribute('innerHTML')[:500])
-            except:
-                pass
-            
+            return True
+        except TimeoutException:
             return False
     
     def get_product_image_src(self) -> str:
@@ -122,19 +88,18 @@ class ProductDetailPage(BasePage):
             
             # Scroll
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", back_btn)
-            time.sleep(0.3)
             
-            # Cliquer avec JavaScript
+            # Cliquer avec JavaScript puis attendre le changement d'URL
             self.driver.execute_script("arguments[0].click();", back_btn)
-            time.sleep(1.5)
+            self.wait_for_inventory_url()
             
         except Exception as e:
-            print(f"❌ Erreur click_back_button: {e}")
+            log.error("Erreur click_back_button: %s", e)
             raise
     
     def back_to_products(self):
         """Retourne à la liste des produits"""
-        print("\n🔙 Retour vers la liste des produits...")
+        log.info("Retour vers la liste des produits")
         
         try:
             back_btn = WebDriverWait(self.driver, 10).until(
@@ -143,23 +108,32 @@ class ProductDetailPage(BasePage):
             
             # Scroll vers le bouton
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", back_btn)
-            time.sleep(0.3)
             
-            # Cliquer avec JavaScript
+            # Cliquer avec JavaScript puis attendre le retour sur l'inventaire
             self.driver.execute_script("arguments[0].click();", back_btn)
-            time.sleep(1.5)
-            
-            print(f"✓ URL après retour: {self.driver.current_url}")
+            try:
+                self.wait_for_inventory_url()
+            except TimeoutException:
+                pass
             
-            if "/inventory.html" in self.driver.current_url:
-                print("✅ Retour réussi")
+            url = self.get_current_url()
+            if "/inventory.html" in url:
+                log.info("Retour réussi: %s", url)
             else:
-                print(f"⚠️ URL: {self.driver.current_url}")
+                log.warning("Retour non confirmé, URL: %s", url)
                 
         except Exception as e:
-            print(f"❌ Erreur back_to_products: {e}")
+            log.error("Erreur back_to_products: %s", e)
             raise
     
+    def wait_for_inventory_url(self):
+        """Attend le retour sur l'inventaire après le bouton retour"""
+        return self.timed_navigation(
+            "back_to_inventory",
+            lambda timeout: self.waits.url_change(contains="/inventory.html", timeout=timeout),
+            default=5,
+        )
+    
     def add_to_cart(self):
         """Ajoute le produit au panier"""
         self.click_element(*self.ADD_TO_CART_BUTTON)
@@ -3,32 +3,98 @@ from pathlib import Path
 import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 
 # FIX PYTHON PATH
-PROJECT_ROOT = Path(__file__).resolve().parents[2] / "selenium" / "verify_product_test"
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SELENIUM_ROOT = PROJECT_ROOT.parent
 sys.path.insert(0, str(PROJECT_ROOT))
-
+sys.path.insert(0, str(SELENIUM_ROOT))
+
+from common.browser_pool import BrowserPool
+from common.checkpoint import CheckpointCache
+from common.driver_resolver import default_chrome_binary, resolve_chrome
+from common.images import REFERENCE_USER, ImageManifest
+from common.plugin import register as register_plugins
+from common.waits import apply_timing_policy
 from config.config import Config
 from pages.login_page import LoginPage
 from pages.inventory_page import InventoryPage
 from pages.product_detail_page import ProductDetailPage
 
 
-@pytest.fixture(scope="function")
-def driver():
+def pytest_configure(config):
+    register_plugins(config)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def base_url(saucedemo):
+    """Config.BASE_URL of the run: the stand-in's port is known once its server listens"""
+    Config.BASE_URL = saucedemo
+    return saucedemo
+
+
+def start_driver():
     options = Options()
-    options.binary_location = "/usr/bin/chromium-browser"
+    options.binary_location = default_chrome_binary()
 
     options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1920,1080")
 
-    driver = webdriver.Chrome(options=options)
-    driver.implicitly_wait(5)
+    chrome = resolve_chrome(options.binary_location)
+    driver = webdriver.Chrome(service=Service(chrome.driver_path), options=options)
+    # Implicit wait disabled: only explicit waits (see common/waits.py)
+    return apply_timing_policy(driver)
 
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    pool = BrowserPool(start_driver)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def driver(browser_pool):
+    driver = browser_pool.acquire()
     yield driver
-    driver.quit()
+    browser_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def checkpoints():
+    """Named browser states shared by the tests of this process"""
+    return CheckpointCache()
+
+
+@pytest.fixture
+def checkpoint(driver, checkpoints):
+    """
+    checkpoint(key, build): restores the state saved under key, or runs
+    build() and saves the state it leaves (cookies, storage, URL)
+    """
+    def _checkpoint(key, build):
+        return checkpoints.restore_or_build(driver, key, build)
+    return _checkpoint
+
+
+@pytest.fixture(scope="session")
+def image_manifest(browser_pool):
+    """Reference image hashes, recorded once with standard_user and cached on disk"""
+    manifest = ImageManifest()
+    if not manifest:
+        driver = browser_pool.acquire()
+        try:
+            LoginPage(driver).login_with_session(REFERENCE_USER)
+            inventory = InventoryPage(driver)
+            inventory.get_all_products()
+            manifest.record(inventory.check_images())
+            manifest.save()
+        finally:
+            browser_pool.release(driver)
+    return manifest
 
 
 @pytest.fixture
@@ -46,20 +112,28 @@ def product_detail_page(driver):
     return ProductDetailPage(driver)
 
 
+def log_in(login_page, username, request):
+    """Session cookie login, unless the test checks the form (ui_login marker)"""
+    if Config.FAST_LOGIN and request.node.get_closest_marker("ui_login") is None:
+        login_page.login_with_session(username)
+        # Not a form login: keep it out of the learned "login" deadline
+        assert login_page.is_login_successful(timeout=Config.EXPLICIT_WAIT)
+    else:
+        login_page.navigate()
+        login_page.login(username)
+        assert login_page.is_login_successful()
+
+
 @pytest.fixture
-def authenticated_user(driver, login_page):
-    login_page.navigate()
-    login_page.login("standard_user")
-    assert login_page.is_login_successful()
+def authenticated_user(driver, login_page, request):
+    log_in(login_page, "standard_user", request)
     return driver
 
 
 @pytest.fixture
-def authenticated_user_factory(driver, login_page):
+def authenticated_user_factory(driver, login_page, request):
     def _login(username):
-        login_page.navigate()
-        login_page.login(username)
-        assert login_page.is_login_successful()
+        log_in(login_page, username, request)
         return driver
     return _login
 
@@ -0,0 +1,130 @@
+"""
+Suite de performance SauceDemo: budgets de latence par utilisateur
+standard_user comparé à performance_glitch_user
+
+Chaque parcours (connexion, chargement de l'inventaire, ouverture d'un
+produit) est répété SELENIUM_PERF_REPEAT fois par utilisateur. p50/p95/p99
+sont comparés aux budgets de Config.PERFORMANCE_BUDGETS, puis l'échantillon
+est comparé statistiquement à la ligne de base enregistrée (common/budget.py)
+plutôt qu'une mesure isolée et bruitée.
+
+Suite opt-in: SELENIUM_PERFORMANCE=1
+"""
+
+import time
+from urllib.parse import urljoin
+
+import pytest
+from common import pagelog, settings
+from common.budget import Baseline, over_budget
+from common.stats import summarize
+from config.config import Config
+from pages.login_page import LoginPage
+from pages.inventory_page import InventoryPage
+from pages.product_detail_page import ProductDetailPage
+
+
+pytestmark = [
+    pytest.mark.performance,
+    pytest.mark.skipif(not settings.PERFORMANCE,
+                       reason="suite de performance désactivée (SELENIUM_PERFORMANCE=1)"),
+]
+
+TRANSITIONS = ["login", "inventory", "detail"]
+PRODUCT = "Sauce Labs Backpack"
+
+# Utilisateurs de Config.USERS qui ont un budget
+USERS = [user for user in Config.USERS if user in Config.PERFORMANCE_BUDGETS]
+
+log = pagelog.get("tests.performance")
+
+
+def measure(driver, username, repeat):
+    """Répète les trois parcours et retourne les latences {parcours: [secondes]}"""
+    login_page = LoginPage(driver)
+    inventory_page = InventoryPage(driver)
+    detail_page = ProductDetailPage(driver)
+    samples = {transition: [] for transition in TRANSITIONS}
+    
+    for _ in range(repeat):
+        # Connexion par le formulaire, jusqu'à l'arrivée sur l'inventaire
+        login_page.navigate()
+        start = time.monotonic()
+        login_page.login(username)
+        assert login_page.is_login_successful(), f"Connexion échouée pour {username}"
+        samples["login"].append(time.monotonic() - start)
+        
+        # Chargement complet de l'inventaire, jusqu'aux produits lus
+        start = time.monotonic()
+        inventory_page.navigate_to(urljoin(Config.BASE_URL, "inventory.html"), "inventory")
+        inventory_page.snapshot(refresh=True)
+        samples["inventory"].append(time.monotonic() - start)
+        
+        # Clic sur un produit, jusqu'à la page de détails affichée
+        start = time.monotonic()
+        inventory_page.open_product_by_name(PRODUCT, click_through=True)
+        assert detail_page.is_on_detail_page(), f"Page de détails absente pour {username}"
+        samples["detail"].append(time.monotonic() - start)
+    
+    return samples
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Ligne de base enregistrée, complétée et sauvegardée en fin de module"""
+    baseline = Baseline()
+    yield baseline
+    baseline.save()
+
+
+@pytest.fixture(scope="module")
+def latencies(browser_pool):
+    """latencies(username): mesures faites une seule fois par utilisateur"""
+    measured = {}
+    
+    def _latencies(username):
+        if username not in measured:
+            driver = browser_pool.acquire()
+            try:
+                measured[username] = measure(driver, username, settings.PERF_REPEAT)
+            finally:
+                browser_pool.release(driver)
+        return measured[username]
+    return _latencies
+
+
+@pytest.mark.parametrize("username", USERS)
+@pytest.mark.parametrize("transition", TRANSITIONS)
+class TestLatencyBudgets:
+    """p50/p95/p99 par utilisateur et par parcours"""
+    
+    def test_within_budget(self, latencies, username, transition, record_property):
+        """Les percentiles respectent le budget déclaré dans Config"""
+        values = latencies(username)[transition]
+        summary = summarize(values)
+        # Percentiles dans results.jsonl, pour suivre les runs successifs
+        record_property("latency", {name: round(value, 4) for name, value in summary.items()})
+        log.info("%s %s: n=%d p50=%.3fs p95=%.3fs p99=%.3fs", username, transition,
+                 summary["n"], summary["p50"], summary["p95"], summary["p99"])
+        
+        failures = over_budget(values, Config.PERFORMANCE_BUDGETS[username][transition])
+        assert not failures, f"{username} {transition}: " + ", ".join(failures)
+    
+    def test_no_regression(self, latencies, baseline, username, transition, record_property):
+        """Pas de ralentissement significatif par rapport à la ligne de base"""
+        values = latencies(username)[transition]
+        comparison = baseline.compare(username, transition, values)
+        baseline.offer(username, transition, values)
+        
+        if comparison is None:
+            pytest.skip("pas encore de ligne de base: cet échantillon est enregistré")
+        record_property("regression", {
+            "median": round(comparison.median, 4),
+            "baseline_median": round(comparison.baseline_median, 4),
+            "slowdown": round(comparison.slowdown, 4),
+            "p_value": comparison.p_value,
+            "regressed": comparison.regressed,
+        })
+        log.info("%s %s: %s", username, transition, comparison.describe())
+        assert not comparison.regressed, \
+            f"Régression {username} {transition}: {comparison.describe()}"